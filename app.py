@@ -5,10 +5,21 @@ import plotly.express as px
 import plotly.graph_objects as go
 from supabase import create_client
 import os
-from datetime import datetime, timedelta
+import time
+import logging
+import threading
+from datetime import datetime
 from dotenv import load_dotenv
-from collections import Counter
-import re
+
+from etl.snapshot import SnapshotStore
+from dashboard.aggregates import compute_aggregates
+from dashboard.data import load_frame, refresh_frame, load_texts
+from dashboard.index import FilterIndex, since_day
+from dashboard.cube import Cube
+from dashboard.keywords import KeywordMatrix
+from dashboard.figures import LRUCache, filter_key
+from dashboard.table import PagedTable, TABLE_COLUMNS, PAGE_SIZES, EXPORT_CHUNK, EXPORT_FORMATS, export_file
+from dashboard.rpc import fetch_filter_options, fetch_aggregates, fetch_jobs
 
 # ========================================
 # 1. CONFIGURACIÓN INICIAL
@@ -21,6 +32,42 @@ st.set_page_config(
 )
 load_dotenv()
 
+# Reruns y aplicaciones de filtros por sesión (INFO; cada rerun en DEBUG)
+logging.basicConfig(level=os.getenv("DASHBOARD_LOG_LEVEL", "INFO"),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("dashboard")
+
+# Si existe un snapshot Parquet local (etl/snapshot.py), se lee de disco en vez de la red
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR")
+
+# "rpc": los agregados se calculan en Postgres (dashboard_aggregates) y solo viajan conteos;
+# "local": se descargan las vacantes y se agrega en pandas (siempre local con snapshot)
+DASHBOARD_SOURCE = os.getenv("DASHBOARD_SOURCE", "rpc")
+TABLE_ROWS = 50
+# Modo local: cada cuánto se pide el delta de vacantes nuevas/vencidas
+REFRESH_SECONDS = int(os.getenv("DASHBOARD_REFRESH_SECONDS", "600"))
+# Agregados y figuras memoizados (versión de datos, filtros, gráfico); tope de la LRU
+FIGURE_CACHE_ITEMS = int(os.getenv("DASHBOARD_FIGURE_CACHE", "256"))
+# Filtros con auto-aplicar: segundos sin cambios antes de recalcular
+FILTER_DEBOUNCE_SECONDS = float(os.getenv("DASHBOARD_FILTER_DEBOUNCE", "1.5"))
+
+# Secciones del dashboard: solo se arma la que está abierta
+SECTIONS = {
+    'overview': "📊 Overview",
+    'geo': "🌍 Geografía",
+    'skills': "🛠️ Skills & Tech",
+    'companies': "💼 Empresas",
+    'quality': "📈 Calidad de Datos",
+}
+# Modo local: agregados que usa cada sección (compute_aggregates calcula solo esos)
+SECTION_AGGREGATES = {
+    'overview': ['seniority', 'platform', 'timeline', 'sector'],
+    'geo': ['country', 'sector_country'],
+    'skills': ['top_skills', 'skills_seniority'],
+    'companies': ['top_companies', 'company_seniority'],
+    'quality': ['quality'],
+}
+
 
 # ========================================
 # 2. CONEXIÓN A SUPABASE
@@ -72,272 +119,398 @@ def init_connection():
 # ========================================
 # 3. CARGA DE DATOS
 # ========================================
+def snapshot_root():
+    return SNAPSHOT_DIR if SNAPSHOT_DIR and SnapshotStore(SNAPSHOT_DIR).exists() else None
+
+@st.cache_resource
+def frame_state():
+    """
+    Último frame cargado, su índice y la matriz de keywords (compartidos entre
+    sesiones; el frame y el índice se reemplazan, la matriz se actualiza por fila)
+    """
+    return {'df': None, 'skills': None, 'index': None, 'cube': None, 'table': None, 'keywords': KeywordMatrix(),
+            'refreshed_at': 0.0, 'lock': threading.Lock(), 'keywords_lock': threading.Lock()}
+
+def load_data(force_refresh=False):
+    """
+    Modo local: proyección angosta de las vacantes (sin textos largos), su
+    FilterIndex, el cubo de conteos y los rangos para ordenar la tabla. La primera vez carga todo; después, cada
+    REFRESH_SECONDS, solo el delta (índice y cubo se rehacen solo si el frame cambió).
+    """
+    state = frame_state()
+    with state['lock']:
+        stale = time.monotonic() - state['refreshed_at'] >= REFRESH_SECONDS
+        if state['df'] is None or stale or force_refresh:
+            root = snapshot_root()
+            client = None if root else init_connection()
+            if state['df'] is None:
+                df, df_skills = load_frame(client=client, snapshot_root=root)
+            else:
+                df, df_skills = refresh_frame(state['df'], state['skills'], client=client, snapshot_root=root)
+            if df is not state['df']:
+                state['df'], state['skills'] = df, df_skills
+                state['index'] = FilterIndex(df, df_skills) if not df.empty else None
+                state['cube'] = Cube(df) if not df.empty else None
+                state['table'] = PagedTable(df)
+                with state['keywords_lock']:
+                    state['keywords'].retain(df['job_id'])
+            state['refreshed_at'] = time.monotonic()
+        return state['df'], state['index'], state['cube'], state['table']
+
+def keyword_counts(df_rows):
+    """
+    Modo local: menciones de keywords en las vacantes filtradas. Solo se piden
+    los textos de las filas que la matriz aún no escaneó (nuevas o reescritas).
+    """
+    state = frame_state()
+    with state['keywords_lock']:
+        matrix = state['keywords']
+        stale = df_rows[df_rows['job_id'].isin(matrix.stale(df_rows[['job_id', 'updated_at']]))]
+        if not stale.empty:
+            root = snapshot_root()
+            texts = load_texts(stale['job_id'], client=None if root else init_connection(),
+                               snapshot_root=root, columns=['description'])
+            matrix.update(stale[['job_id', 'updated_at', 'has_description']], texts)
+        return matrix.counts(df_rows['job_id'])
+
+@st.cache_resource
+def figure_cache():
+    """Agregados y figuras de Plotly ya armados (LRU acotada, compartida entre sesiones)"""
+    return LRUCache(FIGURE_CACHE_ITEMS)
+
 @st.cache_data(ttl=600)
-def load_data():
-    supabase = init_connection()
-    res = supabase.table("jobs").select("*, skills(skill_name)").execute()
-    df = pd.DataFrame(res.data)
-    
-    if df.empty:
-        return df
-
-    # Convertir fechas
-    df['scraped_at'] = pd.to_datetime(df['scraped_at']).dt.tz_localize(None)
-    
-    # Limpiar y normalizar datos
-    df['country'] = df['country'].fillna('Latam/Remote').astype(str).str.strip()
-    df['seniority_level'] = df['seniority_level'].fillna('Mid').astype(str).str.strip()
-    df['source_platform'] = df['source_platform'].fillna('Web').astype(str).str.strip()
-    df['sector'] = df['sector'].fillna('Other').astype(str).str.strip()
-    
-    # Crear columna de salario disponible
-    df['has_salary'] = df['salary_range'].notna() & (df['salary_range'] != 'A convenir')
-    
-    return df
+def load_filter_options():
+    """Modo rpc: opciones de los filtros calculadas en la base"""
+    return fetch_filter_options(init_connection())
 
-# ========================================
-# 4. FUNCIONES DE ANÁLISIS
-# ========================================
-def extract_keywords_from_descriptions(df):
-    """Extrae keywords técnicas de descripciones"""
-    tech_keywords = [
-        'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node',
-        'django', 'flask', 'fastapi', 'sql', 'postgresql', 'mysql', 'mongodb',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'ci/cd',
-        'machine learning', 'ai', 'data science', 'typescript', 'golang',
-        'ruby', 'php', 'laravel', 'symfony', '.net', 'c#', 'c++',
-        'tensorflow', 'pytorch', 'pandas', 'numpy', 'spark', 'kafka',
-        'redis', 'elasticsearch', 'nginx', 'apache', 'linux', 'terraform',
-        'ansible', 'jenkins', 'grafana', 'prometheus'
-    ]
-    
-    keyword_counter = Counter()
-    
-    # Solo para plataformas con descripciones
-    df_with_desc = df[
-        (df['description'].notna()) & 
-        (df['description'] != 'Descripción no disponible.')
-    ]
-    
-    for desc in df_with_desc['description']:
-        desc_lower = str(desc).lower()
-        for keyword in tech_keywords:
-            if keyword in desc_lower:
-                keyword_counter[keyword] += 1
-    
-    return keyword_counter
-
-def get_platform_quality_score(df):
-    """Calcula score de calidad por plataforma"""
-    quality_metrics = []
-    
-    for platform in df['source_platform'].unique():
-        df_platform = df[df['source_platform'] == platform]
-        
-        desc_available = (
-            (df_platform['description'].notna()) & 
-            (df_platform['description'] != 'Descripción no disponible.')
-        ).sum()
-        
-        salary_available = df_platform['has_salary'].sum()
-        
-        quality_score = (
-            (desc_available / len(df_platform) * 50) +
-            (salary_available / len(df_platform) * 50)
+@st.cache_data(ttl=600)
+def load_aggregates(filters):
+    """Modo rpc: todos los agregados para una combinación de filtros"""
+    return fetch_aggregates(init_connection(), filters)
+
+@st.cache_data(ttl=600)
+def load_table_rows(filters, columns, limit=TABLE_ROWS, offset=0, order='scraped_at', desc=True, with_salary=False):
+    """Modo rpc: una página de filas filtradas (orden y offset en Postgres)"""
+    return pd.DataFrame(
+        fetch_jobs(init_connection(), filters, list(columns), limit=limit, offset=offset,
+                   order=order, desc=desc, with_salary=with_salary),
+        columns=list(columns),
+    )
+
+def export_rpc_chunks(filters, columns, order, desc, total):
+    """Modo rpc: las filas filtradas de a EXPORT_CHUNK, para exportar sin bajar todo junto"""
+    for offset in range(0, total, EXPORT_CHUNK):
+        yield pd.DataFrame(
+            fetch_jobs(init_connection(), filters, list(columns), limit=EXPORT_CHUNK, offset=offset,
+                       order=order, desc=desc),
+            columns=list(columns),
         )
-        
-        quality_metrics.append({
-            'platform': platform,
-            'jobs': len(df_platform),
-            'desc_rate': desc_available / len(df_platform) * 100,
-            'salary_rate': salary_available / len(df_platform) * 100,
-            'quality_score': quality_score
-        })
-    
-    return pd.DataFrame(quality_metrics)
+
+@st.cache_data(ttl=600)
+def load_salary_stats():
+    """Agregado salarial calculado en la base (vista salary_stats_by_country)"""
+    try:
+        supabase = init_connection()
+        res = supabase.table("salary_stats_by_country").select("*").execute()
+        return pd.DataFrame(res.data)
+    except Exception:
+        return pd.DataFrame()
+
+@st.cache_data(ttl=600)
+def load_skill_category_stats():
+    """Skills agrupadas por categoría en la base (vista skill_category_stats)"""
+    try:
+        supabase = init_connection()
+        res = supabase.table("skill_category_stats").select("*").execute()
+        return pd.DataFrame(res.data)
+    except Exception:
+        return pd.DataFrame()
 
 # ========================================
-# 5. CARGA DE DATOS
+# 4. ORIGEN DE DATOS
 # ========================================
-df_raw = load_data()
+use_rpc = DASHBOARD_SOURCE == "rpc" and not snapshot_root()
+options = None
+df_raw = pd.DataFrame()
+
+if use_rpc:
+    try:
+        options = load_filter_options()
+    except Exception as e:
+        # Funciones de database/schema.py aún no instaladas: se agrega en local
+        st.sidebar.caption(f"⚠️ Agregados en servidor no disponibles ({type(e).__name__}), modo local.")
+        use_rpc = False
+
+if not use_rpc:
+    df_raw, filter_index, cube, table = load_data(force_refresh=st.session_state.pop('force_refresh', False))
+    if not df_raw.empty:
+        options = {
+            'countries': filter_index.values('country'),
+            'seniority': filter_index.values('seniority_level'),
+            'platforms': filter_index.values('source_platform'),
+            'last_scraped': df_raw['scraped_at'].max(),
+        }
+        if 'delta_rows' in df_raw.attrs:
+            st.sidebar.caption(f"⏱️ Último refresco: {df_raw.attrs['delta_rows']} filas nuevas/vencidas en "
+                               f"{df_raw.attrs.get('load_seconds', 0):.1f}s, {df_raw.attrs.get('memory_mb', 0):.0f} MB "
+                               f"({len(df_raw)} vacantes)")
+        else:
+            st.sidebar.caption(f"⏱️ Carga inicial: {df_raw.attrs.get('load_seconds', 0):.1f}s, "
+                               f"{df_raw.attrs.get('memory_mb', 0):.0f} MB ({len(df_raw)} vacantes)")
 
 # ========================================
-# 6. SIDEBAR - FILTROS
+# 5. SIDEBAR - FILTROS
 # ========================================
 st.sidebar.header("🔍 Panel de Filtros")
+session = st.session_state
+session['reruns'] = session.get('reruns', 0) + 1
+session.setdefault('session_id', os.urandom(4).hex())
+logger.debug("sesión %s: rerun #%d", session['session_id'], session['reruns'])
 
-if not df_raw.empty:
-    # Filtro de Fecha
-    dias = st.sidebar.slider("Días atrás:", 1, 30, 15, key='dias_slider')
-    fecha_limite = datetime.now() - timedelta(days=dias)
-    
-    # Filtro de Países
-    opciones_paises = sorted(df_raw['country'].unique().tolist())
-    paises_sel = st.sidebar.multiselect(
-        "Países", 
-        options=opciones_paises,
-        default=opciones_paises
-    )
-    
-    # Filtro de Seniority
-    opciones_niveles = sorted(df_raw['seniority_level'].unique().tolist())
-    niveles_sel = st.sidebar.multiselect(
-        "Seniority", 
-        options=opciones_niveles,
-        default=opciones_niveles
-    )
-    
-    # Filtro de Plataforma
-    opciones_plataformas = sorted(df_raw['source_platform'].unique().tolist())
-    plataformas_sel = st.sidebar.multiselect(
-        "Plataformas",
-        options=opciones_plataformas,
-        default=opciones_plataformas
+def apply_filters(pending):
+    """Fija los filtros aplicados: lo pesado del rerun depende solo de estos"""
+    session['applied_filters'] = pending
+    session['filter_applies'] = session.get('filter_applies', 0) + 1
+    logger.info("sesión %s: %d reruns, %d aplicaciones de filtros",
+                session['session_id'], session['reruns'], session['filter_applies'])
+
+@st.fragment(run_every=FILTER_DEBOUNCE_SECONDS)
+def apply_when_idle():
+    """Auto-aplicar: rerun completo cuando pasa la ventana sin cambios en los filtros"""
+    if time.monotonic() - session.get('filters_changed_at', 0.0) >= FILTER_DEBOUNCE_SECONDS:
+        st.rerun()
+
+if options and options['countries']:
+    # Los widgets van en un formulario: cambiarlos no dispara un rerun hasta
+    # "Aplicar"; con auto-aplicar se aplican tras FILTER_DEBOUNCE_SECONDS quietos
+    auto_apply = st.sidebar.toggle(
+        "⚡ Aplicar automáticamente", key='auto_apply',
+        help=f"Aplica los filtros {FILTER_DEBOUNCE_SECONDS:g}s después del último cambio"
     )
-    
+    with st.sidebar if auto_apply else st.sidebar.form('filtros'):
+        # Filtro de Fecha
+        dias = st.slider("Días atrás:", 1, 30, 15, key='dias_slider')
+
+        # Filtro de Países
+        opciones_paises = options['countries']
+        paises_sel = st.multiselect(
+            "Países",
+            options=opciones_paises,
+            default=opciones_paises,
+            key='paises_sel'
+        )
+
+        # Filtro de Seniority
+        opciones_niveles = options['seniority']
+        niveles_sel = st.multiselect(
+            "Seniority",
+            options=opciones_niveles,
+            default=opciones_niveles,
+            key='niveles_sel'
+        )
+
+        # Filtro de Plataforma
+        opciones_plataformas = options['platforms']
+        plataformas_sel = st.multiselect(
+            "Plataformas",
+            options=opciones_plataformas,
+            default=opciones_plataformas,
+            key='plataformas_sel'
+        )
+        submitted = not auto_apply and st.form_submit_button("✅ Aplicar filtros", use_container_width=True)
+
+    pending = {
+        'days': dias,
+        'countries': paises_sel,
+        'seniority': niveles_sel,
+        'platforms': plataformas_sel,
+    }
+    if 'applied_filters' not in session or submitted:
+        apply_filters(pending)
+    elif auto_apply and pending != session['applied_filters']:
+        if pending != session.get('pending_filters'):
+            session['filters_changed_at'] = time.monotonic()
+        if time.monotonic() - session.get('filters_changed_at', 0.0) >= FILTER_DEBOUNCE_SECONDS:
+            apply_filters(pending)
+        else:
+            st.sidebar.caption("⏳ Aplicando filtros...")
+            with st.sidebar:
+                apply_when_idle()
+    session['pending_filters'] = pending
+    if pending != session['applied_filters'] and not auto_apply:
+        st.sidebar.caption("✏️ Hay cambios sin aplicar.")
+    st.sidebar.caption(f"🔁 {session['reruns']} reruns, {session['filter_applies']} aplicaciones de filtros en esta sesión")
+
     # Botón para resetear filtros
+    # (en modo local el frame se conserva y solo se pide el delta)
     if st.sidebar.button("🔄 Resetear Todo"):
         st.cache_data.clear()
+        figure_cache().clear()
+        st.session_state['force_refresh'] = True
         st.rerun()
-    
+
     # ========================================
-    # 7. APLICAR FILTROS
+    # 6. APLICAR FILTROS Y AGREGAR
     # ========================================
-    df_filtered = df_raw[
-        (df_raw['scraped_at'] >= fecha_limite) &
-        (df_raw['country'].isin(paises_sel)) &
-        (df_raw['seniority_level'].isin(niveles_sel)) &
-        (df_raw['source_platform'].isin(plataformas_sel))
-    ].copy()
-    
+    # Solo los filtros aplicados (no lo que está a medio editar en el formulario)
+    filters = session['applied_filters']
+    fecha_limite = since_day(filters['days'])
+    # Llave de la caché de figuras: versión de los datos + filtros (el día de
+    # corte va aparte porque "últimos N días" se corre a medianoche)
+    if use_rpc:
+        data_version = ('rpc', str(options['last_scraped']))
+    else:
+        data_version = ('local', df_raw.attrs.get('version'), str(df_raw.attrs.get('watermark')))
+    state_key = (data_version, fecha_limite.date(), filter_key(filters))
+
+    def cached(item_id, build):
+        """Agregado o figura memoizado por (versión, filtros, id); build() solo si falta"""
+        return figure_cache().get(state_key + (item_id,), build)
+
+    def plot(chart_id, build):
+        st.plotly_chart(cached(chart_id, build), use_container_width=True)
+
+    if use_rpc:
+        agg = load_aggregates(filters)
+        metrics = agg['metrics']
+    else:
+        # Bitmaps del índice: posiciones de las filas (tabla, skills, keywords);
+        # los gráficos suman las celdas del cubo que cumplen los mismos filtros.
+        # Las filas solo se materializan donde hacen falta (página, keywords)
+        rows = filter_index.rows(filters)
+        metrics = cached('metrics', lambda: compute_aggregates(
+            cube.select(filters), unique_jobs=filter_index.unique_jobs(rows), names=[])['metrics'])
+
     # ========================================
-    # 8. PÁGINA PRINCIPAL
+    # 7. PÁGINA PRINCIPAL
     # ========================================
     st.title("🚀 Tech Job Market Intelligence")
-    st.caption(f"📅 Viendo ofertas desde: **{fecha_limite.strftime('%d/%m/%Y')}** | Última actualización: {df_raw['scraped_at'].max().strftime('%d/%m/%Y %H:%M')}")
-    
+    st.caption(f"📅 Viendo ofertas desde: **{fecha_limite.strftime('%d/%m/%Y')}** | Última actualización: {pd.to_datetime(options['last_scraped']).strftime('%d/%m/%Y %H:%M')}")
+
     # ========================================
-    # 9. MÉTRICAS PRINCIPALES
+    # 8. MÉTRICAS PRINCIPALES
     # ========================================
     col1, col2, col3, col4, col5 = st.columns(5)
-    
+    total_jobs = max(metrics['jobs'], 1)
+
     with col1:
-        st.metric("📋 Vacantes", len(df_filtered))
+        # La misma vacante publicada en varias plataformas cuenta una sola vez
+        st.metric("📋 Vacantes", metrics['unique_jobs'],
+                  help=f"{metrics['jobs']} publicaciones, {metrics['jobs'] - metrics['unique_jobs']} casi-duplicadas")
     with col2:
-        st.metric("🌎 Países", df_filtered['country'].nunique())
+        st.metric("🌎 Países", metrics['countries'])
     with col3:
-        st.metric("🏢 Empresas", df_filtered['company_name'].nunique())
+        st.metric("🏢 Empresas", metrics['companies'])
     with col4:
-        with_desc = (
-            (df_filtered['description'].notna()) & 
-            (df_filtered['description'] != 'Descripción no disponible.')
-        ).sum()
-        st.metric("📝 Con Descripción", f"{with_desc} ({with_desc/len(df_filtered)*100:.0f}%)")
+        with_desc = metrics['with_description']
+        st.metric("📝 Con Descripción", f"{with_desc} ({with_desc/total_jobs*100:.0f}%)")
     with col5:
-        with_salary = df_filtered['has_salary'].sum()
-        st.metric("💰 Con Salario", f"{with_salary} ({with_salary/len(df_filtered)*100:.0f}%)")
-    
-    if df_filtered.empty:
+        with_salary = metrics['with_salary']
+        st.metric("💰 Con Salario", f"{with_salary} ({with_salary/total_jobs*100:.0f}%)")
+
+    if not metrics['jobs']:
         st.warning("⚠️ No hay registros con los filtros seleccionados.")
     else:
         # ========================================
-        # TABS CON VISUALIZACIONES
+        # SECCIONES CON VISUALIZACIONES
         # ========================================
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            "📊 Overview", 
-            "🌍 Geografía", 
-            "🛠️ Skills & Tech", 
-            "💼 Empresas",
-            "📈 Calidad de Datos"
-        ])
-        
+        # st.tabs ejecuta el cuerpo de todas las pestañas en cada rerun; con el
+        # selector solo se calculan los agregados y figuras de la sección abierta
+        section = st.radio("Sección", list(SECTIONS), format_func=SECTIONS.get,
+                           horizontal=True, key='section', label_visibility='collapsed')
+        if not use_rpc:
+            agg = cached(('agg', section), lambda: compute_aggregates(
+                cube.select(filters), filter_index.skills(rows) if section == 'skills' else None,
+                names=SECTION_AGGREGATES[section]))
+
         # ========================================
-        # TAB 1: OVERVIEW
+        # SECCIÓN 1: OVERVIEW
         # ========================================
-        with tab1:
+        if section == 'overview':
             col_a, col_b = st.columns(2)
-            
+
             with col_a:
                 # Distribución por Seniority
                 st.subheader("📊 Distribución por Seniority")
-                seniority_counts = df_filtered['seniority_level'].value_counts()
-                fig_seniority = px.pie(
-                    values=seniority_counts.values,
-                    names=seniority_counts.index,
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
-                st.plotly_chart(fig_seniority, use_container_width=True)
-            
+                seniority_counts = agg['seniority']
+
+                def fig_seniority():
+                    return px.pie(
+                        values=seniority_counts['count'],
+                        names=seniority_counts['seniority_level'],
+                        hole=0.4,
+                        color_discrete_sequence=px.colors.qualitative.Set3
+                    )
+                plot('seniority', fig_seniority)
+
             with col_b:
                 # Distribución por Plataforma
                 st.subheader("🌐 Vacantes por Plataforma")
-                platform_counts = df_filtered['source_platform'].value_counts()
-                fig_platform = px.bar(
-                    x=platform_counts.index,
-                    y=platform_counts.values,
-                    labels={'x': 'Plataforma', 'y': 'Cantidad'},
-                    color=platform_counts.values,
-                    color_continuous_scale='Viridis'
-                )
-                fig_platform.update_traces(
-                    marker_line_color='rgb(8,48,107)', # Borde azul oscuro
-                    marker_line_width=1.5,             # Grosor del borde
-                    opacity=0.85                       # Un poco de transparencia para elegancia
-                )
-                fig_platform.update_layout(showlegend=False)
-                st.plotly_chart(fig_platform, use_container_width=True)
-            
+                platform_counts = agg['platform']
+
+                def fig_platform():
+                    fig = px.bar(
+                        x=platform_counts['source_platform'],
+                        y=platform_counts['count'],
+                        labels={'x': 'Plataforma', 'y': 'Cantidad'},
+                        color=platform_counts['count'],
+                        color_continuous_scale='Viridis'
+                    )
+                    fig.update_traces(
+                        marker_line_color='rgb(8,48,107)', # Borde azul oscuro
+                        marker_line_width=1.5,             # Grosor del borde
+                        opacity=0.85                       # Un poco de transparencia para elegancia
+                    )
+                    fig.update_layout(showlegend=False)
+                    return fig
+                plot('platform', fig_platform)
+
             # Timeline de publicaciones
             st.subheader("📅 Timeline de Scraping")
-            df_timeline = df_filtered.copy()
-            df_timeline['fecha'] = df_timeline['scraped_at'].dt.date
-            timeline_counts = df_timeline.groupby('fecha').size().reset_index(name='count')
-            
-            fig_timeline = px.line(
-                timeline_counts,
+            plot('timeline', lambda: px.line(
+                agg['timeline'],
                 x='fecha',
                 y='count',
                 markers=True,
                 labels={'fecha': 'Fecha', 'count': 'Vacantes Scrapeadas'}
-            )
-            st.plotly_chart(fig_timeline, use_container_width=True)
-            
+            ))
+
             st.subheader("🏭 Distribución por Sector Económico")
-            sector_counts = df_filtered['sector'].value_counts()
-            fig_sector_total = px.bar(
-                sector_counts,
+            sector_counts = agg['sector']
+            plot('sector', lambda: px.bar(
+                x=sector_counts['count'],
+                y=sector_counts['sector'],
                 orientation='h',
-                labels={'value': 'Vacantes', 'index': 'Sector'},
-                color=sector_counts.values,
+                labels={'x': 'Vacantes', 'y': 'Sector'},
+                color=sector_counts['count'],
                 color_continuous_scale='Viridis'
-            )
-            st.plotly_chart(fig_sector_total, use_container_width=True)
-        
+            ))
+
         # ========================================
-        # TAB 2: GEOGRAFÍA
+        # SECCIÓN 2: GEOGRAFÍA
         # ========================================
-        with tab2:
+        elif section == 'geo':
             col_geo1, col_geo2 = st.columns([2, 1])
-            
+
             with col_geo1:
                 # Mapa de vacantes por país
                 st.subheader("🗺️ Distribución Global")
-                country_counts = df_filtered['country'].value_counts().reset_index()
-                country_counts.columns = ['country', 'count']
-                
-                fig_map = px.choropleth(
-                    country_counts,
-                    locations='country',
-                    locationmode='country names',
-                    color='count',
-                    hover_name='country',
-                    color_continuous_scale='Viridis',
-                    labels={'count': 'Vacantes'}
-                )
-                fig_map.update_geos(showcountries=True, showcoastlines=True)
-                st.plotly_chart(fig_map, use_container_width=True)
-            
+                country_counts = agg['country']
+
+                def fig_map():
+                    fig = px.choropleth(
+                        country_counts,
+                        locations='country',
+                        locationmode='country names',
+                        color='count',
+                        hover_name='country',
+                        color_continuous_scale='Viridis',
+                        labels={'count': 'Vacantes'}
+                    )
+                    fig.update_geos(showcountries=True, showcoastlines=True)
+                    return fig
+                plot('map', fig_map)
+
             with col_geo2:
                 # Top países
                 st.subheader("🏆 Top Países")
@@ -357,212 +530,236 @@ if not df_raw.empty:
                 )
 
                 st.subheader("🏭 Sectores por País(Top 5)")
-                if not df_filtered.empty:
-                    top_countries = df_filtered['country'].value_counts().head(5).index.tolist()
-                    df_top_geo = df_filtered[df_filtered['country'].isin(top_countries)]
-    
-                    if not df_top_geo.empty:
-                        # Crea la matriz pivote directamente en Pandas rellenando vacíos con 0
-                        sector_country = df_top_geo.groupby(['country', 'sector']).size().unstack(fill_value=0)
-        
-                        fig_sector = go.Figure()
+                if not agg['sector_country'].empty:
+                    def fig_sector():
+                        # Matriz pivote rellenando vacíos con 0
+                        sector_country = agg['sector_country'].pivot(
+                            index='country', columns='sector', values='count'
+                        ).fillna(0)
+
+                        fig = go.Figure()
                         for sector_name in sector_country.columns:
-                            fig_sector.add_trace(go.Bar(
+                            fig.add_trace(go.Bar(
                                 name=str(sector_name),
                                 x=sector_country.index.astype(str),
                                 y=sector_country[sector_name]
                             ))
-            
-                        fig_sector.update_layout(
+
+                        fig.update_layout(
                             barmode='stack',
                             xaxis_title="País",
                             yaxis_title="Vacantes",
                             legend_title="Sector"
                         )
-                        st.plotly_chart(fig_sector, use_container_width=True)
-                    else:
-                        st.info("No hay suficientes datos para mostrar el desglose.")
+                        return fig
+                    plot('sector_country', fig_sector)
+                else:
+                    st.info("No hay suficientes datos para mostrar el desglose.")
         # ========================================
-        # TAB 3: SKILLS & TECH
+        # SECCIÓN 3: SKILLS & TECH
         # ========================================
-        with tab3:
+        elif section == 'skills':
             col_skills1, col_skills2 = st.columns(2)
-            
+
             with col_skills1:
                 # Top Skills (de la relación skills)
                 st.subheader("🛠️ Top 15 Skills (Base de Datos)")
-                listado_skills = []
-                for row in df_filtered['skills']:
-                    if isinstance(row, list):
-                        for s in row:
-                            if 'skill_name' in s:
-                                listado_skills.append(s['skill_name'])
-                
-                if listado_skills:
-                    skill_counts = pd.Series(listado_skills).value_counts().head(15)
-                    fig_skills = px.bar(
-                        x=skill_counts.values,
-                        y=skill_counts.index,
-                        orientation='h',
-                        labels={'x': 'Frecuencia', 'y': 'Skill'},
-                        color=skill_counts.values,
-                        color_continuous_scale='Teal'
-                    )
-                    fig_skills.update_layout(showlegend=False, height=500)
-                    st.plotly_chart(fig_skills, use_container_width=True)
+                skill_counts = agg['top_skills']
+                if not skill_counts.empty:
+                    def fig_skills():
+                        fig = px.bar(
+                            x=skill_counts['count'],
+                            y=skill_counts['skill_name'],
+                            orientation='h',
+                            labels={'x': 'Frecuencia', 'y': 'Skill'},
+                            color=skill_counts['count'],
+                            color_continuous_scale='Teal'
+                        )
+                        fig.update_layout(showlegend=False, height=500)
+                        return fig
+                    plot('top_skills', fig_skills)
                 else:
                     st.info("No hay skills registradas en la base de datos.")
-            
+
             with col_skills2:
                 # Keywords extraídas de descripciones
                 st.subheader("🔍 Keywords en Descripciones")
-                keyword_counter = extract_keywords_from_descriptions(df_filtered)
-                
-                if keyword_counter:
-                    top_keywords = dict(keyword_counter.most_common(15))
-                    fig_keywords = px.bar(
-                        x=list(top_keywords.values()),
-                        y=list(top_keywords.keys()),
-                        orientation='h',
-                        labels={'x': 'Menciones', 'y': 'Tecnología'},
-                        color=list(top_keywords.values()),
-                        color_continuous_scale='Oranges'
-                    )
-                    fig_keywords.update_layout(showlegend=False, height=500)
-                    st.plotly_chart(fig_keywords, use_container_width=True)
+                if use_rpc:
+                    top_keywords = agg['keywords']
+                else:
+                    # Modo local: los textos se bajan solo al abrir esta sección y solo
+                    # para las vacantes filtradas que la matriz de keywords aún no tiene
+                    with st.spinner("Escaneando descripciones..."):
+                        top_keywords = cached('keywords', lambda: keyword_counts(filter_index.take(rows)))
+
+                if not top_keywords.empty:
+                    def fig_keywords():
+                        fig = px.bar(
+                            x=top_keywords['count'],
+                            y=top_keywords['keyword'],
+                            orientation='h',
+                            labels={'x': 'Menciones', 'y': 'Tecnología'},
+                            color=top_keywords['count'],
+                            color_continuous_scale='Oranges'
+                        )
+                        fig.update_layout(showlegend=False, height=500)
+                        return fig
+                    plot('keywords', fig_keywords)
                 else:
                     st.info("No se encontraron keywords técnicas.")
-            
+
             # Skills por Seniority
             st.subheader("📊 Skills más demandadas por Seniority")
-            if listado_skills:
-            # Crear dataset expandido
-                skills_seniority = []
-                for idx, row in df_filtered.iterrows():
-                    if isinstance(row['skills'], list):
-                        for skill in row['skills']:
-                            if 'skill_name' in skill:
-                                skills_seniority.append({
-                                    'skill': skill['skill_name'],
-                                    'seniority': row['seniority_level']
-                                })
-    
-                if skills_seniority:
-                    df_skills_sen = pd.DataFrame(skills_seniority)
-                    skill_sen_counts = df_skills_sen.groupby(['seniority', 'skill']).size().reset_index(name='count')
-        
-                    # Top 5 skills por nivel de seniority
-                    top_skills_per_level = (
-                        skill_sen_counts
-                        .sort_values(by=['seniority', 'count'], ascending=[True, False])
-                        .groupby('seniority')
-                        .head(5)
-                        .reset_index(drop=True)
-                    )
-        
-                    # Matriz pivot rellenando vacíos con 0 
-                    pivot_skills = top_skills_per_level.pivot(index='seniority', columns='skill', values='count').fillna(0)
-        
-                    fig_skills_sen = go.Figure()
+            if not agg['skills_seniority'].empty:
+                def fig_skills_sen():
+                    # Top 5 skills por nivel, matriz pivot rellenando vacíos con 0
+                    pivot_skills = agg['skills_seniority'].pivot(
+                        index='seniority_level', columns='skill_name', values='count'
+                    ).fillna(0)
+
+                    fig = go.Figure()
                     for skill_name in pivot_skills.columns:
-                        fig_skills_sen.add_trace(go.Bar(
+                        fig.add_trace(go.Bar(
                             name=str(skill_name),
                             x=pivot_skills.index.astype(str),
                             y=pivot_skills[skill_name]
                         ))
-            
-                    fig_skills_sen.update_layout(
+
+                    fig.update_layout(
                         barmode='group',
                         xaxis_title="Nivel",
                         yaxis_title="Frecuencia",
                         legend_title="Skill"
                     )
-                    st.plotly_chart(fig_skills_sen, use_container_width=True)
+                    return fig
+                plot('skills_seniority', fig_skills_sen)
+
+            # Categorías (agregado en la base, sin filtros del sidebar)
+            st.subheader("🏷️ Skills por Categoría")
+            df_categories = load_skill_category_stats()
+            if not df_categories.empty:
+                def fig_categories():
+                    fig = px.bar(
+                        df_categories.sort_values('menciones', ascending=True),
+                        x='menciones',
+                        y='skill_category',
+                        orientation='h',
+                        hover_data=['vacantes'],
+                        labels={'menciones': 'Menciones', 'skill_category': 'Categoría'},
+                        color='menciones',
+                        color_continuous_scale='Teal'
+                    )
+                    fig.update_layout(showlegend=False)
+                    return fig
+                plot('skill_categories', fig_categories)
+            else:
+                st.info("Las categorías se completan en la próxima corrida del ETL.")
         # ========================================
-        # TAB 4: EMPRESAS
+        # SECCIÓN 4: EMPRESAS
         # ========================================
-        with tab4:
+        elif section == 'companies':
             col_comp1, col_comp2 = st.columns([2, 1])
-            
+
             with col_comp1:
                 # Top 20 empresas
                 st.subheader("🏢 Top 20 Empresas Contratando")
-                company_counts = df_filtered['company_name'].value_counts().head(20)
+                company_counts = agg['top_companies']
                 if not company_counts.empty:
-                    fig_companies = go.Figure(data=[
-                        go.Bar(
-                            x=company_counts.values,
-                            y=company_counts.index.astype(str),
-                            orientation='h',
-                            marker=dict(color=company_counts.values, colorscale='Sunset'),
-                        )
-                    ])
-                    fig_companies.update_layout(showlegend=False, height=600,xaxis_title="Vacantes", yaxis_title="Empresa",yaxis=dict(autorange="reversed"))
-                    st.plotly_chart(fig_companies, use_container_width=True)
-            
+                    def fig_companies():
+                        fig = go.Figure(data=[
+                            go.Bar(
+                                x=company_counts['count'],
+                                y=company_counts['company'].astype(str),
+                                orientation='h',
+                                marker=dict(color=company_counts['count'], colorscale='Sunset'),
+                            )
+                        ])
+                        fig.update_layout(showlegend=False, height=600,xaxis_title="Vacantes", yaxis_title="Empresa",yaxis=dict(autorange="reversed"))
+                        return fig
+                    plot('top_companies', fig_companies)
+
             with col_comp2:
-                # Empresas por seniority
+                # Empresas por seniority (top 10)
                 st.subheader("📊 Perfil de Contratación")
-                company_seniority = df_filtered.groupby(
-                    ['company_name', 'seniority_level']
-                ).size().reset_index(name='count')
-                
-                top_10_companies = df_filtered['company_name'].value_counts().head(10).index
-                company_sen_top = company_seniority[
-                    company_seniority['company_name'].isin(top_10_companies)
-                ]
-                
+                company_sen_top = agg['company_seniority']
+
                 if not company_sen_top.empty:
-                    pivot_comp_sen = company_sen_top.pivot(
-                        index='company_name', 
-                        columns='seniority_level', 
-                        values='count'
-                    ).fillna(0)
-                    fig_comp_sen = go.Figure()
-                    for seniority in pivot_comp_sen.columns:
-                        fig_comp_sen.add_trace(go.Bar(
-                            name=str(seniority),
-                            x=pivot_comp_sen.index.astype(str),
-                            y=pivot_comp_sen[seniority]
-                        ))
-                    
-                    fig_comp_sen.update_layout(
-                        barmode='stack',
-                        xaxis_title='Empresa',
-                        yaxis_title='Vacantes',
-                        legend_title='Seniority',
-                        xaxis=dict(tickangle=-45)
-                    )
-                
-                    st.plotly_chart(fig_comp_sen, use_container_width=True)
+                    def fig_comp_sen():
+                        pivot_comp_sen = company_sen_top.pivot(
+                            index='company',
+                            columns='seniority_level',
+                            values='count'
+                        ).fillna(0)
+                        fig = go.Figure()
+                        for seniority in pivot_comp_sen.columns:
+                            fig.add_trace(go.Bar(
+                                name=str(seniority),
+                                x=pivot_comp_sen.index.astype(str),
+                                y=pivot_comp_sen[seniority]
+                            ))
+
+                        fig.update_layout(
+                            barmode='stack',
+                            xaxis_title='Empresa',
+                            yaxis_title='Vacantes',
+                            legend_title='Seniority',
+                            xaxis=dict(tickangle=-45)
+                        )
+                        return fig
+                    plot('company_seniority', fig_comp_sen)
                 else:
                     st.info("No hay suficientes datos para mostrar el perfil de contratación.")
-            
+
             # Salarios por empresa (solo Computrabajo)
-            df_with_salary = df_filtered[df_filtered['has_salary']]
+            salary_columns = ['company_name', 'title', 'salary_range', 'country']
+            if use_rpc:
+                df_with_salary = load_table_rows(filters, tuple(salary_columns), limit=20, with_salary=True)
+            else:
+                def salary_rows():
+                    positions = table.order(rows, desc=False)
+                    with_salary = positions[filter_index.df['has_salary'].to_numpy(dtype=bool)[positions]]
+                    return table.page(with_salary, 0, 20, salary_columns)
+                df_with_salary = cached('salary_rows', salary_rows)
             if not df_with_salary.empty:
                 st.subheader("💰 Empresas con Información Salarial")
                 st.dataframe(
-                    df_with_salary[['company_name', 'title', 'salary_range', 'country']].head(20),
+                    df_with_salary,
                     use_container_width=True,
                     hide_index=True
                 )
-        
+
+            # Salario mensual normalizado a USD (agregado en la base de datos)
+            df_salary_stats = load_salary_stats()
+            if not df_salary_stats.empty:
+                df_salary_stats = df_salary_stats[
+                    df_salary_stats['country'].isin(filters['countries']) &
+                    df_salary_stats['seniority_level'].isin(filters['seniority'])
+                ]
+            if not df_salary_stats.empty:
+                st.subheader("💵 Mediana Salarial Mensual (USD) por País")
+                plot('salary', lambda: px.bar(
+                    df_salary_stats,
+                    x='country',
+                    y='mediana_usd_mes',
+                    color='seniority_level',
+                    barmode='group',
+                    labels={'country': 'País', 'mediana_usd_mes': 'USD / mes', 'seniority_level': 'Seniority'}
+                ))
+
         # ========================================
-        # TAB 5: CALIDAD DE DATOS
+        # SECCIÓN 5: CALIDAD DE DATOS
         # ========================================
-        with tab5:
+        elif section == 'quality':
             st.subheader("📈 Calidad de Datos por Plataforma")
-            
-            if not df_filtered.empty:
-                quality_df = get_platform_quality_score(df_filtered)
-            
+            quality_df = agg['quality']
+
+            if not quality_df.empty:
                 col_q1, col_q2 = st.columns(2)
-            
+
                 with col_q1:
-                # Score de calidad
-                    if not quality_df.empty:
-                        fig_quality = go.Figure(data=[
+                    # Score de calidad
+                    def fig_quality():
+                        fig = go.Figure(data=[
                             go.Bar(
                                 x=quality_df['platform'].astype(str),
                                 y=quality_df['quality_score'],
@@ -572,117 +769,131 @@ if not df_raw.empty:
                                 marker=dict(color=quality_df['quality_score'], colorscale='Viridis')
                             )
                         ])
-                        fig_quality.update_layout(
+                        fig.update_layout(
                             xaxis_title='Plataforma',
                             yaxis_title='Score de Calidad',
                             showlegend=False,
                         )
-                        st.plotly_chart(fig_quality, use_container_width=True)
-            
+                        return fig
+                    plot('quality_score', fig_quality)
+
                 with col_q2:
-                    if not quality_df.empty:
                     # Métricas detalladas
-                        st.dataframe(
-                            quality_df.style.format({
-                                'desc_rate': '{:.1f}%',
-                                'salary_rate': '{:.1f}%',
-                                'quality_score': '{:.1f}%'
-                            }),
-                            column_config={
-                                'platform': 'Plataforma',
-                                'jobs': 'Vacantes',
-                                'desc_rate': 'Tasa Descripción',
-                                'salary_rate': 'Tasa Salario',
-                                'quality_score': 'Score Final'
-                            },
-                            hide_index=True,
-                            use_container_width=True
-                        )
-            
+                    st.dataframe(
+                        quality_df[['platform', 'jobs', 'desc_rate', 'salary_rate', 'quality_score']].style.format({
+                            'desc_rate': '{:.1f}%',
+                            'salary_rate': '{:.1f}%',
+                            'quality_score': '{:.1f}%'
+                        }),
+                        column_config={
+                            'platform': 'Plataforma',
+                            'jobs': 'Vacantes',
+                            'desc_rate': 'Tasa Descripción',
+                            'salary_rate': 'Tasa Salario',
+                            'quality_score': 'Score Final'
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
+
                 # Comparativa de completitud
                 st.subheader("📊 Completitud de Campos por Plataforma")
-                completeness_data = []
-                for platform in df_filtered['source_platform'].unique():
-                    df_plat = df_filtered[df_filtered['source_platform'] == platform]
-                    
-                    total_plat = len(df_plat)
-                    if total_plat > 0:
-                        completeness_data.append({
-                            'Plataforma': platform,
-                            'Descripción': ((df_plat['description'].notna()) & 
-                                           (df_plat['description'] != 'Descripción no disponible.')).sum() / total_plat * 100,
-                            'Salario': df_plat['has_salary'].sum() / total_plat * 100,
-                            'Requisitos': df_plat['requirements'].notna().sum() / total_plat * 100,
-                            'Ubicación': df_plat['location'].notna().sum() / total_plat * 100
-                            })
-                    
-                if completeness_data:
-                    df_completeness = pd.DataFrame(completeness_data)
-                    df_completeness_melted = df_completeness.melt(
-                        id_vars='Plataforma',
-                        var_name='Campo',
-                        value_name='Completitud'
-                    )
-                        
-                       
-                    # 💡 Matriz Pivot 
-                    pivot_completeness = df_completeness_melted.pivot(
-                        index='Campo', 
-                        columns='Plataforma', 
-                        values='Completitud'
-                    ).fillna(0)
-                    
-                    fig_completeness = go.Figure()
+                def fig_completeness():
+                    # 💡 Matriz Pivot: campo x plataforma
+                    pivot_completeness = quality_df.set_index('platform')[
+                        ['desc_rate', 'salary_rate', 'requirements_rate', 'location_rate']
+                    ].rename(columns={
+                        'desc_rate': 'Descripción',
+                        'salary_rate': 'Salario',
+                        'requirements_rate': 'Requisitos',
+                        'location_rate': 'Ubicación',
+                    }).T.fillna(0)
+
+                    fig = go.Figure()
                     for plat_name in pivot_completeness.columns:
-                        fig_completeness.add_trace(
+                        fig.add_trace(
                             go.Bar(
                                 name=str(plat_name),
                                 x=pivot_completeness.index.astype(str),
                                 y=pivot_completeness[plat_name]
-                            )          
+                            )
                         )
-                    fig_completeness.update_layout(
+                    fig.update_layout(
                         barmode='group',
                         xaxis_title="Campo",
                         yaxis_title="Completitud (%)",
                         legend_title="Plataforma"
                     )
-                    st.plotly_chart(fig_completeness, use_container_width=True)    
+                    return fig
+                plot('completeness', fig_completeness)
+            else:
+                st.info("No hay suficientes datos para mostrar la completitud de campos.")
 
-
-                else:
-                    st.info("No hay suficientes datos para mostrar la completitud de campos.")
-        
         # ========================================
-        # TAB6: TABLA DE DATOS
+        # TABLA DE DATOS
         # ========================================
         st.subheader("📋 Tabla de Vacantes Filtradas")
-        
+
         # Selector de columnas a mostrar
-        all_columns = ['title', 'company_name', 'country', 'seniority_level', 
-                      'source_platform', 'sector', 'salary_range', 'scraped_at']
         selected_columns = st.multiselect(
             "Selecciona columnas a mostrar:",
-            options=all_columns,
+            options=TABLE_COLUMNS,
             default=['title', 'company_name', 'country', 'seniority_level', 'scraped_at']
         )
-        
+
+        # Paginada: se ordenan posiciones de filas y solo se arma la página visible
+        col_sort, col_desc, col_size, col_page = st.columns([2, 1, 1, 1])
+        sort_col = col_sort.selectbox("Ordenar por", TABLE_COLUMNS,
+                                      index=TABLE_COLUMNS.index('scraped_at'), key='table_sort')
+        desc = col_desc.toggle("Descendente", value=True, key='table_desc')
+        page_rows = col_size.selectbox("Filas por página", PAGE_SIZES, index=1, key='table_page_rows')
+        if not use_rpc:
+            order = cached(('table_order', sort_col, desc), lambda: table.order(rows, sort_col, desc))
+        total = metrics['jobs'] if use_rpc else len(order)
+        pages = max(-(-total // page_rows), 1)
+        if st.session_state.get('table_page', 1) > pages:
+            st.session_state['table_page'] = pages
+        page = col_page.number_input(f"Página (de {pages})", min_value=1, max_value=pages, key='table_page')
+        start = (page - 1) * page_rows
+
+        if use_rpc:
+            # Solo la página visible viaja desde la base (orden y offset en Postgres)
+            df_page = load_table_rows(filters, tuple(TABLE_COLUMNS), limit=page_rows, offset=start,
+                                      order=sort_col, desc=desc)
+        else:
+            df_page = table.page(order, page - 1, page_rows)
+        st.caption(f"Vacantes {min(start + 1, total)}–{start + len(df_page)} de {total}.")
+
         if selected_columns:
             st.dataframe(
-                df_filtered[selected_columns],
+                df_page[selected_columns],
                 use_container_width=True,
                 hide_index=True,
                 height=400
             )
-        
-        # Botón de descarga
-        csv = df_filtered.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Descargar datos filtrados (CSV)",
-            data=csv,
-            file_name=f'jobs_filtered_{datetime.now().strftime("%Y%m%d")}.csv',
-            mime='text/csv'
-        )
+
+        # Descarga bajo demanda: el archivo se arma por bloques solo al pedirlo
+        col_format, col_export = st.columns([1, 2])
+        export_format = col_format.radio("Formato", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f][0],
+                                         horizontal=True, key='export_format')
+        export_key = state_key + (sort_col, desc, export_format)
+        if st.session_state.get('export', (None,))[0] != export_key:
+            st.session_state.pop('export', None)  # filtros u orden cambiaron: se libera el archivo viejo
+        if col_export.button("📦 Preparar descarga"):
+            with st.spinner("Generando archivo..."):
+                if use_rpc:
+                    chunks = export_rpc_chunks(filters, tuple(TABLE_COLUMNS), sort_col, desc, total)
+                else:
+                    chunks = table.chunks(order)
+                st.session_state['export'] = (export_key, export_file(chunks, export_format))
+        if 'export' in st.session_state:
+            label, extension, mime = EXPORT_FORMATS[export_format]
+            col_export.download_button(
+                label=f"📥 Descargar datos filtrados ({label})",
+                data=st.session_state['export'][1],
+                file_name=f'jobs_filtered_{datetime.now().strftime("%Y%m%d")}.{extension}',
+                mime=mime
+            )
 
 else:
     st.error("❌ No se pudo cargar la base de datos. Verifica tu conexión a Supabase.")
@@ -692,4 +903,4 @@ else:
 # FOOTER
 # ========================================
 st.markdown("---")
-st.caption("🤖 Dashboard creado con Streamlit | Datos de LinkedIn, Computrabajo y GetonBoard")
\ No newline at end of file
+st.caption("🤖 Dashboard creado con Streamlit | Datos de LinkedIn, Computrabajo y GetonBoard")
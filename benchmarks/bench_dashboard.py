@@ -0,0 +1,274 @@
+# benchmarks/bench_dashboard.py
+"""
+Carga en frío del dashboard (modo local, snapshot Parquet): todas las
+columnas contra la proyección angosta de dashboard/data.py, y lo que cuesta
+después pedir los textos solo para las vacantes filtradas. También mide la
+latencia de un cambio de filtros (máscaras sobre columnas string contra los
+bitmaps de dashboard/index.py) y de los agregados de skills (listas anidadas
+recorridas en Python contra el formato largo con códigos) y de las keywords
+en descripciones (escaneo en cada rerun contra la matriz de bits). Por último,
+los agregados de todos los gráficos: group-bys sobre las vacantes filtradas
+contra sumas sobre el cubo de dashboard/cube.py. Y la tabla de vacantes:
+frame filtrado completo + CSV en cada rerun contra una página ordenada por
+posiciones (dashboard/table.py).
+
+Uso:
+    python -m benchmarks.bench_dashboard --rows 50000 --filter-rows 500000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_jobs, make_skills
+from benchmarks.bench_snapshot import measure
+from dashboard.data import NARROW_COLUMNS, TEXT_COLUMNS, CATEGORY_COLUMNS, load_frame, load_texts
+from dashboard.index import FilterIndex
+from dashboard.cube import Cube
+from dashboard.aggregates import compute_aggregates
+from dashboard.keywords import KeywordMatrix, TECH_KEYWORDS
+from dashboard.table import PagedTable, TABLE_COLUMNS
+from etl.snapshot import SnapshotStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl"))
+from cleaning import clean_job_data  # noqa: E402
+
+
+def narrow_frame(n, seed=42):
+    """
+    Frame angosto sintético (como lo deja load_frame) con varios países y
+    empresas con distribución de Zipf (pocas concentran la mayoría de avisos)
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    df = pd.DataFrame({
+        "job_id": [f"job_{i}" for i in range(n)],
+        "country": rng.choice(["Peru", "Mexico", "Colombia", "Chile", "Argentina",
+                               "Brasil", "Ecuador", "Latam/Remote"], n),
+        "seniority_level": rng.choice(["Junior", "Mid", "Senior", "Lead", "Internship"], n),
+        "source_platform": rng.choice(["linkedin", "computrabajo", "GetOnBoard", "Web"], n),
+        "sector": rng.choice(["Fintech", "EdTech", "E-commerce", "Other"], n),
+        "company": np.char.add("Empresa ", (rng.zipf(1.6, n) % 2000).astype(str)),
+        "scraped_at": now - pd.to_timedelta(rng.uniform(0, 30, n), unit="D"),
+        "has_description": rng.random(n) < 0.9,
+        "has_salary": rng.random(n) < 0.4,
+        "has_requirements": rng.random(n) < 0.6,
+        "has_location": rng.random(n) < 0.95,
+    })
+    df["data_quality_score"] = (df["has_description"] * 50 + df["has_salary"] * 50).astype(float)
+    df = df.sort_values("scraped_at").reset_index(drop=True)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def narrow_skills(df, per_job=3, seed=42):
+    """Skills en formato largo para narrow_frame"""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"skill_{i}" for i in range(300)])
+    return pd.DataFrame({
+        "job_id": np.repeat(df["job_id"].to_numpy(), per_job),
+        "skill_name": names[rng.integers(0, len(names), len(df) * per_job)],
+    })
+
+
+def skills_latency(n, repeats=5):
+    """Top skills + skills por seniority: listas anidadas (antes) contra formato largo"""
+    df = narrow_frame(n)
+    df_skills = narrow_skills(df)
+    nested = df_skills.groupby("job_id", sort=False)["skill_name"].agg(list)
+    df["skills"] = df["job_id"].map(nested).map(lambda names: [{"skill_name": s} for s in names])
+    index = FilterIndex(df, df_skills)
+    filters = {"days": 30, "countries": index.values("country"),
+               "seniority": ["Mid", "Senior"], "platforms": index.values("source_platform")}
+    rows = index.rows(filters)
+    df_filtered = index.take(rows)
+
+    def loops():
+        pairs = []
+        for skills, seniority in zip(df_filtered["skills"], df_filtered["seniority_level"]):
+            for s in skills:
+                pairs.append((s["skill_name"], seniority))
+        df_sk = pd.DataFrame(pairs, columns=["skill_name", "seniority_level"])
+        return df_sk["skill_name"].value_counts().head(15), df_sk.groupby(["seniority_level", "skill_name"]).size()
+
+    def long_form():
+        df_sk = index.skills(rows)
+        return (df_sk["skill_name"].value_counts().head(15),
+                df_sk.groupby(["seniority_level", "skill_name"], observed=True).size())
+
+    print(f"\nskills de {len(df_filtered)} vacantes filtradas ({len(df_skills)} filas de skills en total)")
+    for label, fn in (("Antes: listas anidadas + loop", loops), ("Después: formato largo + códigos", long_form)):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        print(f"{label:<42} {(time.perf_counter() - start) / repeats * 1000:8.1f} ms")
+
+
+def keyword_latency(n, repeats=5):
+    """Keywords en descripciones: escaneo por rerun (antes) contra KeywordMatrix"""
+    df = make_jobs(n, description_words=120)[["job_id", "scraped_at", "description"]]
+    df["scraped_at"] = pd.to_datetime(df["scraped_at"])
+    df["updated_at"] = df["scraped_at"]
+    df["has_description"] = df["description"].notna()
+    texts = df.set_index("job_id")[["description"]]
+
+    def scan():
+        counts = {}
+        for desc in df.loc[df["has_description"], "description"]:
+            desc_lower = str(desc).lower()
+            for keyword in TECH_KEYWORDS:
+                if keyword in desc_lower:
+                    counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+    matrix = KeywordMatrix()
+    start = time.perf_counter()
+    matrix.update(df, texts)
+    build = time.perf_counter() - start
+    print(f"\nkeywords en {n} descripciones (matriz construida una vez en {build * 1000:.0f} ms, "
+          f"{matrix.bits.nbytes / 1e6:.1f} MB)")
+    for label, fn in (("Antes: escaneo en cada rerun", scan),
+                      ("Después: suma de columnas enmascarada", lambda: matrix.counts(df["job_id"]))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        print(f"{label:<42} {(time.perf_counter() - start) / repeats * 1000:8.1f} ms")
+
+
+def row_aggregates(df):
+    """Agregados por group-by sobre las filas (antes del cubo)"""
+    counts = {col: df[col].value_counts() for col in
+              ("seniority_level", "source_platform", "sector", "country", "company")}
+    counts["timeline"] = df.groupby(df["scraped_at"].dt.date).size()
+    top = counts["country"].index[:5]
+    counts["sector_country"] = df[df["country"].isin(top)].groupby(["country", "sector"], observed=True).size()
+    top = counts["company"].index[:10]
+    counts["company_seniority"] = df[df["company"].isin(top)].groupby(
+        ["company", "seniority_level"], observed=True).size()
+    counts["quality"] = df.groupby("source_platform", observed=True)[
+        ["has_description", "has_salary", "has_requirements", "has_location", "data_quality_score"]].mean()
+    return counts
+
+
+def cube_latency(n, repeats=5):
+    """Todos los gráficos: group-bys sobre filas filtradas (antes) contra el cubo"""
+    df = narrow_frame(n)
+    index = FilterIndex(df)
+    start = time.perf_counter()
+    cube = Cube(df)
+    build = time.perf_counter() - start
+    filters = {"days": 30, "countries": index.values("country"),
+               "seniority": ["Mid", "Senior"], "platforms": index.values("source_platform")}
+    sizes = ", ".join(f"{name} {index.n}" for name, index in cube.rollups.items())
+    print(f"\nagregados sobre {n} filas (cubo de {len(cube.cells)} celdas, roll-ups: {sizes}; "
+          f"construido en {build * 1000:.0f} ms)")
+    for label, fn in (("Antes: group-bys sobre filas filtradas", lambda: row_aggregates(index.select(filters))),
+                      ("Después: sumas sobre el cubo", lambda: compute_aggregates(cube.select(filters)))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        print(f"{label:<42} {(time.perf_counter() - start) / repeats * 1000:8.1f} ms")
+
+
+def table_latency(n, repeats=5):
+    """Tabla de vacantes: frame filtrado + CSV por rerun (antes) contra una página"""
+    df = narrow_frame(n)
+    for col in ("title", "company_name", "salary_range"):
+        df[col] = df["company"].astype(str)
+    index = FilterIndex(df)
+    table = PagedTable(df)
+    rows = index.rows({"days": 30, "countries": index.values("country"),
+                       "seniority": ["Mid", "Senior"], "platforms": index.values("source_platform")})
+    order = table.order(rows, "company_name", desc=False)
+    print(f"\ntabla de {len(order)} vacantes filtradas (página de 50)")
+    for label, fn in (("Antes: frame filtrado + to_csv por rerun",
+                       lambda: index.take(rows)[TABLE_COLUMNS].to_csv(index=False)),
+                      ("Después: orden por rangos (nuevo orden)",
+                       lambda: table.order(rows, "company_name", desc=False)),
+                      ("Después: página visible por rerun", lambda: table.page(order, 10, 50))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        print(f"{label:<42} {(time.perf_counter() - start) / repeats * 1000:8.1f} ms")
+
+
+def filter_latency(n, repeats=20):
+    """Mismo cambio de filtros: máscaras sobre strings (antes) contra FilterIndex"""
+    df = narrow_frame(n)
+    df_str = df.astype({col: str for col in CATEGORY_COLUMNS})
+    filters = {
+        "days": 15,
+        "countries": ["Peru", "Mexico", "Colombia", "Chile"],
+        "seniority": ["Mid", "Senior"],
+        "platforms": ["linkedin", "computrabajo", "GetOnBoard"],
+    }
+
+    def masks():
+        limit = datetime.now() - timedelta(days=filters["days"])
+        return df_str[
+            (df_str["scraped_at"] >= limit) &
+            (df_str["country"].isin(filters["countries"])) &
+            (df_str["seniority_level"].isin(filters["seniority"])) &
+            (df_str["source_platform"].isin(filters["platforms"]))
+        ].copy()
+
+    start = time.perf_counter()
+    index = FilterIndex(df)
+    build = time.perf_counter() - start
+    print(f"\nfiltros sobre {n} filas (índice construido en {build * 1000:.0f} ms)")
+    for label, fn in (("Antes: máscaras sobre strings + copia", masks),
+                      ("Después: bitmaps -> posiciones", lambda: index.rows(filters)),
+                      ("Después: bitmaps -> filas (take)", lambda: index.select(filters)),
+                      ("Solo fecha: rango contiguo (vista)",
+                       lambda: index.select({**filters, "countries": index.values("country"),
+                                             "seniority": index.values("seniority_level"),
+                                             "platforms": index.values("source_platform")}))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        print(f"{label:<42} {(time.perf_counter() - start) / repeats * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--filtered", type=float, default=0.1,
+                        help="Fracción de vacantes filtradas para las que se piden los textos")
+    parser.add_argument("--filter-rows", type=int, default=500000)
+    parser.add_argument("--keyword-rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    df_jobs = make_jobs(args.rows)
+    df_skills = make_skills(df_jobs)
+    df_clean = clean_job_data(df_jobs)
+    df_clean["updated_at"] = df_clean["scraped_at"]  # lo pone el trigger de la base
+
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        store.write("jobs", df_clean)
+        store.write("skills", df_skills)
+
+        print(f"filas: {args.rows} | skills: {len(df_skills)}")
+        print(f"{'método':<42} {'tiempo':>9} {'memoria pico':>13} {'DataFrame':>13} {'filas':>9}")
+        measure("Antes: todas las columnas",
+                lambda: load_frame(snapshot_root=root, columns=NARROW_COLUMNS + TEXT_COLUMNS)[0])
+        df = measure("Después: proyección angosta", lambda: load_frame(snapshot_root=root)[0])
+        ids = df["job_id"].sample(frac=args.filtered, random_state=42)
+        measure(f"Textos bajo demanda ({args.filtered:.0%} filtrado)",
+                lambda: load_texts(ids, snapshot_root=root))
+
+    filter_latency(args.filter_rows)
+    skills_latency(args.filter_rows)
+    keyword_latency(args.keyword_rows)
+    cube_latency(args.filter_rows)
+    table_latency(args.filter_rows)
+
+
+if __name__ == "__main__":
+    main()
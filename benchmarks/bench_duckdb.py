@@ -0,0 +1,68 @@
+# benchmarks/bench_duckdb.py
+"""
+Compara la limpieza + agregados en pandas (etl/cleaning.py) contra el motor
+DuckDB (etl/duck_engine.py) sobre vacantes sintéticas.
+
+Uso:
+    python -m benchmarks.bench_duckdb --sizes 10000,100000,1000000 --threads 4
+"""
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+from benchmarks.synthetic import make_jobs, make_skills
+
+# Los módulos del ETL se importan entre sí como scripts (from cleaning import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl"))
+from cleaning import clean_job_data  # noqa: E402
+from duck_engine import run_duckdb_etl, THREADS  # noqa: E402
+
+
+def pandas_path(df_jobs, df_skills):
+    """Ruta actual: limpieza fila a fila + agregados equivalentes a queries.py"""
+    df = clean_job_data(df_jobs.copy())
+    results = {
+        "GET_SECTOR_DISTRIBUTION": df[df["is_active"]].groupby("sector").size().sort_values(ascending=False),
+        "GET_TOP_SKILLS": df_skills["skill_name"].value_counts().head(20),
+        "GET_JOBS_BY_COUNTRY": df["country"].value_counts(),
+    }
+    return df, results
+
+
+def run(label, fn):
+    start = time.perf_counter()
+    df, results = fn()
+    seconds = time.perf_counter() - start
+    print(f"   {label:<10} {seconds:9.2f}s {len(df) / seconds:12,.0f} filas/s")
+    return df, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--threads", type=int, default=THREADS)
+    parser.add_argument("--skip-pandas-above", type=int, default=None,
+                        help="Omite la ruta pandas en tamaños mayores (1M filas tarda minutos)")
+    args = parser.parse_args()
+
+    for n in [int(s) for s in args.sizes.split(",")]:
+        df_jobs = make_jobs(n, description_words=60)
+        df_skills = make_skills(df_jobs)
+        print(f"\n📊 {n:,} vacantes / {len(df_skills):,} skills")
+
+        duck_df, duck_s = run("duckdb", lambda: run_duckdb_etl(df_jobs, df_skills, threads=args.threads))
+        if args.skip_pandas_above and n > args.skip_pandas_above:
+            continue
+        pandas_df, pandas_s = run("pandas", lambda: pandas_path(df_jobs, df_skills))
+
+        # Mismo resultado en las columnas derivadas
+        cols = ["job_id", "title", "company_name", "seniority_level", "country"]
+        same = pandas_df[cols].reset_index(drop=True).equals(duck_df[cols].reset_index(drop=True))
+        print(f"   speedup    {pandas_s / duck_s:9.1f}x  | resultados idénticos: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
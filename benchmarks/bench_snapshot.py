@@ -0,0 +1,65 @@
+# benchmarks/bench_snapshot.py
+"""
+Compara la carga JSON (lo que devuelve Supabase) contra el snapshot Parquet.
+
+Uso:
+    python -m benchmarks.bench_snapshot --rows 50000
+"""
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic import make_jobs
+from etl.snapshot import SnapshotStore
+
+
+def measure(label, fn):
+    """Tiempo, pico de memoria (heap de Python + buffers de Arrow) y tamaño del resultado"""
+    tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak += max(pa.total_allocated_bytes() - arrow_before, 0)
+    size = result.memory_usage(deep=True).sum()
+    print(f"{label:<42} {seconds:8.3f}s {peak / 1e6:10.1f} MB {size / 1e6:10.1f} MB {len(result):>9}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    df = make_jobs(args.rows)
+    payload = json.dumps(df.to_dict(orient="records"))
+
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        store.write("jobs", df)
+
+        print(f"JSON: {len(payload) / 1e6:.1f} MB | filas: {args.rows}")
+        print(f"{'método':<42} {'tiempo':>9} {'memoria pico':>13} {'DataFrame':>13} {'filas':>9}")
+        measure("JSON -> DataFrame (todas las columnas)", lambda: pd.DataFrame(json.loads(payload)))
+        measure("Parquet completo (mmap)", lambda: store.read("jobs"))
+        measure("Parquet 6 columnas", lambda: store.read(
+            "jobs", columns=["job_id", "country", "seniority_level", "source_platform",
+                             "sector", "scraped_at"]))
+        measure("Parquet 6 columnas + últimos 7 días", lambda: store.read(
+            "jobs", columns=["job_id", "country", "seniority_level", "source_platform",
+                             "sector", "scraped_at"],
+            since=datetime.now() - timedelta(days=7)))
+        measure("Parquet 1 plataforma (poda de particiones)", lambda: store.read(
+            "jobs", platforms=["computrabajo"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/synthetic.py
+"""Generador de vacantes sintéticas con la forma de la tabla `jobs`"""
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ["computrabajo", "GetOnBoard", "linkedin", "torre"]
+COUNTRIES = ["Peru", "Mexico", "Colombia", "Chile", "Argentina", "Ecuador", "Latam/Remote"]
+CITIES = ["Lima", "CDMX", "Bogotá", "Santiago", "Buenos Aires", "Quito", "Remoto"]
+SECTORS = ["Fintech", "EdTech", "AI & Machine Learning", "E-commerce", "HealthTech", "Other"]
+TITLES = ["Senior Python Developer", "Jr Data Analyst", "Backend Engineer in Acme",
+          "Desarrollador Full Stack 🚀", "Lead DevOps Engineer", "Practicante de Datos"]
+COMPANIES = ["Acme S.A.", "Globant", "Mercado Libre", "Rappi", "BCP", "Empresa no especificada"]
+SKILLS = ["Python", "SQL", "AWS", "Docker", "React", "Java", "Kubernetes", "Git", "Linux", "Power BI"]
+WORDS = ("python sql aws docker kubernetes react node experiencia equipo desarrollo datos "
+         "cloud remoto lima bogota fintech pagos aprendizaje plataforma").split()
+SALARIES = ["$ 15,000.00 (Mensual)", "USD 3000 - 5000", "A convenir", None, "S/. 4,500 - 6,000"]
+
+
+def make_jobs(n, seed=42, days=30, description_words=120):
+    """DataFrame con `n` vacantes crudas (como las deja el scraper)"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    platform = rng.choice(PLATFORMS, n)
+    city = rng.choice(CITIES, n)
+    words = np.array(WORDS)
+    descriptions = [" ".join(rng.choice(words, description_words)) for _ in range(n)]
+    offsets = rng.integers(0, days * 24 * 3600, n)
+    return pd.DataFrame({
+        "job_id": [hashlib.md5(f"{seed}-{i}".encode()).hexdigest() for i in range(n)],
+        "title": rng.choice(TITLES, n),
+        "company_name": rng.choice(COMPANIES, n),
+        "location": city,
+        "country": None,
+        "job_type": "Full-time",
+        "seniority_level": None,
+        "sector": rng.choice(SECTORS, n),
+        "description": descriptions,
+        "requirements": None,
+        "salary_range": rng.choice(np.array(SALARIES, dtype=object), n),
+        "salary_min": None,
+        "salary_max": None,
+        "posted_date": None,
+        "source_url": [f"https://pe.computrabajo.com/oferta-{i}" for i in range(n)],
+        "source_platform": platform,
+        "scraped_at": [(now - timedelta(seconds=int(o))).isoformat() for o in offsets],
+        "is_active": True,
+    })
+
+
+def make_skills(df_jobs, per_job=3, seed=42):
+    """Tabla `skills` sintética con `per_job` skills por vacante"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for job_id, scraped_at in zip(df_jobs["job_id"], df_jobs["scraped_at"]):
+        for skill in rng.choice(SKILLS, per_job, replace=False):
+            rows.append({"job_id": job_id, "skill_name": skill,
+                         "skill_category": "Pending ETL", "created_at": scraped_at})
+    return pd.DataFrame(rows)
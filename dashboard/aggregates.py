@@ -0,0 +1,141 @@
+# dashboard/aggregates.py
+"""
+Agregados que consume el dashboard, con la misma forma venga de donde venga:
+
+    - dashboard/rpc.py      los calcula Postgres (función dashboard_aggregates)
+    - compute_aggregates()  los calcula pandas sobre el cubo local
+                            (modo snapshot o si las funciones no están instaladas)
+
+Cada agregado es un DataFrame pequeño (conteos), independiente del número de
+vacantes; `metrics` es un dict con los totales de la cabecera. En modo local
+se suman las celdas del cubo (dashboard/cube.py) ya filtradas por
+dashboard/index.py, con las columnas de categoría como `category` (los
+conteos omiten categorías sin filas).
+"""
+import pandas as pd
+
+# Columnas de cada agregado (también define el DataFrame vacío)
+AGGREGATE_COLUMNS = {
+    'seniority': ['seniority_level', 'count'],
+    'platform': ['source_platform', 'count'],
+    'sector': ['sector', 'count'],
+    'country': ['country', 'count'],
+    'timeline': ['fecha', 'count'],
+    'sector_country': ['country', 'sector', 'count'],
+    'top_skills': ['skill_name', 'count'],
+    'skills_seniority': ['seniority_level', 'skill_name', 'count'],
+    'top_companies': ['company', 'count'],
+    'company_seniority': ['company', 'seniority_level', 'count'],
+    'quality': ['platform', 'jobs', 'desc_rate', 'salary_rate',
+                'requirements_rate', 'location_rate', 'quality_score'],
+    'keywords': ['keyword', 'count'],
+}
+METRIC_KEYS = ['jobs', 'unique_jobs', 'countries', 'companies', 'with_description', 'with_salary']
+
+
+def frames_from_payload(payload):
+    """JSON de dashboard_aggregates -> {'metrics': dict, nombre: DataFrame}"""
+    payload = payload or {}
+    aggregates = {'metrics': {k: (payload.get('metrics') or {}).get(k) or 0 for k in METRIC_KEYS}}
+    for name, columns in AGGREGATE_COLUMNS.items():
+        aggregates[name] = pd.DataFrame(payload.get(name) or [], columns=columns)
+    if not aggregates['timeline'].empty:
+        aggregates['timeline']['fecha'] = pd.to_datetime(aggregates['timeline']['fecha']).dt.date
+    return aggregates
+
+
+# ---------------------------------------------------
+# 🧮 AGREGADOS DESDE EL CUBO (modo local)
+# ---------------------------------------------------
+def _counts(df, col, weight=None):
+    """Conteo por `col`: filas, o suma de la medida `weight` (celdas del cubo)"""
+    counts = df[col].value_counts() if weight is None else df.groupby(col, observed=True)[weight].sum()
+    counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+    return counts.rename_axis(col).reset_index(name='count')
+
+
+def compute_aggregates(cube, skills=None, unique_jobs=None, names=None):
+    """
+    Mismos agregados que dashboard_aggregates, sumando las celdas del cubo
+    que cumplen los filtros (Cube.select(): roll-ups 'sector' y 'company' de
+    dashboard/cube.py). `skills` son las skills de las vacantes filtradas en
+    formato largo (FilterIndex.skills()) y `unique_jobs` las publicaciones
+    únicas (no es aditivo: lo da el índice del frame). Con `names` solo se
+    calculan esos agregados (más `metrics`), p. ej. los de la sección abierta.
+    `keywords` queda vacío: el dashboard lo calcula aparte con la matriz de
+    dashboard/keywords.py cuando se piden las descripciones.
+    """
+    def wanted(*keys):
+        return names is None or any(k in names for k in keys)
+
+    aggregates = {}
+    companies = cube['company']
+    cube = cube['sector']
+    jobs = int(cube['jobs'].sum())
+    aggregates['metrics'] = {
+        'jobs': jobs,
+        'unique_jobs': jobs if unique_jobs is None else unique_jobs,
+        'countries': cube['country'].nunique(),
+        'companies': companies['company'].nunique(),
+        'with_description': int(cube['with_description'].sum()),
+        'with_salary': int(cube['with_salary'].sum()),
+    }
+    for name, col in (('seniority', 'seniority_level'), ('platform', 'source_platform'),
+                      ('sector', 'sector'), ('country', 'country')):
+        if wanted(name, 'sector_country' if name == 'country' else name):
+            aggregates[name] = _counts(cube, col, 'jobs')
+
+    if wanted('timeline'):
+        aggregates['timeline'] = (
+            cube.groupby(cube['day'].dt.date)['jobs'].sum().rename_axis('fecha').reset_index(name='count')
+        )
+
+    if wanted('sector_country'):
+        top_countries = aggregates['country']['country'].head(5)
+        aggregates['sector_country'] = (
+            cube[cube['country'].isin(top_countries)].groupby(['country', 'sector'], observed=True)['jobs'].sum()
+            .reset_index(name='count')
+        )
+
+    # Skills: group-bys sobre los códigos del formato largo, sin recorrer listas
+    if wanted('top_skills', 'skills_seniority'):
+        if skills is None:
+            skills = pd.DataFrame(columns=['skill_name', 'seniority_level'])
+        aggregates['top_skills'] = _counts(skills, 'skill_name').head(15)
+        aggregates['skills_seniority'] = (
+            skills.groupby(['seniority_level', 'skill_name'], observed=True).size().reset_index(name='count')
+            .sort_values(['seniority_level', 'count'], ascending=[True, False])
+            .groupby('seniority_level', observed=True).head(5).reset_index(drop=True)
+        )
+
+    if wanted('top_companies', 'company_seniority'):
+        aggregates['top_companies'] = _counts(companies, 'company', 'jobs').head(20)
+        top_10 = aggregates['top_companies']['company'].head(10)
+        aggregates['company_seniority'] = (
+            companies[companies['company'].isin(top_10)].groupby(['company', 'seniority_level'], observed=True)['jobs'].sum()
+            .reset_index(name='count')
+        )
+
+    # Completitud y calidad por plataforma: tasas = sumas de flags / vacantes
+    if wanted('quality'):
+        quality = cube.groupby('source_platform', observed=True)[
+            ['jobs', 'with_description', 'with_salary', 'with_requirements', 'with_location', 'quality_sum']
+        ].sum()
+        aggregates['quality'] = pd.DataFrame({
+            'platform': quality.index,
+            'jobs': quality['jobs'].to_numpy(),
+            'desc_rate': (quality['with_description'] / quality['jobs'] * 100).to_numpy(),
+            'salary_rate': (quality['with_salary'] / quality['jobs'] * 100).to_numpy(),
+            'requirements_rate': (quality['with_requirements'] / quality['jobs'] * 100).to_numpy(),
+            'location_rate': (quality['with_location'] / quality['jobs'] * 100).to_numpy(),
+            'quality_score': (quality['quality_sum'] / quality['jobs']).to_numpy(),
+        })
+
+    if wanted('keywords'):
+        aggregates['keywords'] = pd.DataFrame(columns=AGGREGATE_COLUMNS['keywords'])
+
+    # Mismos tipos que el payload de rpc: etiquetas como texto, sin categorías vacías
+    for name, frame in aggregates.items():
+        if name != 'metrics':
+            aggregates[name] = frame.astype({c: str for c in frame.columns if frame[c].dtype == 'category'})
+    return aggregates
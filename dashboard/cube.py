@@ -0,0 +1,77 @@
+# dashboard/cube.py
+"""
+Cubo de conteos del dashboard en modo local.
+
+Casi todos los gráficos son un conteo sobre algún subconjunto de
+(día, país, seniority, plataforma, sector, empresa) bajo los mismos filtros
+del sidebar. El cubo agrupa el frame una vez por carga a ese grano y guarda,
+por celda, la cantidad de vacantes y las sumas de los flags de completitud;
+compute_aggregates (dashboard/aggregates.py) solo corta y suma celdas, así
+que su costo depende de la cantidad de combinaciones y no de las vacantes.
+
+Como con cualquier cubo, los gráficos no leen el grano completo sino el
+roll-up más chico que tiene sus dimensiones (ROLLUPS): sin empresa para los
+conteos por sector/país/plataforma y la calidad, sin sector para los de
+empresa. Los filtros se resuelven sobre cada roll-up con el mismo
+FilterIndex que el frame (columna de tiempo `day`, ya ordenada).
+"""
+from dashboard.index import FilterIndex
+
+CUBE_DIMENSIONS = ['day', 'country', 'seniority_level', 'source_platform', 'sector', 'company']
+# medida -> columna del frame que se suma (jobs cuenta filas)
+CUBE_MEASURES = {
+    'with_description': 'has_description',
+    'with_salary': 'has_salary',
+    'with_requirements': 'has_requirements',
+    'with_location': 'has_location',
+    'quality_sum': 'data_quality_score',
+}
+FILTER_DIMENSIONS = ['day', 'country', 'seniority_level', 'source_platform']
+ROLLUPS = {
+    'sector': FILTER_DIMENSIONS + ['sector'],
+    'company': FILTER_DIMENSIONS + ['company'],
+}
+
+
+def build_cube(df):
+    """Frame de vacantes -> una fila por combinación observada de CUBE_DIMENSIONS"""
+    facts = df[CUBE_DIMENSIONS[1:]].copy()
+    facts['day'] = df['scraped_at'].dt.floor('D')
+    facts['jobs'] = 1
+    for measure, col in CUBE_MEASURES.items():
+        facts[measure] = df[col].astype(float if col == 'data_quality_score' else int)
+    cube = (
+        facts.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False)
+        [['jobs'] + list(CUBE_MEASURES)].sum()
+        .reset_index()
+        .sort_values('day', kind='stable')
+        .reset_index(drop=True)
+    )
+    # Mismas categorías que el frame (group-bys observed y códigos estables)
+    for col in CUBE_DIMENSIONS[1:]:
+        cube[col] = cube[col].astype(df[col].dtype)
+    return cube
+
+
+def rollup(cells, dimensions):
+    """Suma las celdas sobre las dimensiones que no están en `dimensions`"""
+    measures = ['jobs'] + list(CUBE_MEASURES)
+    return (
+        cells.groupby(dimensions, observed=True, dropna=False, sort=False)[measures].sum()
+        .reset_index().sort_values('day', kind='stable').reset_index(drop=True)
+    )
+
+
+class Cube:
+    """Cubo a grano completo + roll-ups indexados para los filtros del sidebar"""
+
+    def __init__(self, df):
+        self.cells = build_cube(df)
+        self.rollups = {
+            name: FilterIndex(rollup(self.cells, dimensions), time_col='day')
+            for name, dimensions in ROLLUPS.items()
+        }
+
+    def select(self, filters, now=None):
+        """Celdas de cada roll-up que cumplen los filtros: {'sector': df, 'company': df}"""
+        return {name: index.select(filters, now) for name, index in self.rollups.items()}
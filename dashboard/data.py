@@ -0,0 +1,235 @@
+# dashboard/data.py
+"""
+Capa de datos del dashboard en modo local (snapshot Parquet o Supabase).
+
+Por defecto se carga una proyección angosta (NARROW_COLUMNS): categorías,
+fechas y flags de calidad, que es todo lo que usan los gráficos. Las skills
+vienen aparte en formato largo (una fila por job_id, skill_name), explotadas
+una sola vez en la carga; dashboard/index.py las pasa a códigos enteros.
+Los textos largos (description, requirements) se piden con `load_texts`
+solo para las vacantes filtradas y solo cuando se abre una vista que los
+necesita; el dashboard los guarda en una caché aparte.
+
+`load_frame` y `refresh_frame` devuelven (vacantes, skills).
+`refresh_frame` actualiza un frame ya cargado con solo el delta: filas con
+updated_at posterior a la última marca vista, que se mezclan por job_id; las
+vacantes vencidas (is_active = false) salen del frame. updated_at lo mueve un
+trigger en cada escritura, así el delta trae también lo que el ETL completa
+después del scrape (país, seniority, cluster, empresa, flags de calidad).
+"""
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from etl.snapshot import SnapshotStore
+from etl.quality import add_quality_flags, FLAG_COLUMNS
+
+NARROW_COLUMNS = [
+    "job_id", "cluster_id", "title", "company_name", "company_id", "country",
+    "seniority_level", "source_platform", "sector", "salary_range", "location",
+    "scraped_at", "updated_at", "data_quality_score", "is_active",
+] + FLAG_COLUMNS
+TEXT_COLUMNS = ["description", "requirements"]
+WINDOW_DAYS = 30
+PAGE_SIZE = 1000
+ID_BATCH = 200          # ids por filtro in.(...) (viajan en la URL)
+# updated_at es la hora de inicio de cada transacción: una fila confirmada tarde
+# puede llegar con una marca algo anterior a la ya vista. Se vuelve a pedir este margen; la mezcla por job_id lo hace inocuo.
+REFRESH_OVERLAP = timedelta(minutes=30)
+# Se guardan como category: códigos enteros para el índice de filtros (dashboard/index.py)
+CATEGORY_COLUMNS = ["country", "seniority_level", "source_platform", "sector", "company"]
+
+
+# ---------------------------------------------------
+# 📥 LECTURA
+# ---------------------------------------------------
+def read_snapshot(root, columns=NARROW_COLUMNS, days=WINDOW_DAYS, since=None):
+    """
+    (vacantes, skills) de los últimos `days` días del snapshot.
+    Con `since` solo las filas con updated_at posterior (refresco incremental);
+    la partición es por scraped_at, así que se recorre toda la ventana.
+    """
+    import pyarrow.dataset as ds
+    store = SnapshotStore(root)
+    window = datetime.now() - timedelta(days=days)
+    changed = ds.field("updated_at") > pd.Timestamp(since) if since is not None else None
+    df = store.read("jobs", columns=columns, since=window, filter=changed)
+    skills_filter = ds.field("job_id").isin(df["job_id"].tolist()) if since is not None else None
+    df_skills = store.read("skills", columns=["job_id", "skill_name"], filter=skills_filter)
+    return df, df_skills
+
+
+def fetch_supabase(client, columns=NARROW_COLUMNS, page_size=PAGE_SIZE, since=None):
+    """
+    (vacantes, skills) paginadas y solo con las columnas pedidas; las skills
+    llegan anidadas por vacante y se explotan acá a formato largo.
+    Con `since` solo las escritas después de esa marca (updated_at: también
+    cubre las vencidas, que el sweep marca con un UPDATE).
+    """
+    select = ", ".join(columns) + ", skills(skill_name)"
+    rows, offset = [], 0
+    while True:
+        query = client.table("jobs").select(select)
+        if since is not None:
+            query = query.gt("updated_at", since.isoformat())
+        page = (query.order("job_id")
+                .range(offset, offset + page_size - 1).execute().data)
+        rows.extend(page)
+        offset += len(page)
+        if len(page) < page_size:
+            break
+    df = pd.DataFrame(rows)
+    nested = df.pop("skills") if "skills" in df.columns else pd.Series([], dtype=object)
+    df_skills = pd.DataFrame(
+        [(job_id, s["skill_name"]) for job_id, skills in zip(df.get("job_id", []), nested)
+         if isinstance(skills, list) for s in skills if s.get("skill_name")],
+        columns=["job_id", "skill_name"],
+    )
+    return df, df_skills
+
+
+def load_texts(job_ids, client=None, snapshot_root=None, columns=TEXT_COLUMNS):
+    """Columnas de texto para un conjunto de job_id (DataFrame indexado por job_id)"""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return pd.DataFrame(columns=columns)
+    if snapshot_root:
+        import pyarrow.dataset as ds
+        df = SnapshotStore(snapshot_root).read(
+            "jobs", columns=["job_id"] + columns, filter=ds.field("job_id").isin(job_ids)
+        )
+    else:
+        rows = []
+        for start in range(0, len(job_ids), ID_BATCH):
+            rows.extend(
+                client.table("jobs").select(", ".join(["job_id"] + columns))
+                .in_("job_id", job_ids[start:start + ID_BATCH]).execute().data
+            )
+        df = pd.DataFrame(rows, columns=["job_id"] + columns)
+    return df.drop_duplicates("job_id").set_index("job_id")
+
+
+# ---------------------------------------------------
+# 🧹 NORMALIZACIÓN
+# ---------------------------------------------------
+def normalize(df, client=None, snapshot_root=None):
+    """Tipos y valores por defecto que esperan los gráficos"""
+    # Convertir fechas
+    df['scraped_at'] = pd.to_datetime(df['scraped_at']).dt.tz_localize(None)
+    # Filas anteriores a la columna: su última escritura conocida es el scrape
+    if 'updated_at' in df.columns:
+        df['updated_at'] = pd.to_datetime(df['updated_at']).dt.tz_localize(None).fillna(df['scraped_at'])
+    else:
+        df['updated_at'] = df['scraped_at']
+
+    # Limpiar y normalizar datos
+    df['country'] = df['country'].fillna('Latam/Remote').astype(str).str.strip()
+    df['seniority_level'] = df['seniority_level'].fillna('Mid').astype(str).str.strip()
+    df['source_platform'] = df['source_platform'].fillna('Web').astype(str).str.strip()
+    df['sector'] = df['sector'].fillna('Other').astype(str).str.strip()
+
+    # Flags de completitud precalculados por el ETL (etl/quality.py); para las
+    # filas anteriores a la columna se bajan sus textos y se calculan acá
+    quality_cols = FLAG_COLUMNS + ['data_quality_score']
+    for col in quality_cols:
+        if col not in df.columns:
+            df[col] = None
+    missing = df[quality_cols].isna().any(axis=1)
+    if missing.any():
+        texts = load_texts(df.loc[missing, 'job_id'], client, snapshot_root)
+        subset = df.loc[missing].join(texts, on='job_id')
+        df.loc[missing, quality_cols] = add_quality_flags(subset)[quality_cols].to_numpy()
+    df[FLAG_COLUMNS] = df[FLAG_COLUMNS].astype(bool)
+    df['data_quality_score'] = df['data_quality_score'].astype(float)
+    df['is_active'] = df['is_active'].fillna(True).astype(bool) if 'is_active' in df.columns else True
+    return df
+
+
+def add_company_column(df):
+    """Columna `company` para los gráficos (se recalcula sobre el frame completo)"""
+    # Empresa resuelta por el ETL (etl/companies.py): se muestra la variante más
+    # frecuente de cada company_id; los placeholders quedan sin empresa
+    if 'company_id' in df.columns and df['company_id'].notna().any():
+        canonical = (
+            df.dropna(subset=['company_id'])
+            .groupby(['company_id', 'company_name']).size()
+            .sort_values(ascending=False).reset_index()
+            .drop_duplicates('company_id').set_index('company_id')['company_name']
+        )
+        df['company'] = df['company_id'].map(canonical)
+    else:
+        df['company'] = df['company_name']
+    return df
+
+
+def _finish(df, df_skills, started, version):
+    """
+    Vencidas fuera, empresa canónica, orden por scraped_at y categóricas
+    (lo que espera FilterIndex); métricas de la carga en df.attrs
+    """
+    df = df[df['is_active']].sort_values('scraped_at', kind='stable').reset_index(drop=True)
+    df = add_company_column(df)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    df_skills = df_skills[df_skills['job_id'].isin(df['job_id'])].drop_duplicates().reset_index(drop=True)
+    df_skills['skill_name'] = df_skills['skill_name'].astype('category')
+    df.attrs['watermark'] = df['updated_at'].max() if not df.empty else None
+    df.attrs['version'] = version
+    df.attrs['load_seconds'] = round(time.perf_counter() - started, 3)
+    df.attrs['memory_mb'] = round(
+        float(df.memory_usage(deep=True).sum() + df_skills.memory_usage(deep=True).sum()) / 1e6, 1)
+    return df, df_skills
+
+
+def load_frame(client=None, snapshot_root=None, columns=NARROW_COLUMNS):
+    """(vacantes, skills) normalizados; en df.attrs queda el costo de la carga en frío"""
+    started = time.perf_counter()
+    if snapshot_root:
+        df, df_skills = read_snapshot(snapshot_root, columns)
+    else:
+        df, df_skills = fetch_supabase(client, columns)
+    if df.empty:
+        return df, df_skills
+    df = normalize(df, client, snapshot_root)
+    return _finish(df, df_skills, started, version=1)
+
+
+def refresh_frame(df, df_skills, client=None, snapshot_root=None, columns=NARROW_COLUMNS):
+    """
+    Nuevo (frame, skills) = cargados + delta desde df.attrs['watermark'] (no
+    modifica los recibidos). Las filas del delta y sus skills reemplazan por
+    job_id a las cargadas; las que llegan vencidas solo quitan su versión
+    anterior. Sin marca previa, carga completa.
+    """
+    watermark = df.attrs.get('watermark') if not df.empty else None
+    if watermark is None or pd.isna(watermark):
+        return load_frame(client, snapshot_root, columns)
+    started = time.perf_counter()
+    since = watermark - REFRESH_OVERLAP
+    if snapshot_root:
+        delta, delta_skills = read_snapshot(snapshot_root, columns, since=since)
+    else:
+        delta, delta_skills = fetch_supabase(client, columns, since=since)
+
+    merged, merged_skills = df, df_skills
+    if not delta.empty:
+        delta = normalize(delta, client, snapshot_root)
+        # El margen REFRESH_OVERLAP trae filas que ya estaban tal cual
+        same = delta['updated_at'].eq(delta['job_id'].map(df.set_index('job_id')['updated_at']))
+        delta = delta[~(same & delta['is_active'])]
+    if not delta.empty:
+        kept = df[~df['job_id'].isin(delta['job_id'])]
+        merged = pd.concat([kept, delta[kept.columns.intersection(delta.columns)]], ignore_index=True)
+        merged_skills = pd.concat([
+            df_skills[~df_skills['job_id'].isin(delta['job_id'])].astype({'skill_name': str}),
+            delta_skills[delta_skills['job_id'].isin(delta['job_id'])],
+        ], ignore_index=True)
+    if snapshot_root:
+        # Misma ventana que la carga completa
+        merged = merged[merged['scraped_at'] >= datetime.now() - timedelta(days=WINDOW_DAYS)]
+    if delta.empty and len(merged) == len(df):
+        return df, df_skills
+    merged, merged_skills = _finish(merged, merged_skills, started, version=df.attrs.get('version', 1) + 1)
+    merged.attrs['delta_rows'] = len(delta)
+    return merged, merged_skills
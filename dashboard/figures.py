@@ -0,0 +1,54 @@
+# dashboard/figures.py
+"""
+Caché LRU acotada para lo que el dashboard arma en cada rerun: agregados de
+una sección y figuras de Plotly.
+
+La llave es (versión de los datos, estado de los filtros, id del gráfico):
+volver a una sección o re-aplicar un filtro ya visto no recalcula nada, y
+un refresco de datos cambia la versión, así que lo viejo sale por LRU sin
+invalidación explícita.
+"""
+import threading
+from collections import OrderedDict
+
+MAX_ITEMS = 256
+
+
+class LRUCache:
+    def __init__(self, max_items=MAX_ITEMS):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        """Valor de `key`; si no está, build() y se guarda (se descarta el menos usado)"""
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return self.items[key]
+        value = build()
+        with self.lock:
+            self.misses += 1
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+
+def filter_key(filters):
+    """Estado de los filtros como llave hashable (el orden de selección no importa)"""
+    return tuple(
+        (name, tuple(sorted(value)) if isinstance(value, (list, tuple, set)) else value)
+        for name, value in sorted(filters.items())
+    )
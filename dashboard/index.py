@@ -0,0 +1,137 @@
+# dashboard/index.py
+"""
+Índice de filtros del dashboard en modo local.
+
+Se arma una vez por carga (o refresco) del frame y deja cada rerun del
+sidebar en operaciones sobre bits:
+
+    - el frame viene ordenado por scraped_at (dashboard/data.py), así que
+      "últimos N días" es un rango de posiciones [inicio, n) con searchsorted;
+      el filtro es por día calendario (desde las 00:00 de hace N días), igual
+      que dashboard_filtered_jobs en la base y que el cubo (dashboard/cube.py)
+    - país, seniority y plataforma son categóricas; por cada valor hay un
+      bitmap empaquetado (np.packbits) con las filas que lo tienen
+    - la selección de un filtro es el OR de los bitmaps de sus valores y la
+      combinación de filtros el AND; si un filtro tiene todos sus valores
+      marcados no se toca
+    - las skills en formato largo quedan como dos arrays alineados
+      (fila de la vacante, código de skill) ordenados por fila, de modo que
+      un rango de fechas también es un rango contiguo de skills
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# filtro del sidebar -> columna del frame
+FILTER_COLUMNS = {
+    'countries': 'country',
+    'seniority': 'seniority_level',
+    'platforms': 'source_platform',
+}
+
+
+def since_day(days, now=None):
+    """Inicio del filtro "últimos N días": medianoche de hace `days` días"""
+    return ((now or datetime.now()) - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class FilterIndex:
+    def __init__(self, df, df_skills=None, time_col='scraped_at'):
+        self.df = df
+        self.n = len(df)
+        self.times = df[time_col].to_numpy(dtype='datetime64[ns]')
+        if self.n and (np.diff(self.times) < np.timedelta64(0)).any():
+            raise ValueError(f"FilterIndex espera el frame ordenado por {time_col}")
+        self.bitmaps = {}
+        for col in FILTER_COLUMNS.values():
+            values = pd.Categorical(df[col])
+            codes = values.codes
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(values.categories)
+            }
+
+        # Publicación única: la misma vacante en varias plataformas comparte cluster_id
+        self.clusters = None
+        if 'job_id' in df.columns:
+            key = df['cluster_id'].fillna(df['job_id']) if 'cluster_id' in df.columns else df['job_id']
+            self.clusters, _ = pd.factorize(key)
+
+        # Skills: (fila de la vacante, código de skill), ordenadas por fila
+        seniority = pd.Categorical(df['seniority_level'])
+        self.seniority_codes, self.seniority_names = seniority.codes, seniority.categories
+        if df_skills is None or df_skills.empty:
+            df_skills = pd.DataFrame({'job_id': [], 'skill_name': []})
+        skill_rows = (pd.Index(df['job_id']).get_indexer(df_skills['job_id'])
+                      if len(df_skills) else np.array([], dtype=np.int64))
+        skills = pd.Categorical(df_skills['skill_name'])
+        found = skill_rows >= 0
+        order = np.argsort(skill_rows[found], kind='stable')
+        self.skill_rows = skill_rows[found][order].astype(np.int32)
+        self.skill_codes = skills.codes[found][order]
+        self.skill_names = skills.categories
+
+    def values(self, col):
+        """Valores presentes de una columna de filtro (opciones del sidebar)"""
+        return sorted(self.bitmaps[col])
+
+    def _mask(self, col, selected):
+        """OR de los bitmaps de los valores elegidos (None = sin restricción)"""
+        bitmaps = self.bitmaps[col]
+        selected = set(selected) & bitmaps.keys()
+        if len(selected) == len(bitmaps):
+            return None
+        if not selected:
+            return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce([bitmaps[v] for v in selected])
+
+    def rows(self, filters, now=None):
+        """
+        Posiciones de las filas que cumplen los filtros: un `slice` si solo
+        restringe la fecha (la vista no copia) o un array de enteros.
+        """
+        since = since_day(filters['days'], now)
+        start = int(np.searchsorted(self.times, np.datetime64(since, 'ns'), side='left'))
+        combined = None
+        for key, col in FILTER_COLUMNS.items():
+            mask = self._mask(col, filters[key])
+            if mask is not None:
+                combined = mask if combined is None else combined & mask
+        if combined is None:
+            return slice(start, self.n)
+        bits = np.unpackbits(combined, count=self.n)[start:]
+        return np.flatnonzero(bits) + start
+
+    def take(self, rows):
+        """Filas del frame para unas posiciones de rows() (rango contiguo -> vista sin copia)"""
+        if isinstance(rows, slice):
+            return self.df.iloc[rows]
+        return self.df.take(rows)
+
+    def select(self, filters, now=None):
+        """Filas filtradas del frame"""
+        return self.take(self.rows(filters, now))
+
+    def unique_jobs(self, rows):
+        """Publicaciones únicas (por cluster_id) entre las filas elegidas"""
+        seen = np.zeros(len(self.clusters) and self.clusters.max() + 1, dtype=bool)
+        seen[self.clusters[rows]] = True
+        return int(seen.sum())
+
+    def skills(self, rows):
+        """
+        Skills de las filas elegidas en formato largo (skill_name, seniority_level),
+        ambas categóricas armadas desde los códigos: listas para un groupby.
+        """
+        if isinstance(rows, slice):
+            lo, hi = np.searchsorted(self.skill_rows, [rows.start, rows.stop])
+            job_rows, codes = self.skill_rows[lo:hi], self.skill_codes[lo:hi]
+        else:
+            selected = np.zeros(self.n, dtype=bool)
+            selected[rows] = True
+            keep = selected[self.skill_rows]
+            job_rows, codes = self.skill_rows[keep], self.skill_codes[keep]
+        return pd.DataFrame({
+            'skill_name': pd.Categorical.from_codes(codes, self.skill_names),
+            'seniority_level': pd.Categorical.from_codes(self.seniority_codes[job_rows], self.seniority_names),
+        })
@@ -0,0 +1,135 @@
+# dashboard/keywords.py
+"""
+Matriz vacante × keyword para el gráfico "Keywords en Descripciones".
+
+Cada descripción se escanea una sola vez y queda como una fila de bits
+(np.packbits: 50 keywords = 7 bytes por vacante). El gráfico es la suma por
+columna de las filas filtradas. La matriz vive junto al frame cargado y se
+actualiza por vacante: solo se escanean (y se piden sus textos) las filas
+nuevas o cuyo updated_at cambió.
+
+El escaneo usa un autómata Aho-Corasick si está instalado `pyahocorasick`
+(todas las keywords en una pasada, con solapamientos: "java" dentro de
+"javascript" cuenta igual que antes); si no, una búsqueda de subcadena por
+keyword, que en CPython sigue siendo más rápida que una regex de alternativas.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:  # dependencia opcional
+    ahocorasick = None
+
+TECH_KEYWORDS = [
+    'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node',
+    'django', 'flask', 'fastapi', 'sql', 'postgresql', 'mysql', 'mongodb',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'ci/cd',
+    'machine learning', 'ai', 'data science', 'typescript', 'golang',
+    'ruby', 'php', 'laravel', 'symfony', '.net', 'c#', 'c++',
+    'tensorflow', 'pytorch', 'pandas', 'numpy', 'spark', 'kafka',
+    'redis', 'elasticsearch', 'nginx', 'apache', 'linux', 'terraform',
+    'ansible', 'jenkins', 'grafana', 'prometheus'
+]
+
+
+def _scanner(keywords):
+    """Función texto -> array bool (una posición por keyword)"""
+    positions = {k: i for i, k in enumerate(keywords)}
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword, i in positions.items():
+            automaton.add_word(keyword, i)
+        automaton.make_automaton()
+
+        def scan(text):
+            found = np.zeros(len(keywords), dtype=bool)
+            for _, i in automaton.iter(text):
+                found[i] = True
+            return found
+        return scan
+
+    def scan(text):
+        return np.fromiter((k in text for k in keywords), dtype=bool, count=len(keywords))
+    return scan
+
+
+def scan_texts(texts, keywords=TECH_KEYWORDS):
+    """Matriz empaquetada (len(texts), ceil(K/8)) con la presencia de cada keyword"""
+    scan = _scanner(keywords)
+    found = np.zeros((len(texts), len(keywords)), dtype=bool)
+    for row, text in enumerate(texts):
+        if isinstance(text, str) and text:
+            found[row] = scan(text.lower())
+    return np.packbits(found, axis=1)
+
+
+def counts_frame(bits, keywords=TECH_KEYWORDS, top=15):
+    """Suma por columna de una matriz empaquetada -> DataFrame keyword/count"""
+    totals = np.unpackbits(bits, axis=1, count=len(keywords)).sum(axis=0, dtype=np.int64)
+    result = pd.DataFrame({'keyword': keywords, 'count': totals})
+    result = result[result['count'] > 0]
+    return result.sort_values('count', ascending=False, kind='stable').head(top).reset_index(drop=True)
+
+
+class KeywordMatrix:
+    """
+    Bits de keywords por job_id, con el updated_at con que se calcularon
+    (si la vacante se vuelve a escribir, su fila se vuelve a escanear).
+    """
+
+    def __init__(self, keywords=TECH_KEYWORDS):
+        self.keywords = list(keywords)
+        self.ids = pd.Index([], dtype=object)
+        self.markers = np.array([], dtype='datetime64[ns]')
+        self.bits = np.zeros((0, (len(self.keywords) + 7) // 8), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _positions(self, job_ids):
+        return self.ids.get_indexer(pd.Index(job_ids)) if len(self.ids) else np.full(len(job_ids), -1)
+
+    def stale(self, df):
+        """job_id de `df` (job_id, updated_at) sin bits o con bits de otra versión"""
+        positions = self._positions(df['job_id'])
+        markers = df['updated_at'].to_numpy(dtype='datetime64[ns]')
+        known = positions >= 0
+        outdated = ~known
+        outdated[known] = self.markers[positions[known]] != markers[known]
+        return df['job_id'].to_numpy()[outdated]
+
+    def update(self, df, texts):
+        """
+        Escanea las filas de `df` (job_id, updated_at, has_description) con sus
+        textos (`texts` indexado por job_id, columna description) y las agrega
+        o reemplaza.
+        """
+        if df.empty:
+            return
+        df = df.drop_duplicates('job_id')
+        descriptions = df['job_id'].map(texts['description']) if not texts.empty else pd.Series(None, index=df.index)
+        if 'has_description' in df.columns:
+            descriptions = descriptions.where(df['has_description'].to_numpy(dtype=bool))
+        bits = scan_texts(descriptions.tolist(), self.keywords)
+        markers = df['updated_at'].to_numpy(dtype='datetime64[ns]')
+
+        positions = self._positions(df['job_id'])
+        known = positions >= 0
+        self.bits[positions[known]] = bits[known]
+        self.markers[positions[known]] = markers[known]
+        if (~known).any():
+            self.ids = self.ids.append(pd.Index(df['job_id'].to_numpy()[~known]))
+            self.markers = np.concatenate([self.markers, markers[~known]])
+            self.bits = np.concatenate([self.bits, bits[~known]])
+
+    def retain(self, job_ids):
+        """Descarta las filas de vacantes que ya no están en el frame"""
+        keep = self.ids.isin(job_ids)
+        if not keep.all():
+            self.ids, self.markers, self.bits = self.ids[keep], self.markers[keep], self.bits[keep]
+
+    def counts(self, job_ids, top=15):
+        """Menciones por keyword sobre las vacantes pedidas (suma de columnas enmascarada)"""
+        positions = self._positions(job_ids)
+        return counts_frame(self.bits[positions[positions >= 0]], self.keywords, top)
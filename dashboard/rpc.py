@@ -0,0 +1,43 @@
+# dashboard/rpc.py
+"""
+Consultas del dashboard resueltas en Postgres (funciones en database/schema.py).
+
+El payload depende solo de la cantidad de categorías, no de las vacantes:
+el dashboard ya no descarga la tabla completa para dibujar los gráficos.
+"""
+from dashboard.aggregates import frames_from_payload
+from dashboard.keywords import TECH_KEYWORDS
+
+
+def _params(filters):
+    return {
+        'p_days': filters['days'],
+        'p_countries': filters['countries'],
+        'p_seniority': filters['seniority'],
+        'p_platforms': filters['platforms'],
+    }
+
+
+def fetch_filter_options(client):
+    """Valores posibles de cada filtro + última fecha de scraping"""
+    data = client.rpc('dashboard_filter_options', {}).execute().data or {}
+    return {
+        'countries': sorted(data.get('countries') or []),
+        'seniority': sorted(data.get('seniority') or []),
+        'platforms': sorted(data.get('platforms') or []),
+        'last_scraped': data.get('last_scraped'),
+    }
+
+
+def fetch_aggregates(client, filters, keywords=TECH_KEYWORDS):
+    """Todos los agregados del dashboard en una sola llamada"""
+    params = {**_params(filters), 'p_keywords': keywords}
+    return frames_from_payload(client.rpc('dashboard_aggregates', params).execute().data)
+
+
+def fetch_jobs(client, filters, columns, limit=500, offset=0, order='scraped_at', desc=True, with_salary=False):
+    """Página de vacantes filtradas (solo las columnas pedidas)"""
+    query = client.rpc('dashboard_filtered_jobs', _params(filters)).select(', '.join(columns))
+    if with_salary:
+        query = query.eq('has_salary', True)
+    return query.order(order, desc=desc).range(offset, offset + limit - 1).execute().data
@@ -0,0 +1,104 @@
+# dashboard/table.py
+"""
+Tabla de vacantes filtradas: paginada y con exportación bajo demanda.
+
+El orden se resuelve sobre posiciones de filas, no sobre el frame: por cada
+columna ordenable se calcula una vez por carga su rango entero (np.int32), y
+ordenar las filas filtradas es un argsort de esos enteros. Solo la página
+visible se materializa como DataFrame (df.take de `page_rows` posiciones), así
+que un rerun no depende de cuántas vacantes pasan los filtros.
+
+La exportación también recorre las posiciones ordenadas por bloques: cada
+bloque se escribe al CSV o al Parquet (zstd) y se descarta, sin armar nunca
+el frame filtrado completo. En modo rpc los bloques son páginas de
+dashboard_filtered_jobs (dashboard/rpc.py).
+"""
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+TABLE_COLUMNS = ['title', 'company_name', 'country', 'seniority_level',
+                 'source_platform', 'sector', 'salary_range', 'scraped_at']
+PAGE_SIZES = [25, 50, 100, 250]
+NULL_RANK = np.iinfo(np.int32).max  # vacíos al final en ambos sentidos
+EXPORT_CHUNK = 1000  # máximo de filas por respuesta de PostgREST
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'csv', 'text/csv'),
+    'parquet': ('Parquet (zstd)', 'parquet', 'application/vnd.apache.parquet'),
+}
+
+
+class PagedTable:
+    """Rangos por columna del frame cargado para ordenar y paginar posiciones"""
+
+    def __init__(self, df, time_col='scraped_at'):
+        self.df = df
+        self.n = len(df)
+        self.time_col = time_col
+        self.ranks = {}
+
+    def _rank(self, col):
+        """Rango entero de cada fila en `col` (vacíos al final), calculado una vez"""
+        if col not in self.ranks:
+            if col == self.time_col:
+                # El frame ya viene ordenado por scraped_at (dashboard/data.py)
+                ranks = np.arange(self.n, dtype=np.int32)
+            else:
+                ranks = self.df[col].rank(method='dense').fillna(NULL_RANK).to_numpy(dtype=np.int32)
+            self.ranks[col] = ranks
+        return self.ranks[col]
+
+    def order(self, rows, col='scraped_at', desc=True):
+        """Posiciones de `rows` (slice o array de FilterIndex.rows) ordenadas por `col`"""
+        positions = np.arange(self.n)[rows] if isinstance(rows, slice) else np.asarray(rows)
+        if col == self.time_col:
+            return positions[::-1] if desc else positions
+        ranks = self._rank(col)[positions]
+        if desc:
+            ranks = np.where(ranks == NULL_RANK, NULL_RANK, -ranks)
+        return positions[np.argsort(ranks, kind='stable')]
+
+    def page(self, order, page, page_rows, columns=TABLE_COLUMNS):
+        """Solo las filas de la página `page` (desde 0)"""
+        return self.df.take(order[page * page_rows:(page + 1) * page_rows])[list(columns)]
+
+    def chunks(self, order, columns=TABLE_COLUMNS, chunk_rows=EXPORT_CHUNK):
+        """Filas ordenadas por bloques (para exportar sin materializar el total)"""
+        for start in range(0, len(order), chunk_rows):
+            yield self.df.take(order[start:start + chunk_rows])[list(columns)]
+
+
+def _arrow_chunk(df, columns):
+    """Bloque -> Table con el mismo esquema en todos los bloques (texto + scraped_at)"""
+    fields, arrays = [], []
+    for col in columns:
+        if col == 'scraped_at':
+            fields.append(pa.field(col, pa.timestamp('us')))
+            arrays.append(pa.array(pd.to_datetime(df[col], format='ISO8601', utc=True)
+                                   .dt.tz_localize(None).dt.as_unit('us'), type=pa.timestamp('us')))
+        else:
+            fields.append(pa.field(col, pa.string()))
+            arrays.append(pa.array([None if pd.isna(v) else str(v) for v in df[col].tolist()],
+                                   type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def export_file(chunks, fmt='csv', columns=TABLE_COLUMNS):
+    """Escribe los bloques uno a uno en CSV o Parquet (zstd) -> bytes del archivo"""
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        with pq.ParquetWriter(buffer, _arrow_chunk(pd.DataFrame(columns=columns), columns).schema,
+                              compression='zstd') as writer:
+            for chunk in chunks:
+                writer.write_table(_arrow_chunk(chunk, columns))
+    else:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(buffer, header=header, index=False, encoding='utf-8')
+            header = False
+        if header:
+            pd.DataFrame(columns=columns).to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
@@ -24,11 +24,15 @@ ORDER BY frecuencia DESC
 LIMIT 20;
 """
 
-# 3. Consulta de Auditoría de Calidad de Datos
+# 3. Consulta de Auditoría de Calidad de Datos (flags precalculados en etl/quality.py)
 GET_DATA_QUALITY_METRICS = """
 SELECT 
     source_platform,
     AVG(data_quality_score) as promedio_calidad,
+    AVG(has_description::int) * 100 as pct_descripcion,
+    AVG(has_salary::int) * 100 as pct_salario,
+    AVG(has_requirements::int) * 100 as pct_requisitos,
+    AVG(has_location::int) * 100 as pct_ubicacion,
     COUNT(*) as total_procesados
 FROM jobs 
 GROUP BY source_platform;
@@ -42,4 +46,52 @@ SELECT
 FROM jobs 
 GROUP BY country 
 ORDER BY total DESC;
-"""
\ No newline at end of file
+"""
+
+# 5. Serie diaria por skill (contadores incrementales de trend_daily)
+GET_SKILLS_DAILY_TREND = """
+SELECT 
+    day, 
+    skill_name, 
+    SUM(jobs_seen) as vacantes 
+FROM trend_daily 
+WHERE skill_name <> '*' 
+GROUP BY day, skill_name 
+ORDER BY day, vacantes DESC;
+"""
+
+# 6. Salario mensual en USD por país (columnas numéricas del ETL)
+GET_SALARY_BY_COUNTRY = """
+SELECT 
+    country, 
+    COUNT(*) as vacantes_con_salario, 
+    AVG((salary_min_usd_month + salary_max_usd_month) / 2) as promedio_usd_mes 
+FROM jobs 
+WHERE salary_min_usd_month IS NOT NULL 
+GROUP BY country 
+ORDER BY promedio_usd_mes DESC;
+"""
+
+# 7. Skills agrupadas por categoría (taxonomía aplicada en el ETL)
+GET_SKILLS_BY_CATEGORY = """
+SELECT 
+    skill_category, 
+    COUNT(*) as menciones, 
+    COUNT(DISTINCT job_id) as vacantes 
+FROM skills 
+WHERE skill_category <> 'Pending ETL' 
+GROUP BY skill_category 
+ORDER BY menciones DESC;
+"""
+
+# 8. Duración real de los avisos (first_seen_at → expired_at, ver etl/lifecycle.py)
+GET_POSTING_DURATIONS = """
+SELECT 
+    source_platform, 
+    COUNT(*) as vacantes_expiradas, 
+    AVG(EXTRACT(EPOCH FROM expired_at - first_seen_at) / 86400) as dias_promedio 
+FROM jobs 
+WHERE is_active = FALSE AND expired_at IS NOT NULL 
+GROUP BY source_platform 
+ORDER BY dias_promedio DESC;
+"""
@@ -38,4 +38,341 @@ CREATE TABLE IF NOT EXISTS skills (
 CREATE INDEX IF NOT EXISTS idx_jobs_sector ON jobs(sector);
 CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country);
 CREATE INDEX IF NOT EXISTS idx_skills_name ON skills(skill_name);
+
+-- Salarios normalizados por el ETL (etl/salary.py)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_currency VARCHAR(10);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_period VARCHAR(20);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_min_usd_month NUMERIC;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_max_usd_month NUMERIC;
+
+-- Skills por categoría (skill_category lo completa etl/skill_taxonomy.py)
+CREATE INDEX IF NOT EXISTS idx_skills_pending ON skills(skill_name) WHERE skill_category = 'Pending ETL';
+
+CREATE OR REPLACE VIEW skill_category_stats AS
+SELECT
+    skill_category,
+    COUNT(*) AS menciones,
+    COUNT(DISTINCT job_id) AS vacantes
+FROM skills
+WHERE skill_category <> 'Pending ETL'
+GROUP BY skill_category;
+
+-- Versión de taxonomía con la que se etiquetaron skills/sector (etl/reclassify.py)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS taxonomy_version VARCHAR(20);
+CREATE INDEX IF NOT EXISTS idx_jobs_taxonomy_version ON jobs(taxonomy_version);
+
+-- Casi-duplicados entre plataformas (etl/dedupe.py): job_id canónico del grupo
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cluster_id VARCHAR(255);
+CREATE INDEX IF NOT EXISTS idx_jobs_cluster ON jobs(cluster_id);
+
+-- Completitud y score de calidad por fila (etl/quality.py)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS has_description BOOLEAN;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS has_salary BOOLEAN;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS has_requirements BOOLEAN;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS has_location BOOLEAN;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS data_quality_score SMALLINT;
+
+-- Keywords técnicas encontradas en la descripción (etl/keyword_hits.py)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS description_keywords TEXT[];
+
+-- Ciclo de vida por mark-and-sweep (etl/lifecycle.py)
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    run_id BIGSERIAL PRIMARY KEY,
+    spider VARCHAR(100) NOT NULL,
+    source_platform VARCHAR(100),
+    started_at TIMESTAMP DEFAULT NOW(),
+    finished_at TIMESTAMP,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    finish_reason VARCHAR(100),
+    jobs_seen INTEGER DEFAULT 0,
+    errors INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_runs_finished ON crawl_runs(source_platform, run_id DESC) WHERE status = 'finished';
+-- Plataformas para las que el crawl cuenta como completo (errores bajo el tope)
+ALTER TABLE crawl_runs ADD COLUMN IF NOT EXISTS platforms TEXT[];
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS first_seen_at TIMESTAMP;
+UPDATE jobs SET first_seen_at = scraped_at WHERE first_seen_at IS NULL;
+ALTER TABLE jobs ALTER COLUMN first_seen_at SET DEFAULT NOW();
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_seen_run BIGINT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS expired_at TIMESTAMP;
+
+-- Índices parciales: las consultas "solo activas" y el sweep no recorren las expiradas
+CREATE INDEX IF NOT EXISTS idx_jobs_active_sector ON jobs(sector) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_jobs_active_run ON jobs(source_platform, last_seen_run) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_jobs_expired ON jobs(expired_at) WHERE NOT is_active;
+
+-- Última escritura de la fila (la mantiene el trigger): el dashboard y el
+-- snapshot refrescan por esta marca, así ven también lo que el ETL completa
+-- después del scrape (país, seniority, cluster, empresa, flags, keywords).
+-- El backfill va antes del trigger para no dejar todo en NOW().
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+UPDATE jobs SET updated_at = COALESCE(expired_at, scraped_at) WHERE updated_at IS NULL;
+ALTER TABLE jobs ALTER COLUMN updated_at SET DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated_at);
+
+CREATE OR REPLACE FUNCTION jobs_touch_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS jobs_touch_updated_at ON jobs;
+CREATE TRIGGER jobs_touch_updated_at
+    BEFORE INSERT OR UPDATE ON jobs
+    FOR EACH ROW EXECUTE FUNCTION jobs_touch_updated_at();
+
+CREATE OR REPLACE VIEW job_posting_durations AS
+SELECT
+    source_platform,
+    sector,
+    COUNT(*) AS vacantes_expiradas,
+    AVG(EXTRACT(EPOCH FROM expired_at - first_seen_at) / 86400) AS dias_promedio,
+    PERCENTILE_CONT(0.5) WITHIN GROUP (
+        ORDER BY EXTRACT(EPOCH FROM expired_at - first_seen_at) / 86400
+    ) AS dias_mediana
+FROM jobs
+WHERE NOT is_active AND expired_at IS NOT NULL AND first_seen_at IS NOT NULL
+GROUP BY source_platform, sector;
+
+-- Resolución de empresas (etl/companies.py): alias normalizado -> company_id
+CREATE TABLE IF NOT EXISTS companies (
+    company_id VARCHAR(255) PRIMARY KEY,
+    company_name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS company_aliases (
+    alias_key VARCHAR(255) PRIMARY KEY,
+    company_id VARCHAR(255) NOT NULL REFERENCES companies(company_id),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_company_aliases_company ON company_aliases(company_id);
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS company_id VARCHAR(255);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company_id);
+
+CREATE OR REPLACE VIEW salary_stats_by_country AS
+SELECT
+    country,
+    seniority_level,
+    COUNT(*) AS vacantes_con_salario,
+    PERCENTILE_CONT(0.5) WITHIN GROUP (
+        ORDER BY (salary_min_usd_month + salary_max_usd_month) / 2
+    ) AS mediana_usd_mes,
+    AVG(salary_min_usd_month) AS promedio_min_usd_mes,
+    AVG(salary_max_usd_month) AS promedio_max_usd_mes
+FROM jobs
+WHERE salary_min_usd_month IS NOT NULL
+GROUP BY country, seniority_level;
+
+-- Estado del ETL (watermarks de procesos incrementales)
+CREATE TABLE IF NOT EXISTS etl_state (
+    key VARCHAR(100) PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Contadores diarios de tendencias (etl/update_trends.py)
+-- skill_name = '*' cuenta cada vacante una sola vez (totales por país/sector)
+CREATE TABLE IF NOT EXISTS trend_daily (
+    day DATE NOT NULL,
+    skill_name VARCHAR(255) NOT NULL,
+    country VARCHAR(100) NOT NULL,
+    sector VARCHAR(100) NOT NULL,
+    seniority_level VARCHAR(100) NOT NULL,
+    jobs_seen INTEGER NOT NULL DEFAULT 0,
+    jobs_expired INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (day, skill_name, country, sector, seniority_level)
+);
+
+CREATE INDEX IF NOT EXISTS idx_trend_daily_skill ON trend_daily(skill_name, day);
+
+-- Suma atómica del delta diario (etl/update_trends.py): sin leer los contadores
+-- existentes desde el cliente, que PostgREST corta en 1000 filas
+CREATE OR REPLACE FUNCTION trend_daily_increment(p_rows JSONB)
+RETURNS VOID
+LANGUAGE sql AS $$
+    INSERT INTO trend_daily (day, skill_name, country, sector, seniority_level, jobs_seen, jobs_expired, updated_at)
+    SELECT r.day, r.skill_name, r.country, r.sector, r.seniority_level, r.jobs_seen, r.jobs_expired, NOW()
+    FROM jsonb_to_recordset(p_rows) AS r(
+        day DATE, skill_name TEXT, country TEXT, sector TEXT, seniority_level TEXT,
+        jobs_seen INTEGER, jobs_expired INTEGER
+    )
+    ON CONFLICT (day, skill_name, country, sector, seniority_level) DO UPDATE SET
+        jobs_seen = trend_daily.jobs_seen + EXCLUDED.jobs_seen,
+        jobs_expired = trend_daily.jobs_expired + EXCLUDED.jobs_expired,
+        updated_at = NOW();
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs(first_seen_at);
+
+-- Vistas Top-N derivadas de los contadores
+CREATE OR REPLACE VIEW trend_top_skills_30d AS
+SELECT
+    skill_name,
+    SUM(jobs_seen) AS jobs_seen,
+    RANK() OVER (ORDER BY SUM(jobs_seen) DESC) AS rank
+FROM trend_daily
+WHERE day >= CURRENT_DATE - 30 AND skill_name <> '*'
+GROUP BY skill_name;
+
+CREATE OR REPLACE VIEW trend_top_skills_by_country_30d AS
+SELECT * FROM (
+    SELECT
+        country,
+        skill_name,
+        SUM(jobs_seen) AS jobs_seen,
+        RANK() OVER (PARTITION BY country ORDER BY SUM(jobs_seen) DESC) AS rank
+    FROM trend_daily
+    WHERE day >= CURRENT_DATE - 30 AND skill_name <> '*'
+    GROUP BY country, skill_name
+) ranked
+WHERE rank <= 20;
+
+-- Agregados del dashboard en el servidor (dashboard/rpc.py): reciben los
+-- filtros del sidebar y devuelven solo los conteos, no las filas
+CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs(scraped_at);
+
+CREATE OR REPLACE FUNCTION dashboard_filtered_jobs(
+    p_days INTEGER DEFAULT 30,
+    p_countries TEXT[] DEFAULT NULL,
+    p_seniority TEXT[] DEFAULT NULL,
+    p_platforms TEXT[] DEFAULT NULL
+) RETURNS SETOF jobs
+LANGUAGE sql STABLE AS $$
+    SELECT *
+    FROM jobs
+    -- Solo activas y por día calendario (desde las 00:00 de hace p_days días), igual que el modo local
+    WHERE is_active
+      AND scraped_at >= (NOW() - make_interval(days => p_days))::date
+      AND (p_countries IS NULL OR COALESCE(country, 'Latam/Remote') = ANY(p_countries))
+      AND (p_seniority IS NULL OR COALESCE(seniority_level, 'Mid') = ANY(p_seniority))
+      AND (p_platforms IS NULL OR COALESCE(source_platform, 'Web') = ANY(p_platforms));
+$$;
+
+-- Opciones de los filtros: una fila precalculada que el ETL refresca al
+-- terminar (refresh_dashboard_filter_options), no tres DISTINCT por visita.
+-- Solo vacantes activas, como los filtros del modo local. Se recrea (DROP)
+-- porque CREATE ... IF NOT EXISTS no reemplaza la versión anterior.
+DROP MATERIALIZED VIEW IF EXISTS dashboard_filter_options_mv;
+CREATE MATERIALIZED VIEW dashboard_filter_options_mv AS
+SELECT jsonb_build_object(
+    'countries', (SELECT jsonb_agg(DISTINCT COALESCE(country, 'Latam/Remote')) FROM jobs WHERE is_active),
+    'seniority', (SELECT jsonb_agg(DISTINCT COALESCE(seniority_level, 'Mid')) FROM jobs WHERE is_active),
+    'platforms', (SELECT jsonb_agg(DISTINCT COALESCE(source_platform, 'Web')) FROM jobs WHERE is_active),
+    'last_scraped', (SELECT MAX(scraped_at) FROM jobs WHERE is_active)
+) AS options;
+
+CREATE OR REPLACE FUNCTION refresh_dashboard_filter_options()
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW dashboard_filter_options_mv;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION dashboard_filter_options()
+RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+    SELECT options FROM dashboard_filter_options_mv;
+$$;
+
+CREATE OR REPLACE FUNCTION dashboard_aggregates(
+    p_days INTEGER DEFAULT 30,
+    p_countries TEXT[] DEFAULT NULL,
+    p_seniority TEXT[] DEFAULT NULL,
+    p_platforms TEXT[] DEFAULT NULL,
+    p_keywords TEXT[] DEFAULT '{}'
+) RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+    WITH f AS (
+        SELECT
+            j.job_id,
+            COALESCE(j.cluster_id, j.job_id) AS cluster_id,
+            j.scraped_at,
+            COALESCE(j.country, 'Latam/Remote') AS country,
+            COALESCE(j.seniority_level, 'Mid') AS seniority_level,
+            COALESCE(j.source_platform, 'Web') AS source_platform,
+            COALESCE(j.sector, 'Other') AS sector,
+            c.company_name AS company,
+            COALESCE(j.has_description, FALSE) AS has_description,
+            COALESCE(j.has_salary, FALSE) AS has_salary,
+            COALESCE(j.has_requirements, FALSE) AS has_requirements,
+            COALESCE(j.has_location, FALSE) AS has_location,
+            COALESCE(j.data_quality_score, 0) AS data_quality_score,
+            j.description_keywords
+        FROM dashboard_filtered_jobs(p_days, p_countries, p_seniority, p_platforms) j
+        LEFT JOIN companies c ON c.company_id = j.company_id
+    ),
+    sk AS (
+        SELECT s.skill_name, f.seniority_level
+        FROM skills s JOIN f ON f.job_id = s.job_id
+    ),
+    top_countries AS (
+        SELECT country FROM f GROUP BY country ORDER BY COUNT(*) DESC LIMIT 5
+    ),
+    top_companies AS (
+        SELECT company, COUNT(*) AS count FROM f
+        WHERE company IS NOT NULL GROUP BY company ORDER BY count DESC LIMIT 20
+    )
+    SELECT jsonb_build_object(
+        'metrics', (SELECT jsonb_build_object(
+            'jobs', COUNT(*),
+            'unique_jobs', COUNT(DISTINCT cluster_id),
+            'countries', COUNT(DISTINCT country),
+            'companies', COUNT(DISTINCT company),
+            'with_description', COUNT(*) FILTER (WHERE has_description),
+            'with_salary', COUNT(*) FILTER (WHERE has_salary)
+        ) FROM f),
+        'seniority', (SELECT jsonb_agg(t) FROM (
+            SELECT seniority_level, COUNT(*) AS count FROM f GROUP BY 1 ORDER BY 2 DESC) t),
+        'platform', (SELECT jsonb_agg(t) FROM (
+            SELECT source_platform, COUNT(*) AS count FROM f GROUP BY 1 ORDER BY 2 DESC) t),
+        'sector', (SELECT jsonb_agg(t) FROM (
+            SELECT sector, COUNT(*) AS count FROM f GROUP BY 1 ORDER BY 2 DESC) t),
+        'country', (SELECT jsonb_agg(t) FROM (
+            SELECT country, COUNT(*) AS count FROM f GROUP BY 1 ORDER BY 2 DESC) t),
+        'timeline', (SELECT jsonb_agg(t) FROM (
+            SELECT scraped_at::date AS fecha, COUNT(*) AS count FROM f GROUP BY 1 ORDER BY 1) t),
+        'sector_country', (SELECT jsonb_agg(t) FROM (
+            SELECT country, sector, COUNT(*) AS count FROM f
+            WHERE country IN (SELECT country FROM top_countries) GROUP BY 1, 2) t),
+        'top_skills', (SELECT jsonb_agg(t) FROM (
+            SELECT skill_name, COUNT(*) AS count FROM sk GROUP BY 1 ORDER BY 2 DESC LIMIT 15) t),
+        'skills_seniority', (SELECT jsonb_agg(t) FROM (
+            SELECT seniority_level, skill_name, count FROM (
+                SELECT seniority_level, skill_name, COUNT(*) AS count,
+                       ROW_NUMBER() OVER (PARTITION BY seniority_level ORDER BY COUNT(*) DESC) AS rn
+                FROM sk GROUP BY 1, 2
+            ) ranked WHERE rn <= 5) t),
+        'top_companies', (SELECT jsonb_agg(t) FROM (
+            SELECT company, count FROM top_companies ORDER BY count DESC) t),
+        'company_seniority', (SELECT jsonb_agg(t) FROM (
+            SELECT company, seniority_level, COUNT(*) AS count FROM f
+            WHERE company IN (SELECT company FROM top_companies ORDER BY count DESC LIMIT 10)
+            GROUP BY 1, 2) t),
+        'quality', (SELECT jsonb_agg(t) FROM (
+            SELECT
+                source_platform AS platform,
+                COUNT(*) AS jobs,
+                AVG(has_description::int) * 100 AS desc_rate,
+                AVG(has_salary::int) * 100 AS salary_rate,
+                AVG(has_requirements::int) * 100 AS requirements_rate,
+                AVG(has_location::int) * 100 AS location_rate,
+                AVG(data_quality_score) AS quality_score
+            FROM f GROUP BY 1 ORDER BY 1) t),
+        -- Keywords precalculadas por el ETL (etl/keyword_hits.py): sin escanear descripciones
+        'keywords', (SELECT jsonb_agg(t) FROM (
+            SELECT k AS keyword, COUNT(*) AS count
+            FROM f CROSS JOIN unnest(f.description_keywords) AS k
+            WHERE k = ANY(p_keywords)
+            GROUP BY 1 ORDER BY 2 DESC LIMIT 15) t)
+    );
+$$;
 """
\ No newline at end of file
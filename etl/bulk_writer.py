@@ -0,0 +1,207 @@
+# etl/bulk_writer.py
+"""
+Escritor masivo para Supabase: sube registros por bloques, con varios
+bloques en vuelo, reintentos con backoff ante errores transitorios y
+bisección de bloques rechazados por sus datos.
+"""
+import os
+import json
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import httpx
+import numpy as np
+import pandas as pd
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+# ---------------------------------------------------
+# CONFIGURACIÓN (sobrescribible por variables de entorno)
+# ---------------------------------------------------
+CHUNK_SIZE = int(os.environ.get("ETL_CHUNK_SIZE", 500))
+MAX_WORKERS = int(os.environ.get("ETL_MAX_WORKERS", 4))
+MAX_RETRIES = int(os.environ.get("ETL_MAX_RETRIES", 4))
+BACKOFF_BASE = float(os.environ.get("ETL_BACKOFF_BASE", 0.5))
+
+# Códigos de Postgres que vale la pena reintentar (timeouts, deadlocks, conexiones)
+TRANSIENT_PG_CODES = {"57014", "40001", "40P01", "53300", "08006", "08003"}
+# Respuestas HTTP sin cuerpo de Postgres (postgrest-py usa el status como código)
+TRANSIENT_HTTP_CODES = {"429", "500", "502", "503", "504"}
+
+
+# ---------------------------------------------------
+# 🧩 PREPARACIÓN DE BLOQUES
+# ---------------------------------------------------
+def _json_value(v):
+    if isinstance(v, (pd.Timestamp, pd.Timedelta)):
+        return v.isoformat()
+    if isinstance(v, np.ndarray):  # listas leídas de Parquet
+        return v.tolist()
+    return v
+
+
+def _to_records(block):
+    """Convierte un bloque del DataFrame a dicts serializables en JSON"""
+    # Se convierte en los dicts: Series.map volvería a poner NaN donde hay None
+    records = block.astype(object).where(block.notna(), None).to_dict(orient="records")
+    return [{k: _json_value(v) for k, v in row.items()} for row in records]
+
+
+def iter_record_chunks(df, chunk_size=CHUNK_SIZE):
+    """Genera listas de dicts bloque a bloque, sin materializar todo el DataFrame"""
+    for start in range(0, len(df), chunk_size):
+        yield _to_records(df.iloc[start:start + chunk_size])
+
+
+def is_transient(exc):
+    """Errores de red/timeout, 429/5xx o códigos de Postgres recuperables"""
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(exc, APIError):
+        return str(getattr(exc, "code", "")) in TRANSIENT_PG_CODES | TRANSIENT_HTTP_CODES
+    return False
+
+
+# ---------------------------------------------------
+# 🔁 ENVÍO DE UN BLOQUE (REINTENTOS + BISECCIÓN)
+# ---------------------------------------------------
+def _send(client, table, records, on_conflict, max_retries, ignore_duplicates=False):
+    """
+    Envía un bloque con backoff exponencial ante errores transitorios.
+    Devuelve (reintentos, error): error es None si el bloque se confirmó.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            client.table(table).upsert(
+                records,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates,
+                returning=ReturnMethod.minimal,
+            ).execute()
+            return attempt, None
+        except Exception as e:
+            if not is_transient(e) or attempt == max_retries:
+                return attempt, e
+            time.sleep(BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE))
+
+
+def _failed_rows(records, key, error):
+    return [{"key": row.get(key) if key else None, "error": str(error)} for row in records]
+
+
+def _send_with_bisect(client, table, records, on_conflict, max_retries, key, ignore_duplicates=False):
+    """
+    Si un bloque es rechazado por sus datos se parte en dos mitades hasta
+    aislar las filas problemáticas. Si se agotan los reintentos de un error
+    transitorio (timeout, 429, 5xx) el bloque entero queda fallido: partirlo
+    solo multiplicaría las peticiones contra un servidor caído.
+    Devuelve (filas_ok, reintentos, filas_fallidas).
+    """
+    retries, error = _send(client, table, records, on_conflict, max_retries, ignore_duplicates)
+    if error is None:
+        return len(records), retries, []
+    if is_transient(error) or len(records) == 1:
+        return 0, retries, _failed_rows(records, key, error)
+
+    mid = len(records) // 2
+    ok_a, retries_a, failed_a = _send_with_bisect(client, table, records[:mid], on_conflict, max_retries, key,
+                                                  ignore_duplicates)
+    ok_b, retries_b, failed_b = _send_with_bisect(client, table, records[mid:], on_conflict, max_retries, key,
+                                                  ignore_duplicates)
+    return ok_a + ok_b, retries + retries_a + retries_b, failed_a + failed_b
+
+
+def _upload_chunk(client, table, index, records, on_conflict, max_retries, key, ignore_duplicates=False):
+    start = time.perf_counter()
+    payload_bytes = len(json.dumps(records, default=str).encode("utf-8"))
+    ok, retries, failed = _send_with_bisect(client, table, records, on_conflict, max_retries, key,
+                                            ignore_duplicates)
+    return {
+        "chunk": index,
+        "rows": len(records),
+        "rows_ok": ok,
+        "rows_failed": len(failed),
+        "retries": retries,
+        "bytes": payload_bytes,
+        "seconds": round(time.perf_counter() - start, 3),
+        "failed": failed,
+    }
+
+
+# ---------------------------------------------------
+# 🚚 API PRINCIPAL
+# ---------------------------------------------------
+def upsert_in_chunks(client, table, data, on_conflict, chunk_size=CHUNK_SIZE,
+                     max_workers=MAX_WORKERS, max_retries=MAX_RETRIES,
+                     key=None, on_chunk=None, skip_chunks=(), verbose=True, ignore_duplicates=False):
+    """
+    Hace UPSERT de `data` (DataFrame o iterable de listas de dicts) por bloques.
+
+    - Mantiene como máximo `max_workers * 2` bloques en memoria a la vez.
+    - `on_chunk(resultado)` se llama al confirmar cada bloque.
+    - `skip_chunks`: números de bloque ya confirmados en un intento anterior.
+    - `ignore_duplicates`: no pisa filas existentes (ON CONFLICT DO NOTHING).
+    Devuelve un reporte con el detalle por bloque y los totales.
+    """
+    if isinstance(data, pd.DataFrame):
+        chunks = iter_record_chunks(data, chunk_size)
+    else:
+        chunks = iter(data)
+
+    results = []
+    in_flight = set()
+    started = time.perf_counter()
+
+    def _collect(done):
+        for fut in done:
+            res = fut.result()
+            results.append(res)
+            if verbose:
+                status = "✅" if not res["rows_failed"] else "⚠️"
+                print(
+                    f"   {status} {table} bloque #{res['chunk']}: {res['rows_ok']}/{res['rows']} filas "
+                    f"en {res['seconds']:.2f}s ({res['bytes'] / 1024:.1f} KB, reintentos: {res['retries']})"
+                )
+            if on_chunk:
+                on_chunk(res)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for index, records in enumerate(chunks):
+            if not records or index in skip_chunks:
+                continue
+            if len(in_flight) >= max_workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                _collect(done)
+            in_flight.add(pool.submit(
+                _upload_chunk, client, table, index, records, on_conflict, max_retries, key,
+                ignore_duplicates
+            ))
+        done, _ = wait(in_flight)
+        _collect(done)
+
+    results.sort(key=lambda r: r["chunk"])
+    report = {
+        "table": table,
+        "chunks": results,
+        "rows": sum(r["rows"] for r in results),
+        "rows_ok": sum(r["rows_ok"] for r in results),
+        "failed": [f for r in results for f in r["failed"]],
+        "retries": sum(r["retries"] for r in results),
+        "bytes": sum(r["bytes"] for r in results),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    if verbose:
+        print_report(report)
+    return report
+
+
+def print_report(report):
+    """Resumen final de una subida masiva"""
+    print(
+        f"📊 {report['table']}: {report['rows_ok']}/{report['rows']} filas en "
+        f"{len(report['chunks'])} bloques, {report['bytes'] / 1024:.1f} KB, {report['seconds']:.2f}s, "
+        f"{report.get('retries', 0)} reintentos"
+    )
+    for f in report["failed"][:20]:
+        print(f"   ❌ Fila rechazada ({f['key']}): {f['error']}")
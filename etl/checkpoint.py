@@ -0,0 +1,199 @@
+# etl/checkpoint.py
+"""
+Checkpoints por etapa para el ETL batch (sweep → purge → extract → clean →
+upload_jobs → upload_skills → categorize_skills).
+
+Cada etapa deja sus DataFrames en Parquet y un manifest.json con filas,
+hash sha256 de cada archivo, duración y estado. Si la corrida falla, la
+siguiente ejecución con los mismos parámetros salta las etapas completas y
+retoma las subidas desde los bloques ya confirmados por Supabase.
+
+    data/checkpoints/current/manifest.json
+    data/checkpoints/current/extract/jobs.parquet
+    data/checkpoints/last_manifest.json      (corrida completa anterior)
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+CHECKPOINT_DIR = os.environ.get(
+    "ETL_CHECKPOINT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "checkpoints"),
+)
+# Un checkpoint más viejo que esto ya no representa el estado de la base
+MAX_AGE_HOURS = float(os.environ.get("ETL_CHECKPOINT_MAX_AGE_HOURS", 12))
+STAGES = ["sweep", "purge", "extract", "clean", "upload_jobs", "upload_skills", "categorize_skills"]
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunCheckpoint:
+    """Estado persistente de una corrida del ETL"""
+
+    def __init__(self, params, root=CHECKPOINT_DIR, fresh=False):
+        self.root = root
+        self.run_dir = os.path.join(root, "current")
+        self.manifest_path = os.path.join(self.run_dir, "manifest.json")
+        self.manifest = self._resume(params, fresh)
+
+    # ---------- manifest ----------
+    def _resume(self, params, fresh):
+        if not fresh and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            age = datetime.now() - datetime.fromisoformat(manifest["started_at"])
+            if manifest["params"] == params and age < timedelta(hours=MAX_AGE_HOURS):
+                done = [s for s in STAGES if manifest["stages"].get(s, {}).get("status") == "done"]
+                print(f"♻️ Retomando corrida {manifest['run_id']} (etapas completas: {', '.join(done) or 'ninguna'})")
+                return manifest
+            print("🧹 Checkpoint anterior descartado (parámetros distintos o demasiado antiguo).")
+
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        os.makedirs(self.run_dir, exist_ok=True)
+        now = datetime.now()
+        return {
+            "run_id": now.strftime("%Y%m%dT%H%M%S"),
+            "started_at": now.isoformat(),
+            "params": params,
+            "stages": {},
+        }
+
+    def _save(self):
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(tmp, self.manifest_path)
+
+    def _begin(self, stage):
+        info = self.manifest["stages"].setdefault(stage, {})
+        info.update(status="running", started_at=datetime.now().isoformat(), error=None)
+        info["attempts"] = info.get("attempts", 0) + 1
+        self._save()
+        return info
+
+    def _fail(self, info, started, error):
+        info.update(status="failed", error=str(error),
+                    seconds=round(time.perf_counter() - started, 3))
+        self._save()
+
+    # ---------- consultas ----------
+    def is_done(self, stage):
+        info = self.manifest["stages"].get(stage, {})
+        if info.get("status") != "done":
+            return False
+        # Un archivo faltante o alterado invalida la etapa
+        for output in info.get("outputs", {}).values():
+            path = os.path.join(self.run_dir, output["file"])
+            if not os.path.exists(path) or _file_hash(path) != output["sha256"]:
+                print(f"⚠️ Checkpoint de '{stage}' inválido, se vuelve a ejecutar.")
+                return False
+        return True
+
+    def load(self, stage):
+        outputs = self.manifest["stages"][stage].get("outputs", {})
+        return {name: pd.read_parquet(os.path.join(self.run_dir, o["file"])) for name, o in outputs.items()}
+
+    # ---------- ejecución ----------
+    def run(self, stage, fn):
+        """
+        Ejecuta `fn()` (que devuelve {nombre: DataFrame} o None) y guarda sus
+        salidas; si la etapa ya estaba completa devuelve lo guardado.
+        """
+        if self.is_done(stage):
+            print(f"⏭️ Etapa '{stage}' recuperada del checkpoint.")
+            return self.load(stage)
+
+        info = self._begin(stage)
+        started = time.perf_counter()
+        try:
+            frames = fn() or {}
+        except BaseException as e:  # también Ctrl+C / cancelación del runner
+            self._fail(info, started, e)
+            raise
+
+        outputs = {}
+        os.makedirs(os.path.join(self.run_dir, stage), exist_ok=True)
+        for name, df in frames.items():
+            rel = os.path.join(stage, f"{name}.parquet")
+            df.to_parquet(os.path.join(self.run_dir, rel), index=False)
+            outputs[name] = {"file": rel, "rows": len(df),
+                             "sha256": _file_hash(os.path.join(self.run_dir, rel))}
+        info.update(status="done", outputs=outputs, seconds=round(time.perf_counter() - started, 3),
+                    rows=sum(o["rows"] for o in outputs.values()))
+        self._save()
+        # Se devuelve lo leído del Parquet: un reintento ve exactamente los mismos
+        # datos (y por lo tanto los mismos números de bloque) que este intento
+        return self.load(stage)
+
+    def upload(self, stage, fn):
+        """
+        Ejecuta `fn(skip_chunks, on_chunk)` -> reporte de upsert_in_chunks.
+        Los bloques confirmados sin errores se registran uno a uno, así un
+        reintento solo envía los que faltan.
+        """
+        if self.is_done(stage):
+            print(f"⏭️ Etapa '{stage}' ya subida en esta corrida.")
+            return None
+
+        info = self._begin(stage)
+        acked = set(info.get("acked_chunks", []))
+        if acked:
+            print(f"♻️ '{stage}': {len(acked)} bloques ya confirmados, se omiten.")
+        started = time.perf_counter()
+
+        def on_chunk(result):
+            if not result["rows_failed"]:
+                acked.add(result["chunk"])
+                info["acked_chunks"] = sorted(acked)
+                self._save()
+
+        try:
+            report = fn(frozenset(acked), on_chunk)
+        except BaseException as e:  # también Ctrl+C / cancelación del runner
+            self._fail(info, started, e)
+            raise
+
+        report = report or {"rows": 0, "rows_ok": 0, "failed": []}
+        info.update(
+            # Con filas rechazadas la etapa queda parcial: el próximo intento reenvía solo esos bloques
+            status="done" if not report["failed"] else "partial",
+            seconds=round(time.perf_counter() - started, 3),
+            rows=report["rows"], rows_ok=report["rows_ok"], rows_failed=len(report["failed"]),
+        )
+        self._save()
+        return report
+
+    def discard(self):
+        """Descarta la corrida actual (p.ej. no había nada que procesar)"""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def complete(self):
+        """Cierra la corrida: conserva el manifest y libera los Parquet"""
+        pending = [s for s in STAGES if self.manifest["stages"].get(s, {}).get("status") != "done"]
+        if pending:
+            print(f"⚠️ Etapas pendientes: {', '.join(pending)}. El checkpoint se conserva para reintentar.")
+            return False
+        self.manifest["finished_at"] = datetime.now().isoformat()
+        self._save()
+        shutil.copy(self.manifest_path, os.path.join(self.root, "last_manifest.json"))
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        return True
+
+    def print_summary(self):
+        print(f"⏱️ Corrida {self.manifest['run_id']}:")
+        for stage in STAGES:
+            info = self.manifest["stages"].get(stage)
+            if info:
+                print(f"   • {stage:<14} {info['status']:<8} {info.get('seconds', 0):8.2f}s "
+                      f"{info.get('rows', 0):>9} filas (intentos: {info.get('attempts', 0)})")
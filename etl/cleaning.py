@@ -1,6 +1,9 @@
 import re
 import pandas as pd
 
+from salary import parse_salaries
+from quality import add_quality_flags
+
 # ----------------------------------------------
 # 1. FUNCIONES DE APOYO (MANTENER)
 # ----------------------------------------------
@@ -27,18 +30,29 @@ COUNTRY_MAP = {
     "latam": "Latam/Remote", "remote": "Latam/Remote", "remoto": "Latam/Remote"
 }
 
+# Prefijos de URL por país (se evalúan en orden, antes que COUNTRY_MAP)
+URL_COUNTRY_PREFIXES = [
+    (("ar.computrabajo", "ar.linkedin"), "Argentina"),
+    (("mx.computrabajo", "mx.linkedin"), "Mexico"),
+    (("co.computrabajo", "co.linkedin"), "Colombia"),
+    (("pe.computrabajo", "pe.linkedin"), "Peru"),
+    (("cl.computrabajo", "cl.linkedin"), "Chile"),
+    (("ec.computrabajo", "uy.linkedin"), "Ecuador"),
+]
+
+# Subcadenas del título que definen el seniority
+SENIOR_KEYWORDS = ['sr', 'senior', 'lead', 'experto', 'lider']
+JUNIOR_KEYWORDS = ['jr', 'junior', 'practicante', 'egresado', 'intern']
+
 def normalize_location(row):
     url = str(row.get('source_url', '')).lower()
     loc = str(row.get('location', '')).lower()
     desc = str(row.get('description', '')).lower()
 
     # PRIORIDAD 1: Prefijos de URL (Efectivo para Computrabajo y LinkedIn)
-    if 'ar.computrabajo' in url or 'ar.linkedin' in url: return 'Argentina'
-    if 'mx.computrabajo' in url or 'mx.linkedin' in url: return 'Mexico'
-    if 'co.computrabajo' in url or 'co.linkedin' in url: return 'Colombia'
-    if 'pe.computrabajo' in url or 'pe.linkedin' in url: return 'Peru'
-    if 'cl.computrabajo' in url or 'cl.linkedin' in url: return 'Chile'
-    if 'ec.computrabajo' in url or 'uy.linkedin' in url: return 'Ecuador'
+    for prefixes, country in URL_COUNTRY_PREFIXES:
+        if any(prefix in url for prefix in prefixes):
+            return country
 
     # PRIORIDAD 2: Buscar en el campo Location (Si el spider capturó algo)
     #if loc and loc != 'none' and loc != '':
@@ -79,8 +93,8 @@ def clean_job_data(df):
     # B. Normalizar Seniority desde el Título
     def get_seniority(title):
         title = title.lower()
-        if any(x in title for x in ['sr', 'senior', 'lead', 'experto', 'lider']): return 'Senior'
-        if any(x in title for x in ['jr', 'junior', 'practicante', 'egresado', 'intern']): return 'Junior'
+        if any(x in title for x in SENIOR_KEYWORDS): return 'Senior'
+        if any(x in title for x in JUNIOR_KEYWORDS): return 'Junior'
         return 'Mid'
 
     df['seniority_level'] = df['title'].apply(get_seniority)
@@ -97,6 +111,13 @@ def clean_job_data(df):
     # Inferencia de país basada en la ubicación
     df["country"] = df.apply(normalize_location, axis=1)
 
+    # Salarios numéricos (la moneda de "$" depende del país inferido)
+    if "salary_range" in df.columns:
+        df = parse_salaries(df)
+
+    # Flags de completitud y score de calidad por fila
+    df = add_quality_flags(df)
+
     # E. Deduplicación y limpieza final
     df = df.drop_duplicates(subset=["job_id"], keep="last")
     df = df[df["title"].notna() & (df["title"] != "")]
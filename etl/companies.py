@@ -0,0 +1,238 @@
+# etl/companies.py
+"""
+Resolución de empresas: agrupa las variantes de un mismo nombre bajo un
+`company_id` estable.
+
+1. Normalización: sin "Acerca de", acentos, signos ni sufijos legales
+   (S.A., SAC, S.A. de C.V., Ltda., Inc., ...). "Co", "SA" y "SpA" también
+   son palabras de nombres reales ("Banco Sa", "Spa Zen"): solo se quitan
+   al final y detrás de coma o punto ("Acme, Co.", "Acme. SA"). Los placeholders de los
+   spiders ("Jobs", "Empresa no especificada", "Confidencial") quedan sin
+   empresa. Dos nombres con la misma llave normalizada son la misma empresa.
+2. Llaves nuevas: se buscan candidatos solo dentro de sus bloques
+   (prefijo, código fonético y tokens ordenados), nunca todos contra todos,
+   y se unen a la empresa existente si la similitud de trigramas supera
+   THRESHOLD. Si no, la llave abre una empresa nueva. Los bloques se
+   recorren del más chico al más grande y de uno con más de MAX_BLOCK
+   empresas se comparan las de largo más parecido.
+
+El mapeo vive en Supabase (`companies`, `company_aliases`) y se actualiza de
+forma incremental: cada corrida solo resuelve las llaves que aún no tienen
+alias y los sube por bloques con el escritor masivo (etl/bulk_writer.py).
+`company_id` es la llave normalizada de la variante más frecuente y el nombre
+para mostrar, su grafía más frecuente.
+"""
+import re
+import time
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+
+from bulk_writer import upsert_in_chunks, CHUNK_SIZE
+
+THRESHOLD = 0.8                 # Jaccard de trigramas mínimo para unir variantes
+MAX_BLOCK = 200                 # candidatos comparados por bloque
+PAGE_SIZE = 1000
+
+PLACEHOLDERS = {
+    "jobs", "empresa", "ver empresa", "empresa no especificada", "empresa confidencial",
+    "confidencial", "importante empresa", "reconocida empresa", "n a", "na", "none",
+}
+
+# Sufijos legales frecuentes en LatAm y en inglés (ya normalizados, en minúsculas)
+LEGAL_SUFFIXES = [
+    "s a de c v", "sa de cv", "s de r l de c v", "s de rl de cv", "s de r l", "s a b de c v",
+    "s a c", "sac", "s a a", "saa", "s a s", "sas", "s r l", "srl", "s p a",
+    "e i r l", "eirl", "s l", "sl", "s a", "ltda", "limitada", "cia ltda",
+    "inc", "llc", "ltd", "limited", "corp", "corporation", "gmbh", "plc",
+]
+# Sufijos que también son palabras: solo detrás de coma o punto
+AMBIGUOUS_SUFFIXES = ["co", "sa", "spa"]
+
+
+def _suffix_pattern(suffix):
+    # "s a de c v" también calza con "s.a. de c.v." (los puntos separan letras)
+    return r"[\s.]+".join(re.escape(token) for token in suffix.split())
+
+
+_SUFFIX_RE = re.compile(
+    r"(?:[\s,.]+(?:" + "|".join(_suffix_pattern(s) for s in LEGAL_SUFFIXES) + r")\b"
+    r"|\s*[,.]\s*(?:" + "|".join(AMBIGUOUS_SUFFIXES) + r")\b)+[\s.]*$"
+)
+_ABOUT_RE = re.compile(r"^\s*acerca de\s+", re.IGNORECASE)
+
+
+# ---------------------------------------------------
+# 🔤 NORMALIZACIÓN Y LLAVES DE BLOQUEO
+# ---------------------------------------------------
+def normalize_company(name):
+    """Llave normalizada de la empresa, o None si es un placeholder"""
+    if name is None or (isinstance(name, float) and name != name):
+        return None
+    text = _ABOUT_RE.sub("", str(name))
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower().strip()
+    # Los sufijos se quitan antes de borrar la puntuación (la coma o el punto cuentan)
+    stripped = _SUFFIX_RE.sub("", f" {text}")
+    text, key = (re.sub(r"[^a-z0-9&]+", " ", t).strip() for t in (text, stripped))
+    if text in PLACEHOLDERS:
+        return None
+    key = key or text
+    return None if key in PLACEHOLDERS or len(key) < 2 else key
+
+
+def phonetic(text):
+    """Código fonético simple para español (c/k/q, s/z, b/v, ll/y, h muda)"""
+    text = text.replace(" ", "")
+    for a, b in (("ph", "f"), ("qu", "k"), ("ll", "y"), ("ch", "x"), ("h", ""),
+                 ("ce", "se"), ("ci", "si"), ("c", "k"), ("z", "s"), ("v", "b"), ("w", "u")):
+        text = text.replace(a, b)
+    if not text:
+        return ""
+    consonants = text[0] + re.sub(r"[aeiouy]", "", text[1:])
+    return re.sub(r"(.)\1+", r"\1", consonants)
+
+
+def blocking_keys(key):
+    compact = key.replace(" ", "")
+    return (
+        f"p:{compact[:4]}",
+        f"f:{phonetic(key)[:6]}",
+        f"t:{' '.join(sorted(key.split()))}",
+    )
+
+
+def trigrams(key):
+    compact = f"  {key.replace(' ', '')} "
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def similarity(a, b):
+    if sorted(a.split()) == sorted(b.split()):
+        return 1.0
+    ta, tb = trigrams(a), trigrams(b)
+    return len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+
+
+# ---------------------------------------------------
+# 🗂️ RESOLVEDOR INCREMENTAL
+# ---------------------------------------------------
+class CompanyResolver:
+    """Alias conocidos + índice de bloqueo sobre las empresas existentes"""
+
+    def __init__(self):
+        self.aliases = {}               # llave normalizada -> company_id
+        self._blocks = defaultdict(list)
+        self._companies = set()
+        self.new_companies = {}         # company_id -> nombre para mostrar
+        self.new_aliases = {}           # llave -> company_id
+
+    # ---------- persistencia ----------
+    @staticmethod
+    def _fetch_all(client, table, columns, key):
+        rows, offset = [], 0
+        while True:
+            page = (client.table(table).select(columns).order(key)
+                    .range(offset, offset + PAGE_SIZE - 1).execute().data)
+            rows.extend(page)
+            offset += len(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+
+    @classmethod
+    def load(cls, client):
+        resolver = cls()
+        for row in cls._fetch_all(client, "companies", "company_id", "company_id"):
+            resolver._add_company(row["company_id"])
+        for row in cls._fetch_all(client, "company_aliases", "alias_key, company_id", "alias_key"):
+            resolver.aliases[row["alias_key"]] = row["company_id"]
+        return resolver
+
+    def flush(self, client):
+        """Sube empresas y alias nuevos por bloques (idempotente); las empresas van primero"""
+        uploads = [
+            ("companies", "company_id",
+             [{"company_id": cid, "company_name": name} for cid, name in self.new_companies.items()]),
+            ("company_aliases", "alias_key",
+             [{"alias_key": key, "company_id": cid} for key, cid in self.new_aliases.items()]),
+        ]
+        for table, key, records in uploads:
+            if not records:
+                continue
+            chunks = (records[i:i + CHUNK_SIZE] for i in range(0, len(records), CHUNK_SIZE))
+            report = upsert_in_chunks(client, table, chunks, on_conflict=key, key=key,
+                                      ignore_duplicates=True, verbose=False)
+            if report["failed"]:
+                raise RuntimeError(f"{len(report['failed'])} filas de '{table}' no se pudieron subir "
+                                   f"(p. ej. {report['failed'][0]['key']}: {report['failed'][0]['error']})")
+        written = (len(self.new_companies), len(self.new_aliases))
+        self.new_companies, self.new_aliases = {}, {}
+        return written
+
+    # ---------- resolución ----------
+    def _add_company(self, company_id):
+        self._companies.add(company_id)
+        for block in blocking_keys(company_id):
+            self._blocks[block].append(company_id)
+
+    def _match(self, key):
+        best, best_score = None, THRESHOLD
+        seen = set()
+        # El bloque más selectivo primero. Si uno pasa el tope, no se corta por
+        # orden de llegada: el Jaccard de trigramas no puede superar el cociente
+        # de los largos, así que se comparan los de largo más parecido
+        blocks = sorted((self._blocks.get(block, []) for block in blocking_keys(key)), key=len)
+        for block in blocks:
+            if len(block) > MAX_BLOCK:
+                block = heapq.nsmallest(MAX_BLOCK, block, key=lambda c: abs(len(c) - len(key)))
+            for candidate in block:
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(key, candidate)
+                if score >= best_score:
+                    best, best_score = candidate, score
+        return best
+
+    def resolve(self, names):
+        """company_id para cada nombre crudo (None si es placeholder)"""
+        keys = {name: normalize_company(name) for name in set(names)}
+        counts = Counter(keys[n] for n in names if keys[n])
+        # Nombre para mostrar: la grafía más frecuente de cada llave (empate: la primera vista)
+        spellings = defaultdict(Counter)
+        for name in names:
+            if keys[name]:
+                spellings[keys[name]][_ABOUT_RE.sub("", str(name)).strip()] += 1
+        display = {key: spelling.most_common(1)[0][0] for key, spelling in spellings.items()}
+
+        # Las variantes más frecuentes primero: quedan como nombre canónico
+        for key, _ in counts.most_common():
+            if key in self.aliases:
+                continue
+            company_id = key if key in self._companies else self._match(key)
+            if company_id is None:
+                company_id = key
+                self._add_company(company_id)
+                self.new_companies[company_id] = display[key]
+            self.aliases[key] = company_id
+            self.new_aliases[key] = company_id
+
+        return [self.aliases.get(keys[name]) for name in names]
+
+
+# ---------------------------------------------------
+# 🚀 ETAPA DEL ETL
+# ---------------------------------------------------
+def assign_companies(df, client, resolver=None, verbose=True):
+    """Agrega la columna `company_id` al DataFrame limpio y persiste el mapeo"""
+    if df.empty:
+        return df
+    started = time.perf_counter()
+    resolver = resolver if resolver is not None else CompanyResolver.load(client)
+    df["company_id"] = resolver.resolve(df["company_name"].tolist())
+    new_companies, new_aliases = resolver.flush(client)
+    if verbose:
+        print(
+            f"🏢 Empresas: {df['company_name'].nunique()} nombres → {df['company_id'].nunique()} empresas "
+            f"({new_companies} nuevas, {new_aliases} alias nuevos) en {time.perf_counter() - started:.2f}s"
+        )
+    return df
@@ -0,0 +1,282 @@
+# etl/dedupe.py
+"""
+Detección de vacantes casi duplicadas entre plataformas (MinHash + LSH).
+
+1. Cada vacante se convierte en shingles de 3 palabras (título + descripción).
+2. Se calcula una firma MinHash de NUM_PERM valores con numpy.
+3. La firma se divide en BANDS bandas; dos vacantes son candidatas si
+   coinciden en alguna banda (índice LSH: arreglos ordenados por banda,
+   búsqueda por ordenamiento, nunca todos-contra-todos).
+4. Los candidatos con Jaccard estimado >= THRESHOLD se unen (union-find) y
+   cada vacante recibe el `cluster_id` del primer miembro indexado del grupo
+   (orden de llegada al índice, no fecha de publicación).
+
+El índice se actualiza de forma incremental: solo se calculan firmas para
+job_id que no estaban indexados. Como el runner de GitHub es efímero, además
+del archivo local se guarda en el bucket de Storage DEDUPE_BUCKET (por
+defecto ARCHIVE_BUCKET) y se baja al empezar cada corrida. Los job_id que ya
+no están en la tabla (purgados por retención) se quitan con `prune()`.
+"""
+import os
+import re
+import zlib
+import time
+import unicodedata
+
+import numpy as np
+
+INDEX_PATH = os.environ.get(
+    "DEDUPE_INDEX",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "dedupe_index.npz"),
+)
+DEDUPE_BUCKET = os.environ.get("DEDUPE_BUCKET") or os.environ.get("ARCHIVE_BUCKET")
+REMOTE_PATH = "dedupe/dedupe_index.npz"
+HASH_VERSION = 2                # cambia si cambia la familia de hashes (invalida firmas viejas)
+NUM_PERM = 128
+BANDS = 16                      # 16 bandas x 8 filas -> umbral LSH ~0.7
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.8                 # Jaccard estimado mínimo para considerar duplicado
+SHINGLE_SIZE = 3
+MAX_BUCKET_PAIRS = 50           # evita explosión de pares en buckets gigantes
+MISSING_DESCRIPTION = "Descripción no disponible."
+
+# h(x) = (a*x + b) mod p con p primo (2^31 - 1) y a != 0: permutación de Z_p.
+# a, b y x < 2^31, así a*x + b cabe en uint64 sin desbordar.
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_BAND_MULT = _rng.integers(1, 2 ** 61, ROWS, dtype=np.uint64)
+
+
+# ---------------------------------------------------
+# ✂️ SHINGLES Y FIRMAS
+# ---------------------------------------------------
+def normalize_text(text):
+    """Minúsculas, sin acentos ni signos, espacios simples"""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def document_text(row):
+    """Texto a comparar; sin descripción se usa título + empresa + ubicación"""
+    description = row.get("description")
+    if description and description != MISSING_DESCRIPTION:
+        return f"{row.get('title') or ''} {description}"
+    return f"{row.get('title') or ''} {row.get('company_name') or ''} {row.get('location') or ''}"
+
+
+def shingles(text):
+    """Hashes estables (crc32) de los n-gramas de palabras"""
+    tokens = normalize_text(text).split()
+    if len(tokens) < SHINGLE_SIZE:
+        grams = [" ".join(tokens)] if tokens else [""]
+    else:
+        grams = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64)
+
+
+def minhash(shingle_hashes):
+    """Firma MinHash (NUM_PERM x uint32) para un conjunto de shingles"""
+    x = shingle_hashes % _PRIME
+    values = (_PERM_A[:, None] * x[None, :] + _PERM_B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signatures):
+    """Una llave uint64 por (vacante, banda)"""
+    sig = signatures.astype(np.uint64).reshape(len(signatures), BANDS, ROWS)
+    return (sig * _BAND_MULT).sum(axis=2)
+
+
+# ---------------------------------------------------
+# 🗂️ ÍNDICE LSH INCREMENTAL
+# ---------------------------------------------------
+class MinHashIndex:
+    """Firmas + union-find persistentes; las bandas se reconstruyen al cargar"""
+
+    def __init__(self):
+        self.job_ids = np.array([], dtype=object)
+        self.signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        self.parent = np.empty(0, dtype=np.int64)
+        self._position = {}
+        self._bands = [(np.empty(0, np.uint64), np.empty(0, np.int64)) for _ in range(BANDS)]
+
+    # ---------- persistencia ----------
+    @classmethod
+    def load(cls, path=INDEX_PATH, client=None, bucket=DEDUPE_BUCKET):
+        """Con `client` y `bucket` primero baja la copia remota sobre `path`"""
+        if client is not None and bucket:
+            try:
+                data = client.storage.from_(bucket).download(REMOTE_PATH)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(f"{path}.tmp.npz", "wb") as f:
+                    f.write(data)
+                os.replace(f"{path}.tmp.npz", path)
+            except Exception as e:
+                print(f"⚠️ Índice de casi-duplicados no disponible en '{bucket}' ({e}); se usa el local.")
+        elif client is not None:
+            print("⚠️ Sin DEDUPE_BUCKET/ARCHIVE_BUCKET: el índice de casi-duplicados solo queda en disco local.")
+
+        index = cls()
+        if os.path.exists(path):
+            data = np.load(path, allow_pickle=True)
+            if "version" not in data or int(data["version"]) != HASH_VERSION:
+                print("⚠️ Índice de casi-duplicados con otra familia de hashes: se reconstruye.")
+                return index
+            index.job_ids = data["job_ids"]
+            index.signatures = data["signatures"]
+            index.parent = data["parent"]
+            index._position = {job_id: i for i, job_id in enumerate(index.job_ids)}
+            index._index_bands(np.arange(len(index.job_ids)))
+        return index
+
+    def save(self, path=INDEX_PATH, client=None, bucket=DEDUPE_BUCKET):
+        """Guarda en `path` y, con `client` y `bucket`, sube la copia a Storage"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(tmp, job_ids=self.job_ids, signatures=self.signatures, parent=self.parent,
+                            version=np.array(HASH_VERSION))
+        os.replace(tmp, path)
+        if client is not None and bucket:
+            with open(path, "rb") as f:
+                data = f.read()
+            try:
+                client.storage.from_(bucket).upload(
+                    REMOTE_PATH, data, {"content-type": "application/octet-stream", "upsert": "true"})
+            except Exception as e:
+                print(f"⚠️ No se pudo subir el índice de casi-duplicados a '{bucket}': {e}")
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    # ---------- union-find ----------
+    def _find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            # El primero en entrar al índice queda como raíz: cluster_id estable
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    # ---------- bandas ----------
+    def _index_bands(self, positions):
+        keys = band_keys(self.signatures[positions])
+        for b in range(BANDS):
+            old_keys, old_pos = self._bands[b]
+            # Se ordena solo el lote nuevo y se intercala (O(n) por lote, no O(n log n))
+            order = np.argsort(keys[:, b], kind="stable")
+            new_keys, new_pos = keys[order, b], positions[order]
+            at = np.searchsorted(old_keys, new_keys, side="right")
+            self._bands[b] = (np.insert(old_keys, at, new_keys), np.insert(old_pos, at, new_pos))
+
+    def _candidates(self, positions, keys):
+        """Pares (nuevo, existente) que comparten alguna banda"""
+        pairs = []
+        for b in range(BANDS):
+            sorted_keys, sorted_pos = self._bands[b]
+            left = np.searchsorted(sorted_keys, keys[:, b], side="left")
+            right = np.searchsorted(sorted_keys, keys[:, b], side="right")
+            for new, lo, hi in zip(positions, left, right):
+                if hi > lo:
+                    members = sorted_pos[lo:min(hi, lo + MAX_BUCKET_PAIRS)]
+                    pairs.extend((new, m) for m in members if m != new)
+        return pairs
+
+    # ---------- API ----------
+    def add(self, job_ids, texts):
+        """Indexa vacantes nuevas (las ya indexadas se ignoran); devuelve métricas"""
+        started = time.perf_counter()
+        new = [(j, t) for j, t in zip(job_ids, texts) if j not in self._position]
+        if not new:
+            return {"new": 0, "pairs": 0, "merged": 0, "seconds": 0.0}
+
+        first = len(self.job_ids)
+        positions = np.arange(first, first + len(new))
+        signatures = np.vstack([minhash(shingles(t)) for _, t in new])
+
+        self.job_ids = np.concatenate([self.job_ids, np.array([j for j, _ in new], dtype=object)])
+        self.signatures = np.vstack([self.signatures, signatures])
+        self.parent = np.concatenate([self.parent, positions])
+        for offset, (job_id, _) in enumerate(new):
+            self._position[job_id] = first + offset
+
+        # Los nuevos se indexan primero para detectar duplicados dentro del mismo lote
+        keys = band_keys(signatures)
+        self._index_bands(positions)
+        pairs = np.array(sorted(set(self._candidates(positions, keys))), dtype=np.int64).reshape(-1, 2)
+
+        merged = 0
+        if len(pairs):
+            similarity = (self.signatures[pairs[:, 0]] == self.signatures[pairs[:, 1]]).mean(axis=1)
+            for a, b in pairs[similarity >= THRESHOLD]:
+                if self._find(a) != self._find(b):
+                    self._union(a, b)
+                    merged += 1
+
+        return {"new": len(new), "pairs": len(pairs), "merged": merged,
+                "seconds": round(time.perf_counter() - started, 3)}
+
+    def prune(self, keep):
+        """
+        Quita los job_id que no están en `keep` (cualquier contenedor con `in`,
+        p. ej. los ids que siguen en la tabla). Si se quita la raíz de un grupo,
+        la hereda el siguiente miembro indexado. Devuelve cuántos se quitaron.
+        """
+        mask = np.fromiter((j in keep for j in self.job_ids), dtype=bool, count=len(self.job_ids))
+        removed = int((~mask).sum())
+        if not removed:
+            return 0
+        roots = np.array([self._find(i) for i in range(len(self.job_ids))], dtype=np.int64)
+        kept = np.flatnonzero(mask)
+        kept_roots = roots[kept]
+        # `kept` está en orden de llegada: la primera aparición de cada raíz es su nuevo representante
+        unique_roots, first = np.unique(kept_roots, return_index=True)
+        self.parent = first[np.searchsorted(unique_roots, kept_roots)].astype(np.int64)
+        self.job_ids = self.job_ids[kept]
+        self.signatures = self.signatures[kept]
+        self._position = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self._bands = [(np.empty(0, np.uint64), np.empty(0, np.int64)) for _ in range(BANDS)]
+        self._index_bands(np.arange(len(self.job_ids)))
+        return removed
+
+    def cluster_ids(self, job_ids):
+        """cluster_id (job_id canónico) para cada job_id indexado"""
+        return [self.job_ids[self._find(self._position[j])] if j in self._position else None
+                for j in job_ids]
+
+
+# ---------------------------------------------------
+# 🚀 ETAPA DEL ETL
+# ---------------------------------------------------
+def assign_clusters(df, index=None, path=INDEX_PATH, save=True, verbose=True,
+                    client=None, keep=None):
+    """
+    Agrega la columna `cluster_id` al DataFrame limpio usando el índice persistente.
+    Con `client` el índice se baja y se sube a Storage; con `keep` (job_id que
+    siguen en la tabla) se quitan del índice los purgados.
+    """
+    if df.empty:
+        return df
+    index = index if index is not None else MinHashIndex.load(path, client=client)
+    texts = [document_text(row) for row in df.to_dict(orient="records")]
+    stats = index.add(df["job_id"].tolist(), texts)
+    removed = index.prune(keep) if keep is not None else 0
+    df["cluster_id"] = index.cluster_ids(df["job_id"].tolist())
+    if save:
+        index.save(path, client=client)
+    if not verbose:
+        return df
+    duplicates = len(df) - df["cluster_id"].nunique()
+    print(
+        f"🧬 Dedupe: {stats['new']} nuevas indexadas ({len(index)} total, {removed} purgadas quitadas), "
+        f"{stats['pairs']} candidatos, {stats['merged']} uniones, {duplicates} casi-duplicados "
+        f"en {stats['seconds']:.2f}s"
+    )
+    return df
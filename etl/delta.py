@@ -0,0 +1,86 @@
+# etl/delta.py
+"""
+Escritura por diferencias: compara el DataFrame limpio con el crudo columna
+por columna y sube solo `job_id` + las columnas que realmente cambiaron.
+
+Las filas se agrupan por la "forma" del cambio (conjunto de columnas
+modificadas) para que cada bloque enviado tenga siempre las mismas llaves;
+PostgREST necesita payloads homogéneos para no rellenar columnas con NULL.
+"""
+import numpy as np
+import pandas as pd
+
+from bulk_writer import iter_record_chunks, CHUNK_SIZE
+
+# Columnas NOT NULL en `jobs`: Postgres valida la fila propuesta antes del ON CONFLICT
+REQUIRED_COLUMNS = ["title"]
+
+
+def new_delta_stats():
+    return {"rows_total": 0, "rows_changed": 0, "rows_skipped": 0, "cells_sent": 0, "shapes": {}}
+
+
+def _comparable(series):
+    """Listas/arrays (columnas TEXT[]; del snapshot llegan como ndarray) -> tuplas"""
+    if series.dtype == object and series.map(lambda v: isinstance(v, (list, np.ndarray))).any():
+        return series.map(lambda v: tuple(v) if isinstance(v, (list, np.ndarray)) else v)
+    return series
+
+
+def changed_mask(df_raw, df_clean, key="job_id"):
+    """DataFrame booleano (filas de df_clean x columnas) con True donde cambió el valor"""
+    raw = df_raw.drop_duplicates(subset=[key], keep="last").set_index(key)
+    clean = df_clean.set_index(key)
+    raw = raw.reindex(clean.index)
+
+    mask = {}
+    for col in clean.columns:
+        new = _comparable(clean[col])
+        if col not in raw.columns:
+            mask[col] = new.notna().to_numpy()
+            continue
+        old = _comparable(raw[col])
+        same = (old == new) | (old.isna() & new.isna())
+        mask[col] = ~same.to_numpy(dtype=bool)
+    return pd.DataFrame(mask, index=clean.index)
+
+
+def iter_delta_chunks(df_raw, df_clean, stats, key="job_id", chunk_size=CHUNK_SIZE):
+    """Genera bloques homogéneos con solo las columnas modificadas por fila"""
+    if df_clean.empty:
+        return
+    mask = changed_mask(df_raw, df_clean, key)
+    columns = list(mask.columns)
+
+    # Una llave binaria por fila que identifica la forma del cambio
+    packed = np.packbits(mask.to_numpy(), axis=1)
+    shape_keys = pd.Series([row.tobytes() for row in packed])
+    stats["rows_total"] += len(df_clean)
+
+    clean = df_clean.reset_index(drop=True)
+    for _, positions in shape_keys.groupby(shape_keys).groups.items():
+        flags = mask.iloc[positions[0]].to_numpy()
+        changed = [c for c, flag in zip(columns, flags) if flag]
+        if not changed:
+            stats["rows_skipped"] += len(positions)
+            continue
+
+        payload_cols = [key] + [c for c in REQUIRED_COLUMNS if c not in changed] + changed
+        part = clean.loc[positions, payload_cols]
+        label = "+".join(changed)
+        stats["shapes"][label] = stats["shapes"].get(label, 0) + len(part)
+        stats["rows_changed"] += len(part)
+        stats["cells_sent"] += len(part) * len(payload_cols)
+        yield from iter_record_chunks(part, chunk_size)
+
+
+def print_delta_stats(stats, report=None):
+    """Resumen de la escritura por diferencias"""
+    print(
+        f"🔎 Delta: {stats['rows_changed']} filas modificadas, "
+        f"{stats['rows_skipped']} sin cambios omitidas (de {stats['rows_total']}), "
+        f"{stats['cells_sent']} celdas enviadas"
+        + (f", {report['bytes'] / 1024:.1f} KB" if report else "")
+    )
+    for label, count in sorted(stats["shapes"].items(), key=lambda kv: -kv[1]):
+        print(f"   • {label}: {count} filas")
@@ -0,0 +1,201 @@
+# etl/duck_engine.py
+"""
+Motor analítico local (opcional) sobre DuckDB.
+
+Ejecuta la misma limpieza que `cleaning.clean_job_data` como SQL vectorizado
+y multihilo (split título/empresa, seniority, limpieza de textos, país por
+URL + COUNTRY_MAP como un CASE, dedupe por job_id) y corre los agregados de
+`database/queries.py` sobre el resultado. El parser de salarios ya es
+vectorizado y se reutiliza tal cual sobre el DataFrame devuelto.
+
+Uso:
+    python etl/update_data.py --engine duckdb [--source snapshot]
+"""
+import os
+import time
+import runpy
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # dependencia opcional
+    duckdb = None
+
+from cleaning import COUNTRY_MAP, URL_COUNTRY_PREFIXES, SENIOR_KEYWORDS, JUNIOR_KEYWORDS
+from salary import parse_salaries
+from quality import add_quality_flags
+
+THREADS = int(os.environ.get("DUCKDB_THREADS", os.cpu_count() or 1))
+QUERIES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "queries.py"
+)
+TEXT_COLUMNS = ["title", "company_name", "location", "description", "source_url"]
+
+# Borde de palabra Unicode (\b de RE2 solo entiende ASCII: fallaría con "perú")
+_WORD = r"[\p{L}\p{N}_]"
+
+
+# ---------------------------------------------------
+# 🧩 SQL GENERADO DESDE LAS REGLAS DE cleaning.py
+# ---------------------------------------------------
+def _quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _country_case():
+    """CASE equivalente a normalize_location (mismo orden de prioridad)"""
+    whens = []
+    for prefixes, country in URL_COUNTRY_PREFIXES:
+        cond = " OR ".join(f"contains(_url, {_quote(p)})" for p in prefixes)
+        whens.append(f"WHEN {cond} THEN {_quote(country)}")
+    for keyword, country in COUNTRY_MAP.items():
+        pattern = f"(^|[^{_WORD[1:-1]}]){keyword}([^{_WORD[1:-1]}]|$)"
+        whens.append(f"WHEN regexp_matches(_text, {_quote(pattern)}) THEN {_quote(country)}")
+    return "CASE " + " ".join(whens) + " ELSE 'Latam/Remote' END"
+
+
+def _seniority_case():
+    senior = " OR ".join(f"contains(_title_lower, {_quote(k)})" for k in SENIOR_KEYWORDS)
+    junior = " OR ".join(f"contains(_title_lower, {_quote(k)})" for k in JUNIOR_KEYWORDS)
+    return f"CASE WHEN {senior} THEN 'Senior' WHEN {junior} THEN 'Junior' ELSE 'Mid' END"
+
+
+CLEAN_TEXT_MACRO = r"""
+CREATE OR REPLACE MACRO clean_text(t) AS
+    CASE WHEN t IS NULL OR t = '' THEN NULL
+         ELSE trim(replace(regexp_replace(t, '[\s\p{Z}]+', ' ', 'g'), chr(8203), ''))
+    END;
+"""
+
+
+def clean_sql(source="jobs_raw"):
+    casts = ", ".join(f"CAST({c} AS VARCHAR) AS {c}" for c in TEXT_COLUMNS)
+    return f"""
+CREATE OR REPLACE TABLE jobs_clean AS
+WITH base AS (
+    SELECT * REPLACE ({casts}), row_number() OVER () AS _ord
+    FROM {source}
+),
+split AS (
+    -- A. "Cargo in Empresa" (GetonBoard)
+    SELECT * REPLACE (
+        CASE WHEN contains(title, ' in ') THEN trim(split_part(title, ' in ', 1)) ELSE title END AS title,
+        CASE WHEN contains(title, ' in ') THEN trim(split_part(title, ' in ', 2)) ELSE company_name END AS company_name
+    )
+    FROM base
+),
+texts AS (
+    -- B. Seniority desde el título / C-D. Limpieza de textos
+    SELECT * REPLACE (
+        clean_text(trim(regexp_replace(title, '[^\p{{L}}\p{{N}}_\s\-]', '', 'g'))) AS title,
+        clean_text(company_name) AS company_name,
+        clean_text(location) AS location,
+        clean_text(description) AS description
+    ),
+    lower(title) AS _title_lower
+    FROM split
+),
+resolved AS (
+    SELECT *,
+        lower(coalesce(source_url, 'none')) AS _url,
+        lower(coalesce(location, 'none') || ' ' || coalesce(description, 'none')) AS _text
+    FROM texts
+),
+final AS (
+    SELECT * EXCLUDE (_title_lower, _url, _text) REPLACE (
+        {_seniority_case()} AS seniority_level,
+        {_country_case()} AS country
+    )
+    FROM resolved
+    -- E. Dedupe (se conserva la última aparición de cada job_id)
+    QUALIFY row_number() OVER (PARTITION BY job_id ORDER BY _ord DESC) = 1
+)
+SELECT * FROM final
+WHERE title IS NOT NULL AND title <> ''
+ORDER BY _ord;
+"""
+
+
+# ---------------------------------------------------
+# 🦆 CONEXIÓN Y CARGA
+# ---------------------------------------------------
+def connect(threads=THREADS):
+    if duckdb is None:
+        raise ImportError("❌ DuckDB no está instalado: pip install duckdb")
+    con = duckdb.connect()
+    con.execute(f"SET threads = {int(threads)}")
+    con.execute(CLEAN_TEXT_MACRO)
+    return con
+
+
+def load_tables(con, df_jobs=None, df_skills=None, snapshot_root=None):
+    """Registra los DataFrames (sin copiar) o apunta a los Parquet del snapshot"""
+    if snapshot_root:
+        for table in ("jobs", "skills"):
+            files = os.path.join(snapshot_root, table, "**", "*.parquet").replace("'", "''")
+            con.execute(
+                f"CREATE OR REPLACE VIEW {table}_raw AS "
+                f"SELECT * FROM read_parquet('{files}', hive_partitioning = false, union_by_name = true)"
+            )
+        return
+    con.register("jobs_raw", df_jobs)
+    con.register("skills_raw", df_skills if df_skills is not None else pd.DataFrame(columns=["job_id", "skill_name"]))
+
+
+# ---------------------------------------------------
+# 🧹 LIMPIEZA
+# ---------------------------------------------------
+def clean_jobs(con):
+    """Corre la limpieza en SQL y devuelve el DataFrame listo para subir"""
+    con.execute(clean_sql())
+    df = con.execute("SELECT * EXCLUDE (_ord) FROM jobs_clean").df()
+    if "salary_range" in df.columns:
+        df = parse_salaries(df)
+    df = add_quality_flags(df)
+    # Los agregados ven también las columnas de salario
+    con.register("jobs_final", df)
+    return df
+
+
+# ---------------------------------------------------
+# 📊 AGREGADOS DE database/queries.py
+# ---------------------------------------------------
+def load_queries(path=QUERIES_PATH):
+    """Constantes GET_* del módulo de consultas (sin importar el paquete database)"""
+    namespace = runpy.run_path(path)
+    return {name: sql for name, sql in namespace.items() if name.startswith("GET_")}
+
+
+def run_aggregates(con, queries=None):
+    """Ejecuta las consultas sobre jobs_final/skills_raw; omite las que no aplican"""
+    con.execute("CREATE OR REPLACE VIEW jobs AS SELECT * FROM jobs_final")
+    con.execute("CREATE OR REPLACE VIEW skills AS SELECT * FROM skills_raw")
+    results = {}
+    for name, sql in (queries or load_queries()).items():
+        try:
+            results[name] = con.execute(sql).df()
+        except duckdb.Error as e:
+            # p.ej. trend_daily no existe localmente o falta una columna
+            print(f"   ⏭️ {name} omitida: {str(e).splitlines()[0]}")
+    return results
+
+
+# ---------------------------------------------------
+# 🚀 API PRINCIPAL
+# ---------------------------------------------------
+def run_duckdb_etl(df_jobs=None, df_skills=None, snapshot_root=None, threads=THREADS, aggregates=True):
+    """Limpieza + agregados en DuckDB; devuelve (df_jobs_clean, {consulta: DataFrame})"""
+    started = time.perf_counter()
+    con = connect(threads)
+    try:
+        load_tables(con, df_jobs, df_skills, snapshot_root)
+        df_clean = clean_jobs(con)
+        results = run_aggregates(con) if aggregates else {}
+    finally:
+        con.close()
+    print(
+        f"🦆 DuckDB ({threads} hilos): {len(df_clean)} jobs limpios, "
+        f"{len(results)} agregados en {time.perf_counter() - started:.2f}s"
+    )
+    return df_clean, results
@@ -0,0 +1,33 @@
+# etl/keyword_hits.py
+"""
+Keywords técnicas presentes en cada descripción, calculadas una vez en el ETL.
+
+Se guardan en `jobs.description_keywords` (TEXT[]) y `dashboard_aggregates`
+las cuenta con un unnest sobre las vacantes filtradas, sin volver a escanear
+las descripciones en cada rerun del dashboard. Se usan la misma lista y el
+mismo escáner que la matriz de bits del modo local (dashboard/keywords.py),
+así los dos modos cuentan igual. Al cambiar TECH_KEYWORDS, la siguiente
+corrida del ETL reescribe la columna (la escritura por diferencias solo sube
+las filas cuyo resultado cambió).
+"""
+import os
+import sys
+
+import numpy as np
+
+# dashboard/ está en la raíz del repo, fuera de etl/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard.keywords import TECH_KEYWORDS, scan_texts  # noqa: E402
+
+
+def assign_keywords(df, keywords=TECH_KEYWORDS):
+    """Agrega la columna `description_keywords` (lista de keywords encontradas)"""
+    if df.empty:
+        return df
+    descriptions = df["description"]
+    if "has_description" in df.columns:
+        descriptions = descriptions.where(df["has_description"].fillna(False).astype(bool))
+    found = np.unpackbits(scan_texts(descriptions.tolist(), keywords), axis=1, count=len(keywords)).astype(bool)
+    names = np.array(keywords, dtype=object)
+    df["description_keywords"] = [names[row].tolist() for row in found]
+    return df
@@ -0,0 +1,98 @@
+# etl/lifecycle.py
+"""
+Ciclo de vida de las vacantes por "mark and sweep".
+
+Mark: cada crawl abre una fila en `crawl_runs` y el SupabasePipeline sella
+cada vacante vista con `last_seen_run` (id del crawl) y `last_seen_at`
+(ver scrapers/jobscraper/pipelines.py). `first_seen_at` lo pone la base al
+insertar.
+
+Un crawl cuenta como completo para cada plataforma de `crawl_runs.platforms`:
+el pipeline lista las que terminaron con una proporción de errores de hasta
+CRAWL_MAX_ERROR_RATIO (un crawl con algunos items fallidos sigue contando;
+`errors` guarda cuántos). Un spider puede cubrir varias plataformas.
+
+Sweep: por plataforma, las vacantes activas que no aparecen en ninguno de
+los últimos K crawls completos son la diferencia de conjuntos
+
+    activas(plataforma) - (visto(run_1) ∪ ... ∪ visto(run_K))
+
+y como los ids de crawl son crecientes se resuelve con un solo UPDATE:
+
+    UPDATE jobs SET is_active = false, expired_at = now()
+    WHERE source_platform = 'X' AND is_active
+      AND (last_seen_run IS NULL OR last_seen_run < <K-ésimo crawl más reciente>)
+
+La duración real de cada aviso queda en first_seen_at → expired_at.
+"""
+import os
+from datetime import datetime
+from collections import defaultdict
+
+from postgrest.types import ReturnMethod
+
+# Crawls completos consecutivos sin ver la vacante antes de darla de baja
+SWEEP_MISSES = int(os.environ.get("SWEEP_MISSES", 3))
+# Si un sweep desactivaría más que esta fracción de las activas de una
+# plataforma, probablemente el spider se rompió: no se toca nada
+SWEEP_MAX_FRACTION = float(os.environ.get("SWEEP_MAX_FRACTION", 0.5))
+RUNS_LOOKBACK = 200
+
+
+def recent_finished_runs(client, misses=SWEEP_MISSES):
+    """{plataforma: [run_id, ...]} con los últimos `misses` crawls completos"""
+    rows = (
+        client.table("crawl_runs").select("run_id, source_platform, platforms")
+        .eq("status", "finished")
+        .order("run_id", desc=True)
+        .limit(RUNS_LOOKBACK)
+        .execute().data
+    )
+    runs = defaultdict(list)
+    for r in rows:
+        # Crawls anteriores a la columna `platforms`: solo source_platform
+        for platform in r.get("platforms") or [r.get("source_platform")]:
+            if platform and len(runs[platform]) < misses:
+                runs[platform].append(r["run_id"])
+    return runs
+
+
+def _active_count(client, platform, cutoff_run=None):
+    query = (
+        client.table("jobs").select("job_id", count="exact", head=True)
+        .eq("source_platform", platform).eq("is_active", True)
+    )
+    if cutoff_run is not None:
+        query = query.or_(f"last_seen_run.is.null,last_seen_run.lt.{cutoff_run}")
+    return query.execute().count or 0
+
+
+def sweep_inactive_jobs(client, misses=SWEEP_MISSES, max_fraction=SWEEP_MAX_FRACTION, dry_run=False):
+    """Desactiva en bloque las vacantes no vistas en los últimos `misses` crawls"""
+    report = {}
+    now = datetime.now().isoformat()
+
+    for platform, run_ids in recent_finished_runs(client, misses).items():
+        if len(run_ids) < misses:
+            print(f"⏭️ {platform}: solo {len(run_ids)}/{misses} crawls completos, no se barre.")
+            continue
+        cutoff_run = min(run_ids)
+
+        stale = _active_count(client, platform, cutoff_run)
+        active = _active_count(client, platform)
+        if active and stale / active > max_fraction:
+            print(f"⚠️ {platform}: {stale}/{active} vacantes sin ver; supera el {max_fraction:.0%}, se omite el sweep.")
+            report[platform] = 0
+            continue
+
+        if stale and not dry_run:
+            (client.table("jobs")
+             .update({"is_active": False, "expired_at": now}, returning=ReturnMethod.minimal)
+             .eq("source_platform", platform).eq("is_active", True)
+             .or_(f"last_seen_run.is.null,last_seen_run.lt.{cutoff_run}")
+             .execute())
+        report[platform] = stale
+        print(f"🧹 {platform}: {stale} vacantes dadas de baja (no vistas en {misses} crawls, de {active} activas).")
+
+    print(f"✅ Sweep: {sum(report.values())} vacantes desactivadas{' (dry-run)' if dry_run else ''}.")
+    return report
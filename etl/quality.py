@@ -0,0 +1,37 @@
+# etl/quality.py
+"""
+Flags de completitud y score de calidad por vacante, calculados de forma
+vectorizada en el ETL y guardados como columnas en `jobs`:
+
+    has_description, has_salary, has_requirements, has_location (BOOLEAN)
+    data_quality_score (0-100, ponderado por QUALITY_WEIGHTS)
+
+El dashboard y GET_DATA_QUALITY_METRICS leen estas columnas en lugar de
+volver a revisar los textos en cada rerun.
+"""
+MISSING_DESCRIPTION = "Descripción no disponible."
+NO_SALARY = "A convenir"
+
+# Mismo criterio que usaba el dashboard: 50% descripción + 50% salario
+QUALITY_WEIGHTS = {
+    "has_description": 50,
+    "has_salary": 50,
+}
+FLAG_COLUMNS = ["has_description", "has_salary", "has_requirements", "has_location"]
+
+
+def _has_text(df, col):
+    if col not in df.columns:
+        return False
+    text = df[col].astype("string").str.strip()
+    return (text.notna() & (text != "")).fillna(False).astype(bool)
+
+
+def add_quality_flags(df):
+    """Agrega los flags de completitud y `data_quality_score` al DataFrame"""
+    df["has_description"] = _has_text(df, "description") & (df.get("description") != MISSING_DESCRIPTION)
+    df["has_salary"] = _has_text(df, "salary_range") & (df.get("salary_range") != NO_SALARY)
+    df["has_requirements"] = _has_text(df, "requirements")
+    df["has_location"] = _has_text(df, "location")
+    df["data_quality_score"] = sum(df[col].astype(int) * weight for col, weight in QUALITY_WEIGHTS.items())
+    return df
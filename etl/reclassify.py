@@ -0,0 +1,203 @@
+# etl/reclassify.py
+"""
+Backfill de etiquetas cuando cambian las taxonomías del scraper.
+
+Cada vacante guarda `taxonomy_version`, el hash de TECH_SKILLS +
+SECTOR_KEYWORDS con que se etiquetó (ver scrapers/jobscraper/pipelines.py).
+Este comando busca las filas con una versión distinta (o sin versión),
+vuelve a correr la extracción de skills y la clasificación de sector sobre
+las descripciones guardadas, en lotes grandes repartidos entre todos los
+núcleos, y escribe solo lo que cambió:
+
+    - jobs.sector          solo si el sector nuevo es distinto
+    - skills               altas de skills nuevas / bajas de skills que ya no aplican
+    - jobs.taxonomy_version se sella en todas las filas revisadas
+
+Uso:
+    python etl/reclassify.py [--batch 2000] [--workers 4] [--dry-run]
+"""
+import os
+import sys
+import time
+import argparse
+from multiprocessing import Pool
+from collections import defaultdict
+
+from dotenv import load_dotenv
+from supabase import create_client
+from postgrest.types import ReturnMethod
+
+# Las taxonomías viven en el proyecto Scrapy: se reutilizan tal cual
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scrapers"))
+from jobscraper.pipelines import (  # noqa: E402
+    SkillExtractionPipeline, SectorClassificationPipeline, TAXONOMY_VERSION,
+)
+
+from bulk_writer import upsert_in_chunks, CHUNK_SIZE  # noqa: E402
+from streaming import prefetch  # noqa: E402
+from skill_taxonomy import categorize  # noqa: E402
+
+load_dotenv()
+
+BATCH_SIZE = int(os.environ.get("RECLASSIFY_BATCH", 2000))
+WORKERS = int(os.environ.get("RECLASSIFY_WORKERS", os.cpu_count() or 1))
+ID_BATCH = 100          # ids por filtro in.(...) (viajan en la URL)
+MAX_ROWS = 1000         # límite de filas por respuesta de PostgREST
+COLUMNS = "job_id, title, company_name, description, requirements, sector, taxonomy_version"
+
+
+# ---------------------------------------------------
+# 🧠 CLASIFICACIÓN (procesos worker)
+# ---------------------------------------------------
+_skills = None
+_sectors = None
+
+def _init_worker():
+    global _skills, _sectors
+    _skills = SkillExtractionPipeline()
+    _sectors = SectorClassificationPipeline()
+
+
+def classify_batch(rows):
+    """[(job_id, sector, {skills})] con la taxonomía actual"""
+    results = []
+    for row in rows:
+        text = f"{row.get('description') or ''} {row.get('requirements') or ''}"
+        results.append((row["job_id"], _sectors.classify_sector(row), set(_skills.extract_skills(text))))
+    return results
+
+
+# ---------------------------------------------------
+# 📥 LECTURA
+# ---------------------------------------------------
+def iter_outdated(client, batch_size=BATCH_SIZE):
+    """Páginas de vacantes etiquetadas con otra versión (keyset por job_id)"""
+    last = None
+    while True:
+        query = (
+            client.table("jobs").select(COLUMNS)
+            .or_(f"taxonomy_version.is.null,taxonomy_version.neq.{TAXONOMY_VERSION}")
+            .order("job_id")
+            .limit(batch_size)
+        )
+        if last is not None:
+            query = query.gt("job_id", last)
+        rows = query.execute().data
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]["job_id"]
+        if len(rows) < batch_size:
+            return
+
+
+def fetch_skills(client, job_ids):
+    """{job_id: {skill_name}} de las skills guardadas hoy"""
+    current = defaultdict(set)
+    for start in range(0, len(job_ids), ID_BATCH):
+        ids, offset = job_ids[start:start + ID_BATCH], 0
+        while True:
+            page = (
+                client.table("skills").select("job_id, skill_name")
+                .in_("job_id", ids).order("job_id")
+                .range(offset, offset + MAX_ROWS - 1)
+                .execute().data
+            )
+            for r in page:
+                current[r["job_id"]].add(r["skill_name"])
+            offset += len(page)
+            if len(page) < MAX_ROWS:
+                break
+    return current
+
+
+# ---------------------------------------------------
+# 🔼 ESCRITURA DE DIFERENCIAS
+# ---------------------------------------------------
+def _chunks(records):
+    return (records[i:i + CHUNK_SIZE] for i in range(0, len(records), CHUNK_SIZE))
+
+
+def write_changes(client, rows, results, current_skills, stats, dry_run=False):
+    by_id = {r["job_id"]: r for r in rows}
+    sector_changed, stamp_only, added, removed = [], [], [], defaultdict(list)
+
+    for job_id, sector, skills in results:
+        row = by_id[job_id]
+        record = {"job_id": job_id, "title": row["title"], "taxonomy_version": TAXONOMY_VERSION}
+        if sector != row.get("sector"):
+            sector_changed.append({**record, "sector": sector})
+        else:
+            stamp_only.append(record)
+        old = current_skills.get(job_id, set())
+        added.extend({"job_id": job_id, "skill_name": s, "skill_category": categorize(s)}
+                     for s in skills - old)
+        for s in old - skills:
+            removed[s].append(job_id)
+
+    stats["jobs"] += len(results)
+    stats["sector_changed"] += len(sector_changed)
+    stats["skills_added"] += len(added)
+    stats["skills_removed"] += sum(len(ids) for ids in removed.values())
+    if dry_run:
+        return
+
+    # Bloques homogéneos (title viaja por el NOT NULL, ver etl/delta.py)
+    for records in (sector_changed, stamp_only):
+        if records:
+            upsert_in_chunks(client, "jobs", _chunks(records), on_conflict="job_id", key="job_id", verbose=False)
+    if added:
+        upsert_in_chunks(client, "skills", _chunks(added), on_conflict="job_id,skill_name",
+                         key="job_id", verbose=False)
+    # Bajas agrupadas por skill: un DELETE por (skill, lote de ids)
+    for skill, ids in removed.items():
+        for start in range(0, len(ids), ID_BATCH):
+            (client.table("skills").delete(returning=ReturnMethod.minimal)
+             .eq("skill_name", skill).in_("job_id", ids[start:start + ID_BATCH]).execute())
+
+
+# ---------------------------------------------------
+# 🚀 PROCESO PRINCIPAL
+# ---------------------------------------------------
+def run_reclassify(client, batch_size=BATCH_SIZE, workers=WORKERS, dry_run=False):
+    print(f"🔁 Reclasificando vacantes con taxonomía != {TAXONOMY_VERSION} "
+          f"(lotes de {batch_size}, {workers} procesos{', dry-run' if dry_run else ''})...")
+    stats = {"jobs": 0, "sector_changed": 0, "skills_added": 0, "skills_removed": 0}
+    started = time.perf_counter()
+    classify_seconds = 0.0
+
+    with Pool(workers, initializer=_init_worker) as pool:
+        for rows in prefetch(iter_outdated(client, batch_size)):
+            t0 = time.perf_counter()
+            # Sub-lotes para repartir la página entre todos los núcleos
+            step = max(1, len(rows) // (workers * 4))
+            parts = pool.map(classify_batch, [rows[i:i + step] for i in range(0, len(rows), step)])
+            results = [r for part in parts for r in part]
+            classify_seconds += time.perf_counter() - t0
+
+            current = fetch_skills(client, [r["job_id"] for r in rows])
+            write_changes(client, rows, results, current, stats, dry_run)
+
+            elapsed = time.perf_counter() - started
+            print(f"   📦 {stats['jobs']} vacantes | {stats['jobs'] / elapsed:,.0f} jobs/s")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ {stats['jobs']} vacantes revisadas en {elapsed:.1f}s "
+        f"({stats['jobs'] / elapsed if elapsed else 0:,.0f} jobs/s total, "
+        f"{stats['jobs'] / classify_seconds if classify_seconds else 0:,.0f} jobs/s clasificando): "
+        f"{stats['sector_changed']} sectores cambiados, "
+        f"+{stats['skills_added']} / -{stats['skills_removed']} skills"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reetiqueta skills y sector con la taxonomía actual")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="Solo calcula y reporta los cambios")
+    args = parser.parse_args()
+
+    client = create_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_SERVICE_KEY"))
+    run_reclassify(client, args.batch, args.workers, args.dry_run)
@@ -0,0 +1,209 @@
+# etl/retention.py
+"""
+Retención "archivar y luego borrar": las vacantes dadas de baja por el sweep
+(is_active = false, ver etl/lifecycle.py) hace más de N días se exportan
+primero a un archivo Parquet comprimido (misma estructura particionada que
+el snapshot, ver etl/snapshot.py) y recién después se borran de Supabase en
+lotes acotados, sin pedir que la respuesta devuelva las filas borradas.
+
+El runner del ETL es efímero: cada lote se sube a Supabase Storage
+(ARCHIVE_BUCKET) y se verifica allá antes de borrar sus filas. Sin bucket no
+se purga nada. Cada corrida y lote escribe su propio archivo
+(`part-<corrida>-<lote>.parquet`), así una corrida nueva no pisa en el
+bucket lo que archivaron las anteriores para la misma partición.
+
+El archivo sigue siendo consultable para tendencias de largo plazo. Con un
+cliente, primero se bajan del bucket a ARCHIVE_DIR los archivos que falten
+(la copia local del runner no sobrevive a la corrida):
+
+    read_archive(columns=["scraped_at", "country", "sector"], since="2024-01-01",
+                 client=supabase)
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from postgrest.types import ReturnMethod
+
+from snapshot import SnapshotStore
+
+ARCHIVE_DIR = os.environ.get(
+    "ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "archive"),
+)
+# Bucket de Supabase Storage donde queda el archivo durable (sin él no se purga)
+ARCHIVE_BUCKET = os.environ.get("ARCHIVE_BUCKET")
+# Los ids viajan en la URL (in.(...)), por eso el lote es moderado
+DELETE_BATCH = int(os.environ.get("RETENTION_BATCH", 200))
+# PostgREST corta cada respuesta en 1000 filas: las skills de un lote se paginan
+SKILLS_PAGE = 1000
+# Storage lista por carpeta y por páginas
+LIST_PAGE = 100
+
+
+def _file_sizes(root):
+    sizes = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(".parquet"):
+                path = os.path.join(dirpath, name)
+                sizes[path] = os.path.getsize(path)
+    return sizes
+
+
+def _fetch_skills(client, ids, page_size=SKILLS_PAGE):
+    """Todas las skills de un lote de vacantes, pidiendo páginas hasta una incompleta"""
+    skills, offset = [], 0
+    while True:
+        page = (
+            client.table("skills").select("*")
+            .in_("job_id", ids)
+            .order("job_id").order("skill_name")
+            .range(offset, offset + page_size - 1)
+            .execute().data
+        )
+        skills.extend(page)
+        if len(page) < page_size:
+            return skills
+        offset += page_size
+
+
+def _upload_verified(client, bucket, root, paths):
+    """Sube los archivos del lote a Storage y los vuelve a bajar para comparar"""
+    storage = client.storage.from_(bucket)
+    for path in paths:
+        remote = os.path.relpath(path, root).replace(os.sep, "/")
+        with open(path, "rb") as f:
+            data = f.read()
+        storage.upload(remote, data, {"content-type": "application/octet-stream", "upsert": "true"})
+        if storage.download(remote) != data:
+            raise RuntimeError(f"'{remote}' no quedó íntegro en el bucket '{bucket}'")
+
+
+def archive_and_purge(client, days=30, archive_root=ARCHIVE_DIR, batch_size=DELETE_BATCH,
+                      bucket=ARCHIVE_BUCKET):
+    """
+    Archiva y borra las vacantes inactivas con expired_at anterior a `days` días.
+    Un lote se borra solo después de quedar verificado en el bucket; si la
+    subida falla se corta con la excepción y el lote sigue en la base.
+    Devuelve el reporte por lote (filas archivadas, bytes escritos, tiempo de borrado).
+    """
+    if not bucket:
+        print("⚠️ ARCHIVE_BUCKET no configurado: sin archivo durable no se purga ninguna vacante.")
+        return []
+
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    store = SnapshotStore(archive_root)
+    run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.urandom(3).hex()}"
+    batches = []
+
+    print(f"🗄️ Archivando vacantes expiradas antes de: {cutoff}")
+    while True:
+        rows = (
+            client.table("jobs").select("*")
+            .eq("is_active", False)
+            .lt("expired_at", cutoff)
+            .order("job_id")
+            .limit(batch_size)
+            .execute().data
+        )
+        if not rows:
+            break
+
+        ids = [r["job_id"] for r in rows]
+        skills = _fetch_skills(client, ids)
+        archived_at = datetime.now().isoformat()
+
+        # 1. Exportar al archivo, en archivos propios de este lote (si falla, no se borra nada)
+        part = f"part-{run_id}-{len(batches):04d}"
+        before = _file_sizes(archive_root)
+        df_jobs = pd.DataFrame(rows).assign(archived_at=archived_at)
+        store.write("jobs", df_jobs, prune_stale=False, file_name=part)
+        if skills:
+            store.write("skills", pd.DataFrame(skills).assign(archived_at=archived_at),
+                        prune_stale=False, file_name=part)
+        after = _file_sizes(archive_root)
+        written = sum(after.values()) - sum(before.values())
+
+        # 2. Subir y verificar en Storage antes de tocar la base
+        files = [p for p, size in after.items() if before.get(p) != size]
+        _upload_verified(client, bucket, archive_root, files)
+
+        # 3. Borrar el lote sin eco de filas (las skills caen por ON DELETE CASCADE)
+        start = time.perf_counter()
+        client.table("jobs").delete(returning=ReturnMethod.minimal).in_("job_id", ids).execute()
+        delete_seconds = time.perf_counter() - start
+
+        batch = {
+            "batch": len(batches),
+            "jobs_archived": len(rows),
+            "skills_archived": len(skills),
+            "files_uploaded": len(files),
+            "bytes_written": written,
+            "delete_seconds": round(delete_seconds, 3),
+        }
+        batches.append(batch)
+        print(
+            f"   📦 Lote #{batch['batch']}: {batch['jobs_archived']} jobs + {batch['skills_archived']} skills "
+            f"archivados ({written / 1024:+.1f} KB, {len(files)} archivos en '{bucket}'), "
+            f"borrado en {delete_seconds:.2f}s"
+        )
+
+        if len(rows) < batch_size:
+            break
+
+    total = sum(b["jobs_archived"] for b in batches)
+    print(f"✅ {total} vacantes archivadas en {archive_root} y en el bucket '{bucket}', y eliminadas de Supabase.")
+    return batches
+
+
+def _list_remote(storage, prefix=""):
+    """Rutas de los Parquet bajo `prefix` (las carpetas llegan con id None)"""
+    paths, offset = [], 0
+    while True:
+        page = storage.list(prefix, {"limit": LIST_PAGE, "offset": offset,
+                                     "sortBy": {"column": "name", "order": "asc"}})
+        for entry in page:
+            path = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+            if entry.get("id") is None:
+                paths.extend(_list_remote(storage, path))
+            elif path.endswith(".parquet"):
+                paths.append(path)
+        if len(page) < LIST_PAGE:
+            return paths
+        offset += LIST_PAGE
+
+
+def sync_archive(client, bucket=ARCHIVE_BUCKET, archive_root=ARCHIVE_DIR, tables=("jobs", "skills")):
+    """
+    Baja del bucket a `archive_root` los archivos que no están en local. Cada
+    archivo es de una sola corrida y lote y no se reescribe: alcanza con
+    comparar nombres. Devuelve las rutas locales descargadas.
+    """
+    storage = client.storage.from_(bucket)
+    downloaded = []
+    for table in tables:
+        for remote in _list_remote(storage, table):
+            local = os.path.join(archive_root, *remote.split("/"))
+            if os.path.exists(local):
+                continue
+            os.makedirs(os.path.dirname(local), exist_ok=True)
+            tmp = f"{local}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(storage.download(remote))
+            os.replace(tmp, local)
+            downloaded.append(local)
+    if downloaded:
+        print(f"📥 Archivo: {len(downloaded)} archivos bajados del bucket '{bucket}' a {archive_root}")
+    return downloaded
+
+
+def read_archive(table="jobs", archive_root=ARCHIVE_DIR, client=None, bucket=ARCHIVE_BUCKET, **kwargs):
+    """
+    Lee el archivo histórico con los mismos filtros que SnapshotStore.read.
+    Con `client` (y bucket) primero sincroniza `archive_root` con el bucket.
+    """
+    if client is not None and bucket:
+        sync_archive(client, bucket, archive_root, tables=(table,))
+    return SnapshotStore(archive_root).read(table, **kwargs)
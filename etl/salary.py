@@ -0,0 +1,160 @@
+# etl/salary.py
+"""
+Parser vectorizado de salarios: convierte `salary_range` (texto libre) en
+columnas numéricas usando operaciones de pandas sobre la columna completa.
+
+Formatos reales que llegan de los spiders:
+    Computrabajo  "$ 15,000.00 (Mensual)"      (moneda local según el país)
+    Torre         "USD 3000 - 5000"
+    GetonBoard    "$2500 - 3500 USD/month"
+    Varios        "A convenir"                  -> sin salario
+"""
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------
+# TABLAS DE REFERENCIA (actualizar periódicamente)
+# ---------------------------------------------------
+# USD por unidad de moneda local
+CURRENCY_TO_USD = {
+    "USD": 1.0,
+    "EUR": 1.08,
+    "MXN": 0.055,
+    "COP": 0.00025,
+    "ARS": 0.0011,
+    "CLP": 0.00105,
+    "PEN": 0.27,
+    "BRL": 0.19,
+    "UYU": 0.025,
+    "DOP": 0.017,
+    "CRC": 0.0019,
+    "VES": 0.027,
+}
+
+# Moneda que representa "$" (o ningún símbolo) según el país inferido
+LOCAL_CURRENCY = {
+    "Mexico": "MXN",
+    "Colombia": "COP",
+    "Argentina": "ARS",
+    "Chile": "CLP",
+    "Peru": "PEN",
+    "Ecuador": "USD",
+    "Uruguay": "UYU",
+    "Dominican Republic": "DOP",
+    "Costa Rica": "CRC",
+    "Venezuela": "USD",
+}
+
+# Multiplicador para llevar el monto a base mensual
+PERIOD_TO_MONTH = {
+    "hour": 160.0,
+    "day": 22.0,
+    "week": 4.33,
+    "biweekly": 2.0,
+    "month": 1.0,
+    "year": 1 / 12,
+}
+
+# El orden importa: se toma la primera coincidencia
+CURRENCY_PATTERNS = [
+    ("USD", r"\bUSD\b|US\$|U\$S|\bd[oó]lares\b|\bdollars?\b"),
+    ("EUR", r"\bEUR\b|€"),
+    ("BRL", r"\bBRL\b|R\$"),
+    ("PEN", r"\bPEN\b|S/\.?|\bsoles\b"),
+    ("MXN", r"\bMXN\b"),
+    ("COP", r"\bCOP\b"),
+    ("CLP", r"\bCLP\b"),
+    ("ARS", r"\bARS\b"),
+    ("UYU", r"\bUYU\b"),
+]
+
+PERIOD_PATTERNS = [
+    ("hour", r"hora|\bhour|/h\b|por hora"),
+    ("day", r"diario|\bd[ií]a\b|\bday\b|daily"),
+    ("week", r"semanal|semana|\bweek"),
+    ("biweekly", r"quincenal|quincena|biweekly"),
+    ("year", r"anual|/a[ñn]o|\ba[ñn]o\b|\byear|yearly|annual"),
+    ("month", r"mensual|/mes|\bmes\b|month"),
+]
+
+# Primer número (mínimo) y, opcionalmente, el segundo tras un separador de rango
+RANGE_PATTERN = (
+    r"(?P<min>\d[\d.,]*)\s*(?P<kmin>[kK])?"
+    r"(?:\s*(?:-|–|—|a|al|hasta|to)\s*\$?\s*(?P<max>\d[\d.,]*)\s*(?P<kmax>[kK])?)?"
+)
+
+
+# ---------------------------------------------------
+# 🔢 NÚMEROS
+# ---------------------------------------------------
+def _to_number(s):
+    """
+    Convierte una serie de strings numéricos en float soportando:
+    "15,000.00" / "1.200.000" / "4.500,50" / "3000" / "2,5"
+    """
+    s = s.fillna("").str.strip(".,")
+    dot_thousands = s.str.fullmatch(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?")
+    comma_thousands = s.str.fullmatch(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+    comma_decimal = s.str.fullmatch(r"\d+,\d{1,2}")
+    normalized = np.select(
+        [dot_thousands, comma_thousands, comma_decimal],
+        [
+            s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+            s.str.replace(",", "", regex=False),
+            s.str.replace(",", ".", regex=False),
+        ],
+        default=s,
+    )
+    return pd.to_numeric(pd.Series(normalized, index=s.index), errors="coerce")
+
+
+def _first_match(text, patterns):
+    """Etiqueta del primer patrón que coincide en cada fila (o NaN)"""
+    result = pd.Series(np.nan, index=text.index, dtype=object)
+    for label, pattern in reversed(patterns):
+        hit = text.str.contains(pattern, case=False, regex=True, na=False)
+        result = result.mask(hit, label)
+    return result
+
+
+# ---------------------------------------------------
+# 💰 API PRINCIPAL
+# ---------------------------------------------------
+def parse_salaries(df):
+    """
+    Llena salary_min / salary_max (en la moneda y período originales) y agrega
+    salary_currency, salary_period, salary_min_usd_month y salary_max_usd_month.
+    """
+    text = df["salary_range"].astype("string")
+    negotiable = text.isna() | text.str.contains("convenir|negociable|a tratar", case=False, na=True)
+    text = text.where(~negotiable)
+
+    parts = text.str.extract(RANGE_PATTERN)
+    # "3k - 5k" / "3 - 5k": el sufijo k aplica a ambos extremos
+    thousands = parts["kmin"].notna() | parts["kmax"].notna()
+    low = _to_number(parts["min"]) * np.where(thousands, 1000, 1)
+    high = _to_number(parts["max"]) * np.where(thousands, 1000, 1)
+    high = high.fillna(low)
+
+    # Rango invertido -> se ordena; montos en cero se descartan
+    low, high = np.fmin(low, high), np.fmax(low, high)
+    low = low.where(low > 0)
+    high = high.where(low.notna())
+
+    currency = _first_match(text, CURRENCY_PATTERNS)
+    if "country" in df.columns:
+        local = df["country"].map(LOCAL_CURRENCY)
+    else:
+        local = pd.Series(np.nan, index=df.index, dtype=object)
+    currency = currency.fillna(local).fillna("USD").where(low.notna())
+
+    period = _first_match(text, PERIOD_PATTERNS).fillna("month").where(low.notna())
+
+    to_usd_month = currency.map(CURRENCY_TO_USD) * period.map(PERIOD_TO_MONTH)
+    df["salary_min"] = low
+    df["salary_max"] = high
+    df["salary_currency"] = currency
+    df["salary_period"] = period
+    df["salary_min_usd_month"] = (low * to_usd_month).round(2)
+    df["salary_max_usd_month"] = (high * to_usd_month).round(2)
+    return df
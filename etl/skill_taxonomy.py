@@ -0,0 +1,72 @@
+# etl/skill_taxonomy.py
+"""
+Etapa de categorización masiva de skills.
+
+La taxonomía (SKILL_TAXONOMY) es la misma de la que el scraper saca
+TECH_SKILLS: scrapers/jobscraper/taxonomy.py.
+
+El scraper guarda cada skill con skill_category = "Pending ETL". Esta etapa
+agrupa la taxonomía por categoría y lanza un UPDATE por categoría que solo
+toca filas todavía pendientes:
+
+    UPDATE skills SET skill_category = 'Database'
+    WHERE skill_category = 'Pending ETL' AND skill_name IN ('SQL', 'MySQL', ...)
+
+Las skills pendientes que no están en la taxonomía pasan a "Other". Las filas
+ya categorizadas nunca se vuelven a escribir.
+"""
+import os
+import sys
+import time
+from collections import defaultdict
+
+from postgrest.types import ReturnMethod
+
+# La taxonomía vive en el proyecto Scrapy (módulo sin scrapy ni bs4): una sola fuente
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scrapers"))
+from jobscraper.taxonomy import SKILL_TAXONOMY  # noqa: E402
+
+PENDING = "Pending ETL"
+DEFAULT_CATEGORY = "Other"
+
+# Lookup skill -> categoría (se arma una sola vez al importar)
+CATEGORY_BY_SKILL = {skill: category for category, skills in SKILL_TAXONOMY.items() for skill in skills}
+
+
+def categorize(skill_name):
+    return CATEGORY_BY_SKILL.get(skill_name, DEFAULT_CATEGORY)
+
+
+def categorize_pending_skills(client):
+    """Categoriza en bloque las skills pendientes; devuelve filas actualizadas por categoría"""
+    started = time.perf_counter()
+    by_category = defaultdict(list)
+    for skill, category in CATEGORY_BY_SKILL.items():
+        by_category[category].append(skill)
+
+    updated = {}
+    for category, names in by_category.items():
+        res = (
+            client.table("skills")
+            .update({"skill_category": category}, count="exact", returning=ReturnMethod.minimal)
+            .eq("skill_category", PENDING)
+            .in_("skill_name", names)
+            .execute()
+        )
+        updated[category] = res.count or 0
+
+    # Lo que siga pendiente no está en la taxonomía
+    res = (
+        client.table("skills")
+        .update({"skill_category": DEFAULT_CATEGORY}, count="exact", returning=ReturnMethod.minimal)
+        .eq("skill_category", PENDING)
+        .execute()
+    )
+    updated[DEFAULT_CATEGORY] = res.count or 0
+
+    total = sum(updated.values())
+    print(f"🏷️ {total} skills categorizadas en {time.perf_counter() - started:.2f}s")
+    for category, count in sorted(updated.items(), key=lambda kv: -kv[1]):
+        if count:
+            print(f"   • {category}: {count}")
+    return updated
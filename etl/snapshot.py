@@ -0,0 +1,349 @@
+# etl/snapshot.py
+"""
+Snapshot local columnar (Parquet) de las tablas `jobs` y `skills`.
+
+Estructura en disco (particionado estilo Hive):
+
+    data/snapshot/
+        _state.json                              # watermarks por tabla
+        jobs/day=2024-05-01/platform=computrabajo/part.parquet
+        skills/day=2024-05-01/part.parquet
+
+- `refresh()` descarga solo las filas escritas después del último watermark
+  (updated_at en `jobs`, así también llega lo que el ETL completa después) y
+  luego `reconcile()` quita las vacantes que ya no están activas en la base
+  (borradas por retención o dadas de baja por el sweep), con sus skills.
+- `read()` usa memory-map, proyección de columnas y filtros que descartan
+  particiones completas (día / plataforma) antes de leer.
+
+Este módulo no depende de otros módulos del ETL para poder importarse
+también desde el dashboard (`from etl.snapshot import SnapshotStore`).
+"""
+import os
+import json
+import time
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+DEFAULT_ROOT = os.environ.get(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "snapshot"),
+)
+PAGE_SIZE = 1000
+COMPRESSION = "zstd"
+
+# Configuración por tabla: columna de tiempo (partición), columna del watermark
+# (por defecto la misma), llave y particiones
+TABLES = {
+    "jobs": {"time_col": "scraped_at", "watermark_col": "updated_at", "key": ["job_id"], "by_platform": True},
+    "skills": {"time_col": "created_at", "key": ["job_id", "skill_name"], "by_platform": False},
+}
+
+# Tipos explícitos para columnas conocidas (evita esquemas distintos entre archivos)
+COLUMN_TYPES = {
+    "salary_min": pa.float64(),
+    "salary_max": pa.float64(),
+    "is_active": pa.bool_(),
+    "scraped_at": pa.timestamp("us"),
+    "created_at": pa.timestamp("us"),
+    "first_seen_at": pa.timestamp("us"),
+    "last_seen_at": pa.timestamp("us"),
+    "expired_at": pa.timestamp("us"),
+    "updated_at": pa.timestamp("us"),
+    "description_keywords": pa.list_(pa.string()),
+}
+
+
+# ---------------------------------------------------
+# 🧩 UTILIDADES
+# ---------------------------------------------------
+def _partition_value(value):
+    """Valor seguro para usar como nombre de carpeta"""
+    text = str(value).strip().lower() if value is not None and not pd.isna(value) else "unknown"
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in text) or "unknown"
+
+
+def _to_arrow(df):
+    """DataFrame -> Table con tipos estables (texto y columnas object vacías como string)"""
+    fields = []
+    for col in df.columns:
+        if col in COLUMN_TYPES:
+            fields.append(pa.field(col, COLUMN_TYPES[col]))
+        elif pd.api.types.is_string_dtype(df[col].dtype):
+            fields.append(pa.field(col, pa.string()))
+        else:
+            fields.append(pa.field(col, pa.Schema.from_pandas(df[[col]], preserve_index=False).field(col).type))
+    df = df.copy()
+    for field in fields:
+        if pa.types.is_string(field.type):
+            df[field.name] = df[field.name].map(lambda v: None if pd.isna(v) else str(v))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+
+def _normalize_times(df):
+    """Todas las columnas de fecha conocidas a timestamp sin zona (filtros de Arrow comparables)"""
+    for col, kind in COLUMN_TYPES.items():
+        if col in df.columns and pa.types.is_timestamp(kind):
+            df[col] = pd.to_datetime(df[col], format="ISO8601", errors="coerce", utc=True).dt.tz_localize(None)
+    return df
+
+
+def _read_file(path, columns=None):
+    """Lee un único archivo sin inferir columnas de partición desde la ruta"""
+    return pq.ParquetFile(path).read(columns=columns).to_pandas()
+
+
+def _write_atomic(table, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------
+# 🗄️ STORE
+# ---------------------------------------------------
+class SnapshotStore:
+    """Snapshot Parquet particionado por día y plataforma"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.state_path = os.path.join(root, "_state.json")
+
+    # ---------- estado ----------
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self, state):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(state, f, indent=2)
+
+    def exists(self, table="jobs"):
+        return os.path.isdir(os.path.join(self.root, table))
+
+    def watermark(self, table):
+        return self._load_state().get(table, {}).get("watermark")
+
+    # ---------- escritura ----------
+    def _partition_dir(self, table, day, platform=None):
+        parts = [self.root, table, f"day={day}"]
+        if platform is not None:
+            parts.append(f"platform={platform}")
+        return os.path.join(*parts)
+
+    def write(self, table, df, prune_stale=True, file_name="part"):
+        """
+        Inserta/actualiza filas en el snapshot (merge por llave dentro de cada
+        partición). Con `prune_stale` también borra las versiones anteriores
+        que quedaron en otra partición (p. ej. una vacante re-scrapeada otro día).
+        `file_name` es el nombre del archivo dentro de la partición (el archivo de
+        retención usa uno por corrida y lote para no pisar lo ya archivado).
+        Devuelve {llave: timestamp} de las filas escritas.
+        """
+        if df.empty:
+            return {}
+        cfg = TABLES[table]
+        key, time_col = cfg["key"], cfg["time_col"]
+        df = _normalize_times(df.copy())
+        df["_day"] = df[time_col].dt.strftime("%Y-%m-%d").fillna("unknown")
+        group_cols = ["_day"]
+        if cfg["by_platform"]:
+            df["_platform"] = df["source_platform"].map(_partition_value)
+            group_cols.append("_platform")
+
+        for values, part in df.groupby(group_cols):
+            values = values if isinstance(values, tuple) else (values,)
+            path = os.path.join(self._partition_dir(table, *values), f"{file_name}.parquet")
+            part = part.drop(columns=group_cols)
+            if os.path.exists(path):
+                old = _read_file(path)
+                part = pd.concat([old, part], ignore_index=True)
+            part = part.drop_duplicates(subset=key, keep="last")
+            _write_atomic(_to_arrow(part), path)
+
+        latest = df.groupby(key)[time_col].max()
+        latest = {tuple(map(str, k if isinstance(k, tuple) else (k,))): t for k, t in latest.items()}
+        if prune_stale:
+            self.prune_stale(table, latest)
+        return latest
+
+    def prune_stale(self, table, latest):
+        """Quita copias de una llave cuyo timestamp es anterior al más reciente escrito"""
+        key, time_col = TABLES[table]["key"], TABLES[table]["time_col"]
+        for path in list(self._files(table)):
+            existing = _read_file(path, columns=key + [time_col])
+            stale = [
+                (k := tuple(map(str, row[:-1]))) in latest and row[-1] < latest[k]
+                for row in existing.itertuples(index=False)
+            ]
+            if any(stale):
+                keep = _read_file(path)[[not s for s in stale]]
+                if keep.empty:
+                    os.remove(path)
+                else:
+                    _write_atomic(_to_arrow(keep), path)
+
+    def _drop_jobs(self, table, job_ids):
+        """Quita del snapshot las filas de `table` cuyo job_id está en `job_ids`"""
+        removed = 0
+        for path in list(self._files(table)):
+            existing = _read_file(path, columns=["job_id"])["job_id"].astype(str)
+            drop = existing.isin(job_ids).to_numpy()
+            if drop.any():
+                keep = _read_file(path)[~drop]
+                if keep.empty:
+                    os.remove(path)
+                else:
+                    _write_atomic(_to_arrow(keep), path)
+                removed += int(drop.sum())
+        return removed
+
+    def _files(self, table):
+        base = os.path.join(self.root, table)
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                if name.endswith(".parquet"):
+                    yield os.path.join(dirpath, name)
+
+    # ---------- refresco incremental ----------
+    def refresh(self, client, tables=("jobs", "skills"), page_size=PAGE_SIZE, reconcile=True):
+        """
+        Descarga de Supabase solo las filas escritas después del último
+        watermark (columna `watermark_col`, o `time_col`). Con `reconcile` (y si se refrescó `jobs`) además quita las vacantes que
+        ya no están activas en la base; ver `reconcile()`.
+        """
+        state = self._load_state()
+        for table in tables:
+            cfg = TABLES[table]
+            watermark_col = cfg.get("watermark_col", cfg["time_col"])
+            watermark = state.get(table, {}).get("watermark")
+            if state.get(table, {}).get("watermark_col", cfg["time_col"]) != watermark_col:
+                watermark = None  # marca de otra columna: se vuelve a bajar todo
+            had_rows = self.exists(table)
+            started = time.perf_counter()
+            total, offset = 0, 0
+            new_watermark = watermark
+            latest = {}
+            while True:
+                query = client.table(table).select("*").order(watermark_col)
+                if watermark:
+                    query = query.gt(watermark_col, watermark)
+                rows = query.range(offset, offset + page_size - 1).execute().data
+                if not rows:
+                    break
+                latest.update(self.write(table, pd.DataFrame(rows), prune_stale=False))
+                total += len(rows)
+                offset += len(rows)
+                page_max = max((r[watermark_col] for r in rows if r.get(watermark_col)), default=None)
+                if page_max and (not new_watermark or page_max > new_watermark):
+                    new_watermark = page_max
+                if len(rows) < page_size:
+                    break
+            if latest and had_rows:
+                self.prune_stale(table, latest)
+            state[table] = {
+                "watermark": new_watermark,
+                "watermark_col": watermark_col,
+                "refreshed_at": datetime.now().isoformat(),
+                "last_delta_rows": total,
+            }
+            self._save_state(state)
+            print(f"🗂️ Snapshot {table}: +{total} filas nuevas en {time.perf_counter() - started:.1f}s")
+        if reconcile and "jobs" in tables:
+            self.reconcile(client, page_size=page_size)
+        return state
+
+    def reconcile(self, client, page_size=PAGE_SIZE):
+        """
+        El delta por watermark no ve borrados ni cambios de is_active: compara
+        los job_id del snapshot con los activos en la base y quita el resto
+        (vacantes purgadas por retención o dadas de baja por el sweep), junto
+        con sus skills. Devuelve el set de job_id quitados.
+        """
+        if not self.exists("jobs"):
+            return set()
+        active, offset = set(), 0
+        while True:
+            rows = (client.table("jobs").select("job_id").eq("is_active", True)
+                    .order("job_id").range(offset, offset + page_size - 1).execute().data)
+            active.update(str(r["job_id"]) for r in rows)
+            offset += len(rows)
+            if len(rows) < page_size:
+                break
+        local = set(self.read("jobs", columns=["job_id"])["job_id"].astype(str))
+        stale = local - active
+        if stale:
+            for table in TABLES:
+                self._drop_jobs(table, stale)
+            print(f"🧹 Snapshot: {len(stale)} vacantes inactivas o borradas quitadas.")
+        return stale
+
+    # ---------- lectura ----------
+    @staticmethod
+    def _upgrade_types(path, schema):
+        """
+        Reescribe una vez los archivos con una columna conocida guardada con otro
+        tipo (p. ej. first_seen_at como texto, antes de estar en COLUMN_TYPES)
+        """
+        if all(schema.field(col).type == kind for col, kind in COLUMN_TYPES.items() if col in schema.names):
+            return schema
+        table = _to_arrow(_normalize_times(_read_file(path)))
+        _write_atomic(table, path)
+        return table.schema
+
+    def dataset(self, table):
+        """Dataset de Arrow con memory-map y particiones día/plataforma"""
+        partition_fields = [("day", pa.string())]
+        if TABLES[table]["by_platform"]:
+            partition_fields.append(("platform", pa.string()))
+        partitioning = ds.partitioning(pa.schema(partition_fields), flavor="hive")
+        local = fs.LocalFileSystem(use_mmap=True)
+        base = os.path.join(self.root, table)
+
+        files = list(self._files(table))
+        schemas = [self._upgrade_types(path, pq.read_schema(path)) for path in files]
+        schema = pa.unify_schemas(schemas + [pa.schema(partition_fields)]) if schemas else None
+        return ds.dataset(base, format="parquet", partitioning=partitioning,
+                          filesystem=local, schema=schema)
+
+    def read(self, table="jobs", columns=None, since=None, until=None,
+             platforms=None, filter=None):
+        """
+        Lee el snapshot como DataFrame.
+        - `columns`: proyección (solo se leen esas columnas del disco).
+        - `since`/`until`: fechas (date/str) filtradas sobre la partición `day`.
+        - `platforms`: lista de plataformas (partición `platform`).
+        - `filter`: expresión adicional de pyarrow.dataset (p. ej. ds.field("country") == "Peru").
+        """
+        if not self.exists(table):
+            return pd.DataFrame(columns=columns or [])
+
+        expr = None
+
+        def _and(e):
+            return e if expr is None else expr & e
+
+        if since is not None:
+            expr = _and(ds.field("day") >= str(pd.Timestamp(since).date()))
+        if until is not None:
+            expr = _and(ds.field("day") <= str(pd.Timestamp(until).date()))
+        if platforms is not None and TABLES[table]["by_platform"]:
+            expr = _and(ds.field("platform").isin([_partition_value(p) for p in platforms]))
+        if filter is not None:
+            expr = _and(filter)
+
+        data = self.dataset(table)
+        read_cols = None
+        if columns is not None:
+            read_cols = [c for c in columns if c in data.schema.names]
+        result = data.to_table(columns=read_cols, filter=expr).to_pandas()
+        return result.drop(columns=[c for c in ("day", "platform") if c in result.columns and (columns is None or c not in columns)])
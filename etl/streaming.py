@@ -0,0 +1,212 @@
+# etl/streaming.py
+"""
+Modo ETL en streaming: las páginas descargadas de Supabase pasan por la
+limpieza y llegan al escritor por bloques sin cargar la tabla completa.
+
+    descarga (hilo productor) -> limpieza (hilo principal) -> upsert (pool)
+
+Cada etapa está acotada (cola de páginas + bloques en vuelo), por lo que la
+memoria pico depende del tamaño de página y no del tamaño de la tabla.
+"""
+import os
+import time
+import queue
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # solo Unix (en Windows no hay memoria pico)
+    resource = None
+
+from cleaning import clean_job_data
+from bulk_writer import upsert_in_chunks, iter_record_chunks, CHUNK_SIZE
+from delta import iter_delta_chunks, new_delta_stats, print_delta_stats
+from dedupe import MinHashIndex, assign_clusters
+from companies import CompanyResolver, assign_companies
+from keyword_hits import assign_keywords
+
+PAGE_SIZE = int(os.environ.get("ETL_PAGE_SIZE", 1000))
+PREFETCH_PAGES = int(os.environ.get("ETL_PREFETCH_PAGES", 2))
+
+
+# ---------------------------------------------------
+# 🧮 CONJUNTO COMPACTO DE IDS VISTOS
+# ---------------------------------------------------
+class SeenSet:
+    """
+    Hash de 8 bytes por job_id en un arreglo uint64 ordenado (8 bytes por id,
+    sin el overhead de un set de Python). Cada página se intercala con
+    searchsorted + insert; las consultas son búsquedas binarias.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _hash(value):
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def _known(self, hashes):
+        at = np.searchsorted(self._hashes, hashes)
+        found = at < len(self._hashes)
+        found[found] = self._hashes[at[found]] == hashes[found]
+        return found
+
+    def add_many(self, values):
+        """Agrega un lote de ids; devuelve un array bool (True = no se había visto antes)"""
+        hashes = np.fromiter((self._hash(v) for v in values), dtype=np.uint64)
+        is_new = ~self._known(hashes)
+        # Repetidos dentro del lote: solo cuenta la primera aparición
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+        is_new &= first
+        new = np.sort(hashes[is_new])
+        self._hashes = np.insert(self._hashes, np.searchsorted(self._hashes, new), new)
+        return is_new
+
+    def add(self, value):
+        """Agrega el id y devuelve True si no se había visto antes"""
+        return bool(self.add_many([value])[0])
+
+    def __contains__(self, value):
+        return bool(self._known(np.array([self._hash(value)], dtype=np.uint64))[0])
+
+    def __len__(self):
+        return len(self._hashes)
+
+
+# ---------------------------------------------------
+# 📥 PRODUCTOR DE PÁGINAS
+# ---------------------------------------------------
+def iter_pages(client, table, key, columns="*", page_size=PAGE_SIZE):
+    """Paginación por llave (keyset) ordenada por `key`: cada consulta es O(página)"""
+    last = None
+    while True:
+        query = client.table(table).select(columns).order(key).limit(page_size)
+        if last is not None:
+            query = query.gt(key, last)
+        rows = query.execute().data
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1][key]
+
+
+def prefetch(iterable, depth=PREFETCH_PAGES):
+    """Consume `iterable` en un hilo aparte con una cola acotada (red || CPU)"""
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+
+    def _producer():
+        try:
+            for item in iterable:
+                buffer.put(item)
+        except Exception as e:  # se re-lanza en el hilo consumidor
+            buffer.put(e)
+        buffer.put(done)
+
+    threading.Thread(target=_producer, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+# ---------------------------------------------------
+# 🧹 TRANSFORMACIÓN POR PÁGINA
+# ---------------------------------------------------
+def iter_clean_job_chunks(pages, seen, stats, delta_stats=None, dedupe_index=None,
+                          client=None, company_resolver=None):
+    """
+    Limpia cada página y descarta job_id ya vistos en páginas anteriores.
+    Con `delta_stats` solo se emiten las columnas modificadas, con
+    `dedupe_index` se asigna el cluster_id de casi-duplicados y con
+    `company_resolver` el company_id (el mapeo se sube antes que la página).
+    """
+    for rows in pages:
+        stats["pages"] += 1
+        stats["rows_in"] += len(rows)
+        df_raw = pd.DataFrame(rows)
+        df_clean = clean_job_data(df_raw.copy())
+        if df_clean.empty:
+            continue
+        is_new = seen.add_many(df_clean["job_id"].tolist())
+        df_clean = assign_keywords(df_clean[is_new].copy())
+        if dedupe_index is not None:
+            df_clean = assign_clusters(df_clean.copy(), index=dedupe_index, save=False, verbose=False)
+        if company_resolver is not None:
+            df_clean = assign_companies(df_clean, client, resolver=company_resolver, verbose=False)
+        stats["rows_out"] += len(df_clean)
+        if delta_stats is not None:
+            yield from iter_delta_chunks(df_raw, df_clean, delta_stats)
+        else:
+            yield from iter_record_chunks(df_clean, CHUNK_SIZE)
+
+
+def iter_valid_skill_chunks(pages, seen, stats):
+    """Deja pasar solo las skills cuyo job_id sobrevivió a la limpieza"""
+    for rows in pages:
+        stats["skills_in"] += len(rows)
+        valid = [r for r in rows if r.get("job_id") in seen]
+        stats["skills_out"] += len(valid)
+        for start in range(0, len(valid), CHUNK_SIZE):
+            yield valid[start:start + CHUNK_SIZE]
+
+
+# ---------------------------------------------------
+# 🚀 PROCESO PRINCIPAL EN STREAMING
+# ---------------------------------------------------
+def run_streaming_etl(client, page_size=PAGE_SIZE, delta=True):
+    """
+    Ejecuta limpieza + upsert de jobs y skills con memoria acotada.
+    En modo `delta` solo se envían columnas modificadas y se omite la
+    pasada de skills, que el ETL no altera.
+    """
+    started = time.perf_counter()
+    seen = SeenSet()
+    stats = {"pages": 0, "rows_in": 0, "rows_out": 0, "skills_in": 0, "skills_out": 0}
+    delta_stats = new_delta_stats() if delta else None
+    dedupe_index = MinHashIndex.load(client=client)
+    company_resolver = CompanyResolver.load(client)
+
+    print(f"🌊 ETL en streaming (páginas de {page_size} filas)...")
+    job_pages = prefetch(iter_pages(client, "jobs", "job_id", page_size=page_size))
+    jobs_report = upsert_in_chunks(
+        client, "jobs", iter_clean_job_chunks(job_pages, seen, stats, delta_stats, dedupe_index,
+                                              client, company_resolver),
+        on_conflict="job_id", key="job_id",
+    )
+    if delta:
+        print_delta_stats(delta_stats, jobs_report)
+    # La pasada recorre la tabla completa: lo que no se vio fue purgado
+    removed = dedupe_index.prune(seen)
+    dedupe_index.save(client=client)
+    print(f"🧬 Índice de casi-duplicados: {len(dedupe_index)} vacantes indexadas, {removed} purgadas quitadas.")
+
+    skills_report = None
+    if not delta:
+        skill_pages = prefetch(iter_pages(client, "skills", "id", page_size=page_size))
+        skills_report = upsert_in_chunks(
+            client, "skills", iter_valid_skill_chunks(skill_pages, seen, stats),
+            on_conflict="job_id,skill_name", key="job_id",
+        )
+
+    # ru_maxrss está en KB en Linux (el runner de GitHub)
+    peak = (f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB"
+            if resource is not None else "n/d")
+    print(
+        f"📊 {stats['pages']} páginas | jobs {stats['rows_in']} → {stats['rows_out']} | "
+        f"skills {stats['skills_in']} → {stats['skills_out']} | "
+        f"{time.perf_counter() - started:.1f}s | memoria pico {peak}"
+    )
+    return {"stats": stats, "jobs": jobs_report, "skills": skills_report}
@@ -1,11 +1,24 @@
 # etl/update_data.py
 import os
+import sys
+import argparse
 import pandas as pd
 from supabase import create_client
 from dotenv import load_dotenv
 
 # Importamos la nueva función maestra desde cleaning.py
 from cleaning import clean_job_data
+from bulk_writer import upsert_in_chunks
+from streaming import run_streaming_etl
+from delta import iter_delta_chunks, new_delta_stats, print_delta_stats
+from snapshot import SnapshotStore
+from retention import archive_and_purge
+from dedupe import assign_clusters
+from companies import assign_companies
+from keyword_hits import assign_keywords
+from checkpoint import RunCheckpoint
+from skill_taxonomy import categorize_pending_skills
+from lifecycle import sweep_inactive_jobs
 
 load_dotenv()
 
@@ -23,8 +36,20 @@ client = create_client(SUPABASE_URL, SUPABASE_KEY)
 # ---------------------------------------------------
 # 📥 CARGA DE DATOS
 # ---------------------------------------------------
-def load_raw_data():
-    """Descarga los datos crudos de las tablas jobs y skills"""
+def load_raw_data(source="supabase"):
+    """
+    Descarga los datos crudos de las tablas jobs y skills.
+    Con source="snapshot" solo se baja el delta y se lee del Parquet local.
+    """
+    if source == "snapshot":
+        print("📥 Refrescando snapshot local...")
+        store = SnapshotStore()
+        store.refresh(client)
+        df_jobs = store.read("jobs")
+        df_skills = store.read("skills")
+        print(f"📊 Registros en snapshot: {len(df_jobs)} jobs y {len(df_skills)} skills.")
+        return df_jobs, df_skills
+
     print("📥 Descargando datos desde Supabase...")
     
     # Descargar Jobs
@@ -41,74 +66,212 @@ def load_raw_data():
 # ---------------------------------------------------
 # 🔼 ACTUALIZACIÓN (UPSERT)
 # ---------------------------------------------------
-def upload_data(df_jobs_clean, df_skills_clean):
-    """Sube los datos limpios a Supabase usando UPSERT"""
-    
-    # 1. Actualizar Jobs
-    if not df_jobs_clean.empty:
-        print(f"⬆️ Actualizando {len(df_jobs_clean)} jobs...")
-        records = df_jobs_clean.to_dict(orient="records")
-        # El on_conflict='job_id' es vital para no duplicar entradas
-        client.table("jobs").upsert(records, on_conflict="job_id").execute()
-        print("✅ Jobs actualizados correctamente.")
-
-    # 2. Actualizar Skills (vinculadas a los jobs existentes)
-    if not df_skills_clean.empty:
-        print(f"⬆️ Actualizando {len(df_skills_clean)} skills...")
-        # Filtrar solo skills cuyos job_id existen en nuestra lista limpia de jobs
-        valid_ids = set(df_jobs_clean['job_id'])
-        df_skills_filtered = df_skills_clean[df_skills_clean['job_id'].isin(valid_ids)]
-        
-        records_skills = df_skills_filtered.to_dict(orient="records")
-        # Requiere un constraint único en Supabase para (job_id, skill_name)
-        client.table("skills").upsert(records_skills, on_conflict="job_id,skill_name").execute()
-        print(f"✅ {len(df_skills_filtered)} skills actualizadas.")
+def upload_jobs(df_jobs_clean, df_jobs_raw=None, skip_chunks=(), on_chunk=None):
+    """
+    Sube los jobs limpios por bloques (UPSERT).
+    Si se pasa `df_jobs_raw`, solo se envían las columnas que cambiaron.
+    """
+    if df_jobs_clean.empty:
+        return None
+    print(f"⬆️ Actualizando {len(df_jobs_clean)} jobs...")
+    if df_jobs_raw is not None:
+        stats = new_delta_stats()
+        data = iter_delta_chunks(df_jobs_raw, df_jobs_clean, stats)
+    else:
+        data = df_jobs_clean
+    # El on_conflict='job_id' es vital para no duplicar entradas
+    report = upsert_in_chunks(client, "jobs", data, on_conflict="job_id", key="job_id",
+                              skip_chunks=skip_chunks, on_chunk=on_chunk)
+    if df_jobs_raw is not None:
+        print_delta_stats(stats, report)
+    print(f"✅ {report['rows_ok']} jobs actualizados correctamente.")
+    return report
+
+
+def upload_skills(df_skills_clean, df_jobs_clean, skip_chunks=(), on_chunk=None):
+    """Sube las skills vinculadas a los jobs existentes"""
+    if df_skills_clean.empty:
+        return None
+    print(f"⬆️ Actualizando {len(df_skills_clean)} skills...")
+    # Filtrar solo skills cuyos job_id existen en nuestra lista limpia de jobs
+    valid_ids = set(df_jobs_clean['job_id'])
+    df_skills_filtered = df_skills_clean[df_skills_clean['job_id'].isin(valid_ids)]
+
+    # Requiere un constraint único en Supabase para (job_id, skill_name)
+    report = upsert_in_chunks(client, "skills", df_skills_filtered, on_conflict="job_id,skill_name",
+                              key="job_id", skip_chunks=skip_chunks, on_chunk=on_chunk)
+    print(f"✅ {report['rows_ok']} skills actualizadas.")
+    return report
+
+
+def upload_data(df_jobs_clean, df_skills_clean, df_jobs_raw=None):
+    """
+    Sube los datos limpios a Supabase usando UPSERT por bloques.
+    Si se pasa `df_jobs_raw`, solo se envían las columnas que cambiaron.
+    """
+    reports = [upload_jobs(df_jobs_clean, df_jobs_raw)]
+
+    # En modo delta se omiten las skills: el ETL no modifica la tabla skills
+    if df_jobs_raw is not None and not df_skills_clean.empty:
+        print(f"⏭️ {len(df_skills_clean)} skills sin cambios, se omiten.")
+    else:
+        reports.append(upload_skills(df_skills_clean, df_jobs_clean))
+
+    return [r for r in reports if r]
         
 # ---------------------------------------------------
-# 🚀 LIMPIEZA DE REGISTROS ANTIGUOS
+# 🚀 EXPIRACIÓN Y LIMPIEZA DE REGISTROS ANTIGUOS
 # ---------------------------------------------------
-        
+def sweep_jobs():
+    """Desactiva las vacantes que no aparecieron en los últimos crawls"""
+    sweep_inactive_jobs(client)
+
 def delete_old_jobs(days=30):
     """
-    Borra registros más antiguos que N días para ahorrar espacio en Supabase.
+    Archiva en Parquet y luego borra (por lotes) las vacantes que el sweep
+    dio de baja hace más de N días, para ahorrar espacio en Supabase sin
+    perder el histórico.
     """
-    from datetime import datetime, timedelta
-    
-    # Calculamos la fecha límite
-    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-    
-    print(f"🧹 Buscando vacantes publicadas antes de: {cutoff_date}")
-    
+    archive_and_purge(client, days=days)
+
+def run_maintenance(run=lambda stage, fn: fn()):
+    """
+    Sweep y purga. Un error no corta el ETL pero sí se propaga hasta `run`
+    (en batch, el checkpoint marca la etapa como fallida y se reintenta al
+    retomar). Devuelve las etapas que fallaron.
+    """
+    failed = []
+    for stage, fn in (("sweep", sweep_jobs), ("purge", lambda: delete_old_jobs(days=30))):
+        try:
+            run(stage, fn)
+        except Exception as e:
+            print(f"❌ Etapa '{stage}' falló: {e}")
+            failed.append(stage)
+    return failed
+
+def categorize_skills():
+    """UPDATEs por categoría sobre las skills pendientes (ver skill_taxonomy.py)"""
+    categorize_pending_skills(client)
+
+def refresh_dashboard_views():
+    """Recalcula la vista materializada con las opciones de filtro del dashboard"""
     try:
-        # Filtramos por scraped_at menor a la fecha de corte
-        response = client.table("jobs").delete().lt("scraped_at", cutoff_date).execute()
-        
-        # En la respuesta viene la lista de lo que se borró
-        num_deleted = len(response.data) if response.data else 0
-        print(f"✅ Se han eliminado {num_deleted} registros antiguos.")
+        client.rpc("refresh_dashboard_filter_options", {}).execute()
+        print("🔄 Opciones de filtro del dashboard actualizadas.")
     except Exception as e:
-        print(f"❌ Error al intentar purgar datos antiguos: {e}")
+        # El dashboard sigue mostrando las opciones anteriores
+        print(f"⚠️ No se pudo refrescar dashboard_filter_options_mv: {e}")
 
 # ---------------------------------------------------
 # 🚀 PROCESO PRINCIPAL (MAIN)
 # ---------------------------------------------------
-def run_etl():
-    delete_old_jobs(days=30)  # Opcional: borrar datos más viejos a 30 días
+def clean_jobs(df_jobs, df_skills, engine="pandas"):
+    """Limpieza (pandas o DuckDB) + asignación de casi-duplicados y empresas"""
+    print("\n🧹 Iniciando limpieza de datos...")
+    # Se limpia una copia: el crudo se conserva para calcular el delta
+    if engine == "duckdb":
+        # Import diferido: DuckDB es una dependencia opcional. Solo la limpieza:
+        # los agregados de queries.py los mide benchmarks/bench_duckdb.py
+        from duck_engine import run_duckdb_etl
+        df_jobs_clean, _ = run_duckdb_etl(df_jobs, df_skills, aggregates=False)
+    else:
+        df_jobs_clean = clean_job_data(df_jobs.copy())
+
+    # Keywords de cada descripción (el dashboard rpc las suma sin escanear texto)
+    df_jobs_clean = assign_keywords(df_jobs_clean)
+
+    # Agrupar la misma vacante publicada en varias plataformas (el índice se
+    # guarda en Storage y pierde los job_id que ya no están en la tabla)
+    df_jobs_clean = assign_clusters(df_jobs_clean, client=client, keep=set(df_jobs["job_id"]))
+
+    # Variantes del nombre de empresa -> company_id
+    return assign_companies(df_jobs_clean, client)
+
+def run_etl(full_write=False, source="supabase", engine="pandas", fresh=False):
+    """
+    ETL por etapas con checkpoint: sweep → purge → extract → clean → upload_jobs →
+    upload_skills → categorize_skills. Si una corrida falla, la siguiente
+    retoma donde quedó.
+    """
+    delta = not full_write
+    ckpt = RunCheckpoint({"source": source, "engine": engine, "full_write": full_write}, fresh=fresh)
+
+    # 0. Dar de baja las vacantes no vistas en los últimos crawls y archivar
+    #    las que llevan más de 30 días inactivas
+    run_maintenance(ckpt.run)
+
     # 1. Cargar
-    df_jobs, df_skills = load_raw_data()
+    raw = ckpt.run("extract", lambda: dict(zip(("jobs", "skills"), load_raw_data(source))))
+    df_jobs, df_skills = raw["jobs"], raw["skills"]
     
     if df_jobs.empty:
         print("⚠️ No hay datos en la tabla 'jobs' para procesar.")
+        ckpt.discard()
         return
 
     # 2. Limpiar (Usando la lógica de cleaning.py)
-    print("\n🧹 Iniciando limpieza de datos...")
-    df_jobs_clean = clean_job_data(df_jobs)
-    
-    # 3. Subir
-    upload_data(df_jobs_clean, df_skills)
+    df_jobs_clean = ckpt.run("clean", lambda: {"jobs": clean_jobs(df_jobs, df_skills, engine)})["jobs"]
     
-    print("\n🎯 Proceso ETL finalizado con éxito.")
+    # 3. Subir (retoma desde el último bloque confirmado)
+    ckpt.upload("upload_jobs", lambda skip, on_chunk: upload_jobs(
+        df_jobs_clean, df_jobs if delta else None, skip, on_chunk))
+
+    if delta:
+        # El ETL no modifica la tabla skills
+        print(f"⏭️ {len(df_skills)} skills sin cambios, se omiten.")
+        ckpt.upload("upload_skills", lambda skip, on_chunk: None)
+    else:
+        ckpt.upload("upload_skills", lambda skip, on_chunk: upload_skills(
+            df_skills, df_jobs_clean, skip, on_chunk))
+
+    # 4. Categorizar en bloque las skills que el scraper dejó en "Pending ETL"
+    ckpt.run("categorize_skills", categorize_skills)
+    refresh_dashboard_views()
+
+    # 5. Mantener el snapshot alineado con lo que quedó en la base
+    #    (solo si todos los bloques llegaron; si no, el snapshot tendría
+    #    filas limpias que la base no tiene)
+    if source == "snapshot":
+        if ckpt.is_done("upload_jobs"):
+            SnapshotStore().write("jobs", df_jobs_clean)
+        else:
+            print("⚠️ Hubo bloques de jobs sin subir: el snapshot no se actualiza en esta corrida.")
+
+    ckpt.print_summary()
+    if ckpt.complete():
+        print("\n🎯 Proceso ETL finalizado con éxito.")
+
+def run_etl_streaming(full_write=False):
+    """
+    Misma lógica que run_etl pero con memoria acotada (tablas grandes).
+    No usa checkpoints: cada paso es idempotente y se repite entero en la
+    próxima corrida. Si el sweep o la purga fallan el proceso termina con
+    código 1 para que el workflow lo marque como fallido.
+    """
+    failed = run_maintenance()
+    run_streaming_etl(client, delta=not full_write)
+    categorize_skills()
+    refresh_dashboard_views()
+    if failed:
+        print(f"\n⚠️ Proceso ETL (streaming) terminado con etapas fallidas: {', '.join(failed)}.")
+        sys.exit(1)
+    print("\n🎯 Proceso ETL (streaming) finalizado con éxito.")
 
 if __name__ == "__main__":
-    run_etl()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ETL de vacantes en Supabase")
+    parser.add_argument("--stream", action="store_true",
+                        help="Procesa la tabla por páginas con memoria constante")
+    parser.add_argument("--full-write", action="store_true",
+                        help="Reescribe todas las columnas en lugar de solo las modificadas")
+    parser.add_argument("--source", choices=["supabase", "snapshot"], default="supabase",
+                        help="Origen de los datos en modo batch (snapshot = Parquet local)")
+    parser.add_argument("--engine", choices=["pandas", "duckdb"], default="pandas",
+                        help="Motor de limpieza en modo batch (duckdb = SQL vectorizado local)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignora el checkpoint de una corrida anterior incompleta")
+    args = parser.parse_args()
+
+    if args.stream:
+        run_etl_streaming(full_write=args.full_write)
+    else:
+        run_etl(full_write=args.full_write, source=args.source, engine=args.engine, fresh=args.fresh)
\ No newline at end of file
@@ -1,39 +1,193 @@
 from supabase import create_client
 import os
+import argparse
 from datetime import datetime
-from collections import Counter
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from snapshot import SnapshotStore
 
 # --- Supabase config ---
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
-def run_trends():
-    print("📈 Updating trends...")
+# ---------------------------------------------------
+# CONTADORES DIARIOS (tabla trend_daily, ver database/schema.py)
+# ---------------------------------------------------
+# Grano: (día, skill, país, sector, seniority). La skill "*" cuenta la vacante
+# una sola vez, así los totales por país/sector no se inflan con varias skills.
+# jobs_seen cuenta cada vacante una vez, el día de first_seen_at (un re-scrape
+# no la vuelve a sumar); jobs_expired, el día de expired_at.
+DIMENSIONS = ["day", "skill_name", "country", "sector", "seniority_level"]
+ALL_SKILLS = "*"
+DEFAULTS = {"country": "Latam/Remote", "sector": "Other", "seniority_level": "Mid"}
+PAGE_SIZE = 1000
+
+STATE_SEEN = "trends.seen_until"
+# Antes era la fecha de archivado (archivo local); expired_at se lee de la base
+STATE_EXPIRED = "trends.expired_at_until"
+
+
+# ---------------------------------------------------
+# 📌 WATERMARKS (tabla etl_state)
+# ---------------------------------------------------
+def get_state(key):
+    rows = supabase.table("etl_state").select("value").eq("key", key).execute().data
+    return rows[0]["value"] if rows else None
+
+def set_state(key, value):
+    supabase.table("etl_state").upsert(
+        {"key": key, "value": value, "updated_at": datetime.utcnow().isoformat()},
+        on_conflict="key",
+    ).execute()
+
+
+# ---------------------------------------------------
+# 📥 DELTA DE VACANTES
+# ---------------------------------------------------
+def _fetch_jobs(time_col, since, expired=False):
+    """Vacantes con `time_col` > since (paginadas), con la lista de skills de cada una"""
+    columns = ["job_id", time_col, "country", "sector", "seniority_level"]
+    rows, offset = [], 0
+    while True:
+        query = (
+            supabase.table("jobs").select(", ".join(columns) + ", skills(skill_name)")
+            .order(time_col).order("job_id")
+        )
+        if since:
+            query = query.gt(time_col, since)
+        if expired:
+            query = query.eq("is_active", False)
+        page = query.range(offset, offset + PAGE_SIZE - 1).execute().data
+        rows.extend(page)
+        offset += len(page)
+        if len(page) < PAGE_SIZE:
+            break
+    df = pd.DataFrame(rows, columns=columns + ["skills"])
+    df["skills"] = df["skills"].map(
+        lambda items: [s["skill_name"] for s in items] if isinstance(items, list) else []
+    )
+    return df
+
+
+def fetch_new_jobs(since, source="supabase"):
+    """
+    Vacantes vistas por primera vez (first_seen_at > since), con sus skills.
+    El snapshot solo guarda vacantes activas (SnapshotStore.reconcile): las
+    que ya vencieron se piden a la base, así ambos orígenes cuentan lo mismo.
+    """
+    columns = ["job_id", "first_seen_at", "country", "sector", "seniority_level"]
+
+    if source == "snapshot":
+        store = SnapshotStore()
+        store.refresh(supabase)
+        # first_seen_at <= scraped_at: el filtro por partición de scraped_at sigue valiendo
+        expr = None
+        if since:
+            since_ts = pd.Timestamp(since)
+            # El snapshot guarda timestamps UTC sin zona
+            if since_ts.tz is not None:
+                since_ts = since_ts.tz_convert("UTC").tz_localize(None)
+            expr = ds.field("first_seen_at") > since_ts
+        df_jobs = store.read("jobs", columns=columns, since=since, filter=expr)
+        df_skills = store.read("skills", columns=["job_id", "skill_name"],
+                               filter=ds.field("job_id").isin(df_jobs["job_id"].tolist()))
+        skills_by_job = df_skills.groupby("job_id")["skill_name"].agg(list)
+        df_jobs["skills"] = df_jobs["job_id"].map(
+            lambda job_id: skills_by_job.get(job_id, []))
+        expired = _fetch_jobs("first_seen_at", since, expired=True)
+        expired = expired[~expired["job_id"].isin(df_jobs["job_id"])]
+        expired["first_seen_at"] = pd.to_datetime(
+            expired["first_seen_at"], format="ISO8601", utc=True).dt.tz_localize(None)
+        return pd.concat([df_jobs, expired], ignore_index=True) if not expired.empty else df_jobs
+
+    return _fetch_jobs("first_seen_at", since)
+
+
+def fetch_expired_jobs(since):
+    """
+    Vacantes dadas de baja por el sweep (expired_at > since). Se leen de la
+    base: la retención las borra recién 30 días después de expirar, mucho
+    después de la corrida diaria de tendencias.
+    """
+    return _fetch_jobs("expired_at", since, expired=True)
+
+
+# ---------------------------------------------------
+# 🧮 ROLLUP
+# ---------------------------------------------------
+def rollup(df, time_col, value_col):
+    """Cuenta vacantes por (día, skill, país, sector, seniority)"""
+    if df.empty:
+        return pd.DataFrame(columns=DIMENSIONS + [value_col])
+    df = df.fillna(DEFAULTS).copy()
+    df["day"] = pd.to_datetime(df[time_col], format="ISO8601").dt.strftime("%Y-%m-%d")
+    df["skill_name"] = df["skills"].map(
+        lambda s: [ALL_SKILLS] + list(s) if isinstance(s, list) else [ALL_SKILLS]
+    )
+    exploded = df.explode("skill_name")
+    return exploded.groupby(DIMENSIONS).size().reset_index(name=value_col)
+
+
+def increment_counters(delta):
+    """
+    Suma el delta en la base (trend_daily_increment: INSERT ... ON CONFLICT
+    DO UPDATE SET jobs_seen = trend_daily.jobs_seen + EXCLUDED.jobs_seen).
+    Va en una sola llamada, que es una sola transacción: si falla no queda
+    nada sumado y el watermark no avanza.
+    """
+    delta = delta.fillna({"jobs_seen": 0, "jobs_expired": 0})
+    delta = delta.groupby(DIMENSIONS, as_index=False)[["jobs_seen", "jobs_expired"]].sum()
+    delta[["jobs_seen", "jobs_expired"]] = delta[["jobs_seen", "jobs_expired"]].astype(int)
+    supabase.rpc("trend_daily_increment", {"p_rows": delta.to_dict(orient="records")}).execute()
+    return delta
+
+
+def top_n(counters, n=50, by=None, value_col="jobs_seen"):
+    """Top-N skills a partir de los contadores (opcionalmente por otra dimensión)"""
+    counters = counters[counters["skill_name"] != ALL_SKILLS]
+    keys = ([by] if by else []) + ["skill_name"]
+    totals = counters.groupby(keys, as_index=False)[value_col].sum()
+    totals = totals.sort_values(keys[:-1] + [value_col], ascending=[True] * (len(keys) - 1) + [False])
+    return totals.groupby(by).head(n) if by else totals.head(n)
+
+
+# ---------------------------------------------------
+# 🚀 PROCESO PRINCIPAL
+# ---------------------------------------------------
+def run_trends(source="supabase"):
+    print("📈 Updating trends (incremental)...")
+    seen_until = get_state(STATE_SEEN)
+    expired_until = get_state(STATE_EXPIRED)
 
-    jobs = supabase.table("jobs").select("*").execute().data
+    new_jobs = fetch_new_jobs(seen_until, source)
+    expired_jobs = fetch_expired_jobs(expired_until)
+    print(f"   Δ {len(new_jobs)} vacantes nuevas, {len(expired_jobs)} expiradas desde la última corrida")
 
-    # --- Top skills ---
-    all_skills = []
-    for job in jobs:
-        if job.get("skills"):
-            all_skills.extend(job["skills"])
+    delta = pd.concat([
+        rollup(new_jobs, "first_seen_at", "jobs_seen"),
+        rollup(expired_jobs, "expired_at", "jobs_expired"),
+    ], ignore_index=True)
 
-    skill_counts = Counter(all_skills).most_common(50)
+    if delta.empty:
+        print("✨ Trends sin cambios.")
+        return
 
-    # delete old
-    supabase.table("trends").delete().neq("id", -1).execute()
+    counters = increment_counters(delta)
 
-    # insert new
-    for skill, count in skill_counts:
-        supabase.table("trends").insert({
-            "metric": "skills_top",
-            "key": skill,
-            "value": count,
-            "timestamp": datetime.utcnow().isoformat()
-        }).execute()
+    # Los watermarks se guardan recién después de sumar los contadores
+    if not new_jobs.empty:
+        set_state(STATE_SEEN, pd.to_datetime(new_jobs["first_seen_at"], format="ISO8601").max().isoformat())
+    if not expired_jobs.empty:
+        set_state(STATE_EXPIRED, pd.to_datetime(expired_jobs["expired_at"], format="ISO8601").max().isoformat())
 
-    print("✨ Trends updated.")
+    print(f"✨ Trends updated: {len(counters)} contadores en {counters['day'].nunique()} días.")
+    for _, row in top_n(counters, n=5).iterrows():
+        print(f"   • {row['skill_name']}: {row['jobs_seen']}")
 
 if __name__ == "__main__":
-    run_trends()
+    parser = argparse.ArgumentParser(description="Actualiza los contadores diarios de tendencias")
+    parser.add_argument("--source", choices=["supabase", "snapshot"], default="supabase")
+    run_trends(parser.parse_args().source)
@@ -24,3 +24,4 @@ class JobItem(scrapy.Item):
     source_platform = scrapy.Field()
     scraped_at = scrapy.Field()
     skills = scrapy.Field()  # List of extracted skills
+    taxonomy_version = scrapy.Field()  # Hash de TECH_SKILLS + SECTOR_KEYWORDS usado al etiquetar
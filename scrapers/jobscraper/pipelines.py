@@ -5,16 +5,21 @@
 import os
 #import httpx
 import re
+import json
 import hashlib
 from datetime import datetime
+from collections import defaultdict, Counter
 
 
+from scrapy import signals
 from supabase import create_client
 from bs4 import BeautifulSoup
 
 
 from dotenv import load_dotenv
 
+from .taxonomy import TECH_SKILLS
+
 load_dotenv()
 
 
@@ -97,30 +102,8 @@ class CleaningPipeline:
 class SkillExtractionPipeline:
     """Extract technical skills from job descriptions"""
     
-    TECH_SKILLS = [
-        # Programming Languages
-        'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'PHP', 'Go', 'Rust', 'Swift',
-        'Kotlin', 'TypeScript', 'R', 'Scala', 'Perl',
-        
-        # Frameworks & Libraries
-        'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'FastAPI', 
-        'Spring Boot', 'Express.js', 'Next.js', 'React Native', 'Flutter',
-        
-        # Databases
-        'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 
-        'DynamoDB', 'Oracle', 'SQL Server',
-        
-        # Cloud & DevOps
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI',
-        'Terraform', 'Ansible', 'CI/CD',
-        
-        # Data & AI
-        'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Pandas',
-        'NumPy', 'Scikit-learn', 'Power BI', 'Tableau', 'Data Analysis',
-        
-        # Others
-        'Git', 'Linux', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum'
-    ]
+    # Agrupadas por categoría en taxonomy.py (compartido con etl/skill_taxonomy.py)
+    TECH_SKILLS = TECH_SKILLS
     
     def process_item(self, item, spider):
         #description = item.get('description', '') + ' ' + item.get('requirements', '')
@@ -198,6 +181,8 @@ class SectorClassificationPipeline:
     def process_item(self, item, spider):
         if not item.get('sector'):
             item['sector'] = self.classify_sector(item)
+        # Versión de las taxonomías con la que se etiquetó (ver etl/reclassify.py)
+        item['taxonomy_version'] = TAXONOMY_VERSION
         return item
     
     def classify_sector(self, item):
@@ -229,11 +214,41 @@ class SectorClassificationPipeline:
         return 'Other'
 
 
+def compute_taxonomy_version():
+    """Hash corto de TECH_SKILLS + SECTOR_KEYWORDS: cambia al editar cualquiera de las dos"""
+    payload = json.dumps(
+        [SkillExtractionPipeline.TECH_SKILLS, SectorClassificationPipeline.SECTOR_KEYWORDS],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+TAXONOMY_VERSION = compute_taxonomy_version()
+
+# Max share of failed items for a platform to count as fully crawled in a run
+MAX_ERROR_RATIO = float(os.getenv('CRAWL_MAX_ERROR_RATIO', 0.05))
+
+
 class SupabasePipeline:
-    """Store cleaned data in Supabase"""
+    """Store cleaned data in Supabase.
+       Each crawl is recorded in `crawl_runs` and every saved job is stamped
+       with the run id (mark phase of etl/lifecycle.py).
+    """
     
     def __init__(self):
         self.client = None
+        self.run_id = None
+        self.seen = set()
+        self.seen_by_platform = defaultdict(set)
+        self.errors_by_platform = Counter()
+        self.errors = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls()
+        # spider_closed trae el motivo de cierre (finished, shutdown, closespider_*...)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        return pipeline
     
     def open_spider(self, spider):
         """Initialize Supabase connection"""
@@ -252,6 +267,16 @@ class SupabasePipeline:
         )
 
         spider.logger.info("Connected to Supabase ")
+
+        try:
+            res = self.client.table('crawl_runs').insert({
+                'spider': spider.name,
+                'started_at': datetime.now().isoformat(),
+                'status': 'running',
+            }).execute()
+            self.run_id = res.data[0]['run_id']
+        except Exception as e:
+            spider.logger.error(f"Could not register crawl run: {str(e)}")
         
     def process_item(self, item, spider):
         """Insert or update job in database"""
@@ -262,6 +287,11 @@ class SupabasePipeline:
         try:
             # Prepare job data
             job_data = {k: v for k, v in dict(item).items() if k != 'skills'}
+            # Mark: vista en este crawl (reactiva la vacante si había expirado)
+            job_data['last_seen_at'] = item.get('scraped_at')
+            job_data['last_seen_run'] = self.run_id
+            job_data['is_active'] = True
+            job_data['expired_at'] = None
             self.client.table('jobs').upsert(job_data, on_conflict='job_id').execute()
             
             
@@ -273,41 +303,59 @@ class SupabasePipeline:
                     skill_rows.append({
                         "job_id": item["job_id"],
                         "skill_name": s,
-                        "skill_category": "Pending ETL" # Se categorizará en el ETL
+                        "skill_category": "Pending ETL" # Se categoriza en el ETL (etl/skill_taxonomy.py)
                     })
 
+                # DO NOTHING ante duplicados: no devolver a "Pending ETL" skills ya categorizadas
                 self.client.table("skills").upsert(
                     skill_rows,
-                    on_conflict="job_id,skill_name"
+                    on_conflict="job_id,skill_name",
+                    ignore_duplicates=True
                 ).execute()
                 
             
+            self.seen.add(item['job_id'])
+            self.seen_by_platform[item.get('source_platform')].add(item['job_id'])
             spider.logger.info(f"Saved job: {item.get('title')} at {item.get('company_name')}")
             
         except Exception as e:
+            self.errors += 1
+            self.errors_by_platform[item.get('source_platform')] += 1
             spider.logger.error(f"Error saving to Supabase: {str(e)}")
         
         return item
     
-    @staticmethod
-    def categorize_skill(skill):
-        """Categorize skills"""
-        programming = ['Python', 'JavaScript', 'Java', 'C++', 'Ruby', 'PHP', 'Go']
-        frameworks = ['React', 'Angular', 'Django', 'Flask', 'Node.js', 'Spring Boot']
-        databases = ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis']
-        cloud = ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes']
-        
-        if skill in programming:
-            return 'Programming Language'
-        elif skill in frameworks:
-            return 'Framework'
-        elif skill in databases:
-            return 'Database'
-        elif skill in cloud:
-            return 'Cloud/DevOps'
-        else:
-            return 'Other'
-    
     def close_spider(self, spider):
         """Cleanup on spider close"""
         spider.logger.info("Closing Supabase connection")
+
+    def complete_platforms(self):
+        """Platforms with saved jobs whose error ratio is within MAX_ERROR_RATIO"""
+        complete = []
+        for platform, seen in self.seen_by_platform.items():
+            errors = self.errors_by_platform.get(platform, 0)
+            if platform and errors / (len(seen) + errors) <= MAX_ERROR_RATIO:
+                complete.append(platform)
+        return sorted(complete)
+
+    def spider_closed(self, spider, reason):
+        """Close the crawl run; the sweep only counts it for the `platforms` listed
+           (a few failed items still leave a finished run, with its error count)"""
+        if not self.client or self.run_id is None:
+            return
+        platforms = self.complete_platforms() if reason == 'finished' else []
+        status = 'finished' if platforms else 'incomplete'
+        try:
+            self.client.table('crawl_runs').update({
+                'finished_at': datetime.now().isoformat(),
+                'status': status,
+                'finish_reason': reason,
+                'source_platform': platforms[0] if len(platforms) == 1 else None,
+                'platforms': platforms,
+                'jobs_seen': len(self.seen),
+                'errors': self.errors,
+            }).eq('run_id', self.run_id).execute()
+        except Exception as e:
+            spider.logger.error(f"Could not close crawl run: {str(e)}")
+        spider.logger.info(f"Crawl run {self.run_id} {status}: {len(self.seen)} jobs seen, "
+                           f"{self.errors} errors, complete for {platforms or 'no platform'}")
@@ -0,0 +1,35 @@
+# Skill taxonomy shared by the scraper and the ETL
+# =============================================================================
+# Única fuente de verdad: SkillExtractionPipeline (pipelines.py) extrae
+# TECH_SKILLS y etl/skill_taxonomy.py categoriza con SKILL_TAXONOMY.
+# No importa scrapy ni bs4 para poder usarse desde el ETL.
+
+
+SKILL_TAXONOMY = {
+    'Programming Language': [
+        'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'PHP', 'Go', 'Rust', 'Swift',
+        'Kotlin', 'TypeScript', 'R', 'Scala', 'Perl',
+    ],
+    'Framework': [
+        'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'FastAPI',
+        'Spring Boot', 'Express.js', 'Next.js', 'React Native', 'Flutter',
+    ],
+    'Database': [
+        'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra',
+        'DynamoDB', 'Oracle', 'SQL Server',
+    ],
+    'Cloud/DevOps': [
+        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI',
+        'Terraform', 'Ansible', 'CI/CD',
+    ],
+    'Data & AI': [
+        'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Pandas',
+        'NumPy', 'Scikit-learn', 'Power BI', 'Tableau', 'Data Analysis',
+    ],
+    'Tools & Practices': [
+        'Git', 'Linux', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
+    ],
+}
+
+# Lista plana en el mismo orden (también entra en el hash de TAXONOMY_VERSION)
+TECH_SKILLS = [skill for skills in SKILL_TAXONOMY.values() for skill in skills]
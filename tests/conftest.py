@@ -0,0 +1,30 @@
+# tests/conftest.py
+"""
+Los módulos del ETL se importan como en producción (`python etl/x.py`: el
+directorio etl/ en sys.path) y el dashboard desde la raíz del repo. Los que
+crean el cliente de Supabase al importarse reciben el cliente en memoria, y
+los archivos locales (snapshot, archivo, índice de casi-duplicados,
+checkpoints) van a un directorio temporal en vez de data/.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "etl"), os.path.dirname(os.path.abspath(__file__))]
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test")
+DATA_DIR = tempfile.mkdtemp(prefix="latam-tests-")
+os.environ["SNAPSHOT_DIR"] = os.path.join(DATA_DIR, "snapshot")
+os.environ["ARCHIVE_DIR"] = os.path.join(DATA_DIR, "archive")
+os.environ["DEDUPE_INDEX"] = os.path.join(DATA_DIR, "dedupe_index.npz")
+os.environ["ETL_CHECKPOINT_DIR"] = os.path.join(DATA_DIR, "checkpoints")
+for name in ("ARCHIVE_BUCKET", "DEDUPE_BUCKET"):
+    os.environ.pop(name, None)
+
+import supabase  # noqa: E402
+
+from fakes import FakeClient  # noqa: E402
+
+supabase.create_client = lambda *args, **kwargs: FakeClient()
@@ -0,0 +1,254 @@
+# tests/fakes.py
+"""
+Cliente de Supabase en memoria para los tests: cubre el subconjunto de la API
+de PostgREST y de Storage que usa el ETL (filtros, orden, range, upsert,
+update, delete, rpc y buckets). Los selects anidados (`skills(skill_name)`)
+se resuelven por job_id.
+"""
+import copy
+import posixpath
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class Query:
+    def __init__(self, client, table, rows=None):
+        self.client = client
+        self.table = table
+        self.rows = rows        # filas fijas (resultado de una función RPC)
+        self.filters = []
+        self.orders = []
+        self.op = "select"
+        self.payload = None
+        self.columns = "*"
+        self.bounds = None
+        self.max_rows = None
+        self.conflict = []
+        self.count = None
+
+    # ---------- lectura ----------
+    def select(self, columns="*", count=None, head=None):
+        self.columns, self.count = columns, count
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.max_rows = n
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def _filter(self, fn):
+        self.filters.append(fn)
+        return self
+
+    def eq(self, k, v):
+        return self._filter(lambda r: r.get(k) == v)
+
+    def neq(self, k, v):
+        return self._filter(lambda r: r.get(k) != v)
+
+    def gt(self, k, v):
+        return self._filter(lambda r: r.get(k) is not None and str(r.get(k)) > str(v))
+
+    def gte(self, k, v):
+        return self._filter(lambda r: r.get(k) is not None and str(r.get(k)) >= str(v))
+
+    def lt(self, k, v):
+        return self._filter(lambda r: r.get(k) is not None and str(r.get(k)) < str(v))
+
+    def lte(self, k, v):
+        return self._filter(lambda r: r.get(k) is not None and str(r.get(k)) <= str(v))
+
+    def is_(self, k, v):
+        return self._filter(lambda r: r.get(k) is None)
+
+    def in_(self, k, values):
+        values = set(values)
+        return self._filter(lambda r: r.get(k) in values)
+
+    @property
+    def not_(self):
+        query = self
+
+        class Negated:
+            def in_(self, k, values):
+                values = set(values)
+                return query._filter(lambda r: r.get(k) not in values)
+
+            def is_(self, k, v):
+                return query._filter(lambda r: r.get(k) is not None)
+
+        return Negated()
+
+    def or_(self, expr):
+        def match(row):
+            for part in expr.split(","):
+                k, op, v = part.split(".", 2)
+                value = row.get(k)
+                if op == "is" and value is None:
+                    return True
+                if value is None:
+                    continue
+                if (op == "eq" and str(value) == v) or (op == "neq" and str(value) != v) \
+                        or (op == "gt" and str(value) > v) or (op == "lt" and str(value) < v):
+                    return True
+            return False
+        return self._filter(match)
+
+    # ---------- escritura ----------
+    def upsert(self, records, on_conflict="", ignore_duplicates=False, **kwargs):
+        self.op = "upsert"
+        self.payload = records if isinstance(records, list) else [records]
+        self.conflict = on_conflict.split(",")
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def insert(self, records, **kwargs):
+        self.op = "insert"
+        self.payload = records if isinstance(records, list) else [records]
+        return self
+
+    def update(self, values, **kwargs):
+        self.op, self.payload = "update", values
+        return self
+
+    def delete(self, **kwargs):
+        self.op = "delete"
+        return self
+
+    def execute(self):
+        self.client.calls.append((self.table, self.op))
+        rows = self.rows if self.rows is not None else self.client.db.setdefault(self.table, [])
+        if self.client.fail_tables.get(self.table):
+            raise self.client.fail_tables[self.table]
+        if self.op in ("upsert", "insert") and self.client.reject:
+            self.client.reject(self.table, self.payload)  # puede lanzar, como la base
+        if self.op == "upsert":
+            for record in self.payload:
+                key = tuple(record.get(c) for c in self.conflict)
+                existing = next((r for r in rows if tuple(r.get(c) for c in self.conflict) == key), None)
+                if existing is None:
+                    rows.append(copy.deepcopy(record))
+                elif not self.ignore_duplicates:
+                    existing.update(copy.deepcopy(record))
+            return Response([])
+        if self.op == "insert":
+            rows.extend(copy.deepcopy(self.payload))
+            return Response([])
+
+        matched = [r for r in rows if all(f(r) for f in self.filters)]
+        if self.op == "update":
+            for row in matched:
+                row.update(copy.deepcopy(self.payload))
+            return Response([], len(matched))
+        if self.op == "delete":
+            doomed = set(map(id, matched))
+            self.client.db[self.table] = [r for r in rows if id(r) not in doomed]
+            return Response([], len(matched))
+
+        for column, desc in reversed(self.orders):
+            matched = sorted(matched, key=lambda r: (r.get(column) is None, str(r.get(column))), reverse=desc)
+        total = len(matched)
+        if self.bounds:
+            matched = matched[self.bounds[0]:self.bounds[1] + 1]
+        if self.max_rows is not None:
+            matched = matched[:self.max_rows]
+        out = copy.deepcopy(matched)
+        parts = [c.strip() for c in self.columns.split(",")]
+        columns = [c for c in parts if "(" not in c and c != "*"]
+        nested = [c for c in parts if "(" in c]
+        if columns:
+            out = [{c: r.get(c) for c in columns} for r in out]
+        for spec in nested:
+            child, fields = spec[:-1].split("(")
+            fields = [f.strip() for f in fields.split(",")]
+            for row, source in zip(out, matched):
+                row[child] = [{f: c.get(f) for f in fields}
+                              for c in self.client.db.get(child, []) if c.get("job_id") == source.get("job_id")]
+        return Response(out, total if self.count else None)
+
+
+class RPC:
+    def __init__(self, client, name, params):
+        self.client, self.name, self.params = client, name, params
+
+    def execute(self):
+        self.client.rpc_calls.append((self.name, self.params))
+        handler = self.client.rpc_handlers.get(self.name)
+        return Response(handler(self.params) if handler else None)
+
+    def select(self, columns="*"):
+        """Funciones que devuelven SETOF: filtros y orden sobre su resultado"""
+        self.client.rpc_calls.append((self.name, self.params))
+        handler = self.client.rpc_handlers.get(self.name)
+        return Query(self.client, self.name, rows=handler(self.params) if handler else []).select(columns)
+
+
+class Bucket:
+    def __init__(self, storage, files):
+        self.storage = storage
+        self.files = files
+
+    def upload(self, path, data, file_options=None):
+        if self.storage.fail:
+            raise RuntimeError("storage no disponible")
+        self.files[path] = bytes(data)
+
+    def download(self, path):
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return self.files[path]
+
+    def list(self, path=None, options=None):
+        """Hijos directos de `path` (carpetas con id None), paginados como Storage"""
+        options = options or {}
+        prefix = (path or "").strip("/")
+        children = {}
+        for name in self.files:
+            if prefix and not name.startswith(prefix + "/"):
+                continue
+            rest = name[len(prefix) + 1:] if prefix else name
+            head, _, tail = rest.partition("/")
+            children[head] = None if tail else posixpath.join(prefix, head)
+        entries = [{"name": name, "id": None if full is None else full}
+                   for name, full in sorted(children.items())]
+        offset, limit = options.get("offset", 0), options.get("limit", 100)
+        return entries[offset:offset + limit]
+
+
+class Storage:
+    def __init__(self):
+        self.buckets = {}
+        self.fail = False
+
+    def from_(self, bucket):
+        return Bucket(self, self.buckets.setdefault(bucket, {}))
+
+
+class FakeClient:
+    """Tablas como listas de dicts en `db`; registra cada llamada en `calls`"""
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else {}
+        self.calls = []
+        self.rpc_calls = []
+        self.rpc_handlers = {}
+        self.fail_tables = {}
+        self.reject = None
+        self.storage = Storage()
+
+    def table(self, name):
+        return Query(self, name)
+
+    def rpc(self, name, params=None):
+        return RPC(self, name, params)
@@ -0,0 +1,27 @@
+# tests/test_aggregates.py
+import pandas as pd
+
+from dashboard.aggregates import compute_aggregates
+from dashboard.index import FilterIndex
+
+
+def test_skill_aggregates_from_long_form():
+    jobs = pd.DataFrame({
+        "job_id": ["a", "b", "c"],
+        "scraped_at": pd.to_datetime(["2026-10-17", "2026-10-18", "2026-10-19"]),
+        "country": "Perú", "source_platform": "getonboard",
+        "seniority_level": ["Senior", "Junior", "Senior"],
+    })
+    skills = pd.DataFrame({"job_id": ["a", "a", "b", "c", "c"],
+                           "skill_name": ["Python", "SQL", "Python", "Python", "Docker"]})
+    long = FilterIndex(jobs, skills).skills(slice(0, 3))
+
+    cube = {"sector": pd.DataFrame(columns=["jobs", "country", "with_description", "with_salary"]),
+            "company": pd.DataFrame(columns=["company"])}
+    aggregates = compute_aggregates(cube, skills=long, names=["top_skills"])
+
+    assert aggregates["top_skills"].to_dict("records")[0] == {"skill_name": "Python", "count": 3}
+    by_level = aggregates["skills_seniority"].set_index(["seniority_level", "skill_name"])["count"]
+    assert by_level.to_dict() == {("Junior", "Python"): 1, ("Senior", "Python"): 2,
+                                  ("Senior", "Docker"): 1, ("Senior", "SQL"): 1}
+    assert aggregates["top_skills"]["skill_name"].dtype != "category"
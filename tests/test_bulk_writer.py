@@ -0,0 +1,101 @@
+# tests/test_bulk_writer.py
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from postgrest.exceptions import APIError
+
+import bulk_writer
+from bulk_writer import upsert_in_chunks, iter_record_chunks, is_transient
+from fakes import FakeClient
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(bulk_writer, "BACKOFF_BASE", 0)
+
+
+def _frame(n):
+    return pd.DataFrame({"job_id": [f"j{i}" for i in range(n)], "title": "Dev"})
+
+
+def test_records_are_json_ready():
+    df = pd.DataFrame({
+        "job_id": ["a", "b"],
+        "scraped_at": pd.to_datetime(["2026-10-01 10:00", None]),
+        "salary_min": [1000.0, np.nan],
+        "description_keywords": [np.array(["python"]), None],
+    })
+    (records,) = list(iter_record_chunks(df, chunk_size=10))
+    assert records[0] == {"job_id": "a", "scraped_at": "2026-10-01T10:00:00",
+                          "salary_min": 1000.0, "description_keywords": ["python"]}
+    assert records[1]["scraped_at"] is None and records[1]["salary_min"] is None
+
+
+def test_upsert_writes_every_chunk():
+    client = FakeClient({"jobs": []})
+    report = upsert_in_chunks(client, "jobs", _frame(25), on_conflict="job_id", chunk_size=10,
+                              key="job_id", verbose=False)
+    assert [c["rows"] for c in report["chunks"]] == [10, 10, 5]
+    assert report["rows_ok"] == 25 and report["failed"] == []
+    assert len(client.db["jobs"]) == 25
+
+
+def test_bisect_isolates_rejected_rows():
+    client = FakeClient({"jobs": []})
+
+    def reject(table, records):
+        if any(r["job_id"] in ("j3", "j7") for r in records):
+            raise APIError({"code": "22001", "message": "value too long"})
+    client.reject = reject
+
+    report = upsert_in_chunks(client, "jobs", _frame(10), on_conflict="job_id", chunk_size=10,
+                              key="job_id", verbose=False)
+    assert sorted(f["key"] for f in report["failed"]) == ["j3", "j7"]
+    assert report["rows_ok"] == 8
+    assert sorted(r["job_id"] for r in client.db["jobs"]) == [f"j{i}" for i in range(10) if i not in (3, 7)]
+
+
+def test_transient_errors_are_retried_not_bisected():
+    client = FakeClient({"jobs": []})
+    attempts = []
+
+    def flaky(table, records):
+        attempts.append(len(records))
+        if len(attempts) <= 2:
+            raise httpx.ReadTimeout("timeout")
+    client.reject = flaky
+
+    report = upsert_in_chunks(client, "jobs", _frame(4), on_conflict="job_id", chunk_size=4,
+                              key="job_id", verbose=False)
+    assert attempts == [4, 4, 4]
+    assert report["retries"] == 2 and report["rows_ok"] == 4
+
+
+def test_exhausted_transient_error_fails_whole_chunk(monkeypatch):
+    client = FakeClient({"jobs": []})
+
+    def down(table, records):
+        raise APIError({"code": "503", "message": "unavailable"})
+    client.reject = down
+
+    report = upsert_in_chunks(client, "jobs", _frame(4), on_conflict="job_id", chunk_size=4,
+                              key="job_id", max_retries=1, verbose=False)
+    assert len(report["failed"]) == 4
+    assert len(client.calls) == 2  # 1 intento + 1 reintento, sin bisección
+
+
+def test_skip_chunks_and_on_chunk():
+    client = FakeClient({"jobs": []})
+    confirmed = []
+    upsert_in_chunks(client, "jobs", _frame(30), on_conflict="job_id", chunk_size=10,
+                     skip_chunks={1}, on_chunk=lambda res: confirmed.append(res["chunk"]), verbose=False)
+    assert sorted(confirmed) == [0, 2]
+    assert len(client.db["jobs"]) == 20
+
+
+def test_is_transient():
+    assert is_transient(httpx.ConnectError("down"))
+    assert is_transient(APIError({"code": "57014", "message": "statement timeout"}))
+    assert not is_transient(APIError({"code": "23505", "message": "duplicate key"}))
+    assert not is_transient(ValueError("bad"))
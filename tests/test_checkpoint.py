@@ -0,0 +1,88 @@
+# tests/test_checkpoint.py
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from bulk_writer import upsert_in_chunks
+from checkpoint import RunCheckpoint, STAGES
+from fakes import FakeClient
+
+PARAMS = {"source": "supabase", "engine": "pandas", "full_write": False}
+
+
+def _frame(n):
+    return pd.DataFrame({"job_id": [f"j{i}" for i in range(n)], "title": "Dev"})
+
+
+def test_resume_skips_completed_stages(tmp_path):
+    calls = []
+    ckpt = RunCheckpoint(PARAMS, root=str(tmp_path))
+    ckpt.run("extract", lambda: calls.append("extract") or {"jobs": _frame(3)})
+    with pytest.raises(RuntimeError):
+        ckpt.run("clean", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert ckpt.manifest["stages"]["clean"]["status"] == "failed"
+
+    resumed = RunCheckpoint(PARAMS, root=str(tmp_path))
+    assert resumed.manifest["run_id"] == ckpt.manifest["run_id"]
+    jobs = resumed.run("extract", lambda: calls.append("extract again") or {"jobs": _frame(1)})["jobs"]
+    assert calls == ["extract"] and len(jobs) == 3
+    resumed.run("clean", lambda: {"jobs": jobs})
+    assert resumed.manifest["stages"]["clean"]["attempts"] == 2
+
+
+def test_altered_output_invalidates_stage(tmp_path):
+    ckpt = RunCheckpoint(PARAMS, root=str(tmp_path))
+    ckpt.run("extract", lambda: {"jobs": _frame(3)})
+    _frame(5).to_parquet(os.path.join(ckpt.run_dir, "extract", "jobs.parquet"), index=False)
+    assert not RunCheckpoint(PARAMS, root=str(tmp_path)).is_done("extract")
+
+
+def test_other_params_start_a_new_run(tmp_path):
+    RunCheckpoint(PARAMS, root=str(tmp_path)).run("extract", lambda: {"jobs": _frame(3)})
+    ckpt = RunCheckpoint(dict(PARAMS, full_write=True), root=str(tmp_path))
+    assert ckpt.manifest["stages"] == {}
+    assert not os.path.exists(os.path.join(ckpt.run_dir, "extract"))
+
+
+def test_upload_resends_only_unconfirmed_chunks(tmp_path):
+    client = FakeClient({"jobs": []})
+    sent, broken = [], {"j25"}
+
+    def reject(table, records):
+        sent.append(records[0]["job_id"])
+        if broken & {r["job_id"] for r in records}:
+            raise ValueError("fila inválida")
+    client.reject = reject
+
+    def upload(skip, on_chunk):
+        return upsert_in_chunks(client, "jobs", _frame(30), on_conflict="job_id", chunk_size=10, max_workers=1,
+                                key="job_id", skip_chunks=skip, on_chunk=on_chunk, verbose=False)
+
+    ckpt = RunCheckpoint(PARAMS, root=str(tmp_path))
+    ckpt.upload("upload_jobs", upload)
+    assert ckpt.manifest["stages"]["upload_jobs"]["status"] == "partial"
+
+    assert len(client.db["jobs"]) == 29
+
+    sent.clear()
+    broken.clear()
+    resumed = RunCheckpoint(PARAMS, root=str(tmp_path))
+    resumed.upload("upload_jobs", upload)
+    assert sent == ["j20"]
+    assert resumed.is_done("upload_jobs")
+    assert len(client.db["jobs"]) == 30
+
+
+def test_complete_keeps_manifest_and_frees_outputs(tmp_path):
+    ckpt = RunCheckpoint(PARAMS, root=str(tmp_path))
+    for stage in STAGES[:-1]:
+        ckpt.run(stage, lambda: None)
+    assert not ckpt.complete()
+
+    ckpt.run(STAGES[-1], lambda: None)
+    assert ckpt.complete()
+    assert not os.path.exists(ckpt.run_dir)
+    with open(tmp_path / "last_manifest.json") as f:
+        assert set(json.load(f)["stages"]) == set(STAGES)
@@ -0,0 +1,66 @@
+# tests/test_companies.py
+import pytest
+
+import companies
+from companies import CompanyResolver, normalize_company, assign_companies
+from fakes import FakeClient
+
+import pandas as pd
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Globant S.A.", "globant"),
+    ("GLOBANT", "globant"),
+    ("Acerca de Belcorp S.A.C.", "belcorp"),
+    ("Telefónica del Perú S.A.A.", "telefonica del peru"),
+    ("Femsa S.A. de C.V.", "femsa"),
+    ("Acme, Co.", "acme"),
+    ("Banco Sa", "banco sa"),
+    ("Spa Zen", "spa zen"),
+    ("Empresa no especificada", None),
+    ("Confidencial", None),
+    (None, None),
+])
+def test_normalize_company(name, key):
+    assert normalize_company(name) == key
+
+
+def test_resolve_groups_variants_and_keeps_most_frequent_spelling():
+    resolver = CompanyResolver()
+    names = ["Globant", "Globant", "GLOBANT S.A.", "Globant, SA", "Mercado Libre", "Jobs"]
+    ids = resolver.resolve(names)
+    assert ids[:4] == ["globant"] * 4
+    assert ids[5] is None
+    assert resolver.new_companies["globant"] == "Globant"
+    assert set(resolver.new_aliases) == {"globant", "mercado libre"}
+
+
+def test_resolve_joins_near_duplicates():
+    resolver = CompanyResolver()
+    ids = resolver.resolve(["Mercado Libre"] * 2 + ["MercadoLibre"])
+    assert ids == ["mercado libre"] * 3
+
+
+def test_match_finds_candidate_beyond_block_cap(monkeypatch):
+    monkeypatch.setattr(companies, "MAX_BLOCK", 2)
+    resolver = CompanyResolver()
+    # Bloques de prefijo y fonético llenos de empresas de largo distinto;
+    # la que corresponde llega última
+    for name in ("mercado libros y mas", "mercado libertad", "mercado liberal del sur",
+                 "mercadolibertadores", "mercado libanes centro"):
+        resolver._add_company(name)
+    resolver._add_company("mercadolibre")
+    assert resolver._match("mercado libre") == "mercadolibre"
+
+
+def test_assign_companies_flushes_mapping_once():
+    client = FakeClient({"companies": [], "company_aliases": []})
+    df = pd.DataFrame({"company_name": ["Globant", "GLOBANT S.A.", "Rappi"]})
+    assign_companies(df, client, verbose=False)
+    assert df["company_id"].tolist() == ["globant", "globant", "rappi"]
+    assert {r["company_id"] for r in client.db["companies"]} == {"globant", "rappi"}
+
+    # Segunda corrida: el mapeo ya está en la base, no se sube nada nuevo
+    resolver = CompanyResolver.load(client)
+    resolver.resolve(["Globant S.A."])
+    assert resolver.new_aliases == {} and resolver.new_companies == {}
@@ -0,0 +1,67 @@
+# tests/test_cube.py
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.aggregates import compute_aggregates
+from dashboard.cube import Cube
+from dashboard.index import FilterIndex
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _frame(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "job_id": [f"j{i}" for i in range(n)],
+        "scraped_at": pd.Timestamp(NOW) - pd.to_timedelta(rng.integers(0, 40 * 24, n), unit="h"),
+        "country": rng.choice(["Perú", "Chile", "México"], n),
+        "seniority_level": rng.choice(np.array(["Junior", "Senior", None], dtype=object), n),
+        "source_platform": rng.choice(["getonboard", "computrabajo"], n),
+        "sector": rng.choice(["Fintech", "EdTech", "Other"], n),
+        "company": rng.choice(["Acme", "Globant", "Rappi"], n),
+        "has_description": rng.random(n) < 0.8,
+        "has_salary": rng.random(n) < 0.3,
+        "has_requirements": rng.random(n) < 0.5,
+        "has_location": rng.random(n) < 0.9,
+        "data_quality_score": rng.choice([0, 50, 100], n),
+    }).sort_values("scraped_at", kind="stable").reset_index(drop=True)
+    for col in ("country", "seniority_level", "source_platform", "sector", "company"):
+        df[col] = df[col].astype("category")
+    return df
+
+
+@pytest.mark.parametrize("filters", [
+    {"days": 30, "countries": ["Perú", "Chile", "México"], "seniority": ["Junior", "Senior"],
+     "platforms": ["getonboard", "computrabajo"]},
+    {"days": 7, "countries": ["Chile"], "seniority": ["Senior"], "platforms": ["getonboard", "computrabajo"]},
+])
+def test_cube_matches_row_group_bys(filters):
+    df = _frame()
+    rows = FilterIndex(df).select(filters, NOW)
+    aggregates = compute_aggregates(Cube(df).select(filters, NOW))
+
+    assert aggregates["metrics"]["jobs"] == len(rows)
+    assert aggregates["metrics"]["with_salary"] == int(rows["has_salary"].sum())
+    assert aggregates["metrics"]["companies"] == rows["company"].nunique()
+    for name, col in (("sector", "sector"), ("country", "country"), ("seniority", "seniority_level")):
+        expected = rows[col].value_counts()
+        expected = expected[expected > 0]
+        got = aggregates[name].set_index(col)["count"]
+        assert got.to_dict() == {str(k): v for k, v in expected.items()}
+    timeline = rows.groupby(rows["scraped_at"].dt.date).size()
+    assert aggregates["timeline"].set_index("fecha")["count"].to_dict() == timeline.to_dict()
+    quality = aggregates["quality"].set_index("platform")
+    for platform, group in rows.groupby("source_platform", observed=True):
+        assert quality.loc[platform, "jobs"] == len(group)
+        assert quality.loc[platform, "quality_score"] == pytest.approx(group["data_quality_score"].mean())
+
+
+def test_rollups_are_smaller_than_the_full_grain():
+    cube = Cube(_frame())
+    assert int(cube.cells["jobs"].sum()) == 400
+    assert all(len(index.df) <= len(cube.cells) for index in cube.rollups.values())
+    assert list(cube.rollups["company"].df.columns[:5]) == ["day", "country", "seniority_level",
+                                                           "source_platform", "company"]
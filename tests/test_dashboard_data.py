@@ -0,0 +1,143 @@
+# tests/test_dashboard_data.py
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from dashboard import data
+from dashboard.data import load_frame, load_texts, refresh_frame
+from dashboard.keywords import KeywordMatrix
+from etl.snapshot import SnapshotStore
+from fakes import FakeClient
+
+
+def _iso(delta):
+    return (datetime.now() - delta).replace(microsecond=0).isoformat()
+
+
+def _job(i, **extra):
+    row = {
+        "job_id": f"j{i}", "title": "Data Engineer", "company_name": "Acme", "company_id": None,
+        "cluster_id": f"j{i}", "country": None, "seniority_level": "Senior",
+        "source_platform": "getonboard", "sector": "Fintech", "salary_range": None,
+        "location": "Lima", "scraped_at": _iso(timedelta(hours=5)),
+        "updated_at": _iso(timedelta(hours=5)), "data_quality_score": 60, "is_active": True,
+        "has_description": True, "has_salary": False, "has_requirements": True, "has_location": True,
+    }
+    row.update(extra)
+    return row
+
+
+def _enrich(rows, job_id, **values):
+    """Lo que hace una escritura del ETL: el trigger mueve updated_at"""
+    row = next(r for r in rows if r["job_id"] == job_id)
+    row.update(values, updated_at=_iso(timedelta(0)))
+
+
+def test_supabase_refresh_picks_up_etl_enrichment():
+    client = FakeClient({"jobs": [_job(i) for i in range(3)], "skills": []})
+    df, skills = load_frame(client=client)
+    assert (df["country"] == "Latam/Remote").all()
+
+    _enrich(client.db["jobs"], "j1", country="Peru")
+    merged, _ = refresh_frame(df, skills, client=client)
+
+    assert merged.attrs["delta_rows"] == 1
+    assert merged.set_index("job_id").loc["j1", "country"] == "Peru"
+    assert merged.attrs["watermark"] > df.attrs["watermark"]
+
+
+def test_supabase_refresh_without_writes_keeps_frame():
+    client = FakeClient({"jobs": [_job(i) for i in range(3)], "skills": []})
+    df, skills = load_frame(client=client)
+    assert refresh_frame(df, skills, client=client)[0] is df
+
+
+def test_supabase_refresh_drops_expired_jobs():
+    client = FakeClient({"jobs": [_job(i) for i in range(3)], "skills": []})
+    df, skills = load_frame(client=client)
+    _enrich(client.db["jobs"], "j2", is_active=False)
+    merged, _ = refresh_frame(df, skills, client=client)
+    assert sorted(merged["job_id"]) == ["j0", "j1"]
+
+
+def test_snapshot_refresh_picks_up_etl_enrichment(tmp_path):
+    client = FakeClient({"jobs": [_job(i) for i in range(3)], "skills": []})
+    store = SnapshotStore(str(tmp_path))
+    store.refresh(client)
+    df, skills = load_frame(snapshot_root=str(tmp_path))
+
+    _enrich(client.db["jobs"], "j0", seniority_level="Lead")
+    store.refresh(client)
+    assert store._load_state()["jobs"]["last_delta_rows"] == 1
+    merged, _ = refresh_frame(df, skills, snapshot_root=str(tmp_path))
+
+    assert merged.attrs["delta_rows"] == 1
+    assert merged.set_index("job_id").loc["j0", "seniority_level"] == "Lead"
+
+
+def test_snapshot_resets_watermark_from_another_column(tmp_path):
+    client = FakeClient({"jobs": [_job(i) for i in range(2)], "skills": []})
+    store = SnapshotStore(str(tmp_path))
+    store._save_state({"jobs": {"watermark": _iso(timedelta(0))}})
+    store.refresh(client, tables=("jobs",), reconcile=False)
+    assert store._load_state()["jobs"]["watermark_col"] == "updated_at"
+    assert len(store.read("jobs")) == 2
+
+
+def test_keyword_matrix_rescans_rewritten_rows():
+    now = pd.Timestamp("2026-10-01 10:00")
+    df = pd.DataFrame({"job_id": ["a", "b"], "updated_at": [now, now], "has_description": [True, True]})
+    texts = pd.DataFrame({"description": ["Python y SQL", "Java"]}, index=["a", "b"])
+    matrix = KeywordMatrix()
+    matrix.update(df, texts)
+    assert matrix.stale(df[["job_id", "updated_at"]]).tolist() == []
+
+    df.loc[0, "updated_at"] = now + pd.Timedelta(minutes=5)
+    assert matrix.stale(df[["job_id", "updated_at"]]).tolist() == ["a"]
+
+    matrix.update(df.iloc[[0]], pd.DataFrame({"description": ["Docker"]}, index=["a"]))
+    counts = matrix.counts(["a", "b"]).set_index("keyword")["count"]
+    assert counts.to_dict() == {"java": 1, "docker": 1}
+    matrix.retain(["b"])
+    assert len(matrix) == 1
+
+
+def _texts_client():
+    return FakeClient({"jobs": [_job(i, description=f"texto {i}", requirements=None) for i in range(5)],
+                       "skills": []})
+
+
+def test_load_texts_from_supabase_in_id_batches(monkeypatch):
+    monkeypatch.setattr(data, "ID_BATCH", 2)
+    client = _texts_client()
+    texts = load_texts(["j4", "j1", "j3", "j9"], client=client)
+
+    assert client.calls.count(("jobs", "select")) == 2
+    assert sorted(texts.index) == ["j1", "j3", "j4"]
+    assert texts.loc["j3", "description"] == "texto 3"
+    assert list(texts.columns) == ["description", "requirements"]
+    assert load_texts([], client=client).empty
+
+
+def test_load_texts_from_snapshot(tmp_path):
+    SnapshotStore(str(tmp_path)).refresh(_texts_client())
+    texts = load_texts({"j0", "j2"}, snapshot_root=str(tmp_path), columns=["description"])
+    assert texts["description"].sort_index().tolist() == ["texto 0", "texto 2"]
+
+
+def test_skills_are_exploded_to_long_form():
+    client = FakeClient({
+        "jobs": [_job(0), _job(1), _job(2, is_active=False)],
+        "skills": [{"job_id": "j0", "skill_name": "Python"}, {"job_id": "j0", "skill_name": "SQL"},
+                   {"job_id": "j1", "skill_name": "Python"}, {"job_id": "j2", "skill_name": "Rust"}],
+    })
+    df, skills = load_frame(client)
+    assert sorted(zip(skills["job_id"], skills["skill_name"])) == [("j0", "Python"), ("j0", "SQL"), ("j1", "Python")]
+    assert skills["skill_name"].dtype == "category"
+
+    client.db["skills"] = [s for s in client.db["skills"] if s["skill_name"] != "SQL"]
+    client.db["skills"].append({"job_id": "j0", "skill_name": "Docker"})
+    _enrich(client.db["jobs"], "j0")
+    _, merged = refresh_frame(df, skills, client)
+    assert sorted(zip(merged["job_id"], merged["skill_name"])) == [("j0", "Docker"), ("j0", "Python"), ("j1", "Python")]
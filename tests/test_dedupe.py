@@ -0,0 +1,68 @@
+# tests/test_dedupe.py
+import numpy as np
+import pandas as pd
+
+import dedupe
+from dedupe import MinHashIndex, assign_clusters, minhash, shingles, document_text
+from fakes import FakeClient
+
+BASE = ("buscamos data engineer senior con experiencia en python sql airflow y aws para "
+        "construir pipelines de datos en una fintech regional con equipo remoto en lima")
+OTHER = ("empresa de retail contrata desarrollador frontend react typescript para su tienda "
+         "online con foco en accesibilidad rendimiento y pruebas automatizadas en bogota")
+
+
+def test_minhash_estimates_jaccard():
+    a, b = minhash(shingles(BASE)), minhash(shingles(BASE + " postula hoy"))
+    assert (a == b).mean() > 0.8
+    assert (a == minhash(shingles(OTHER))).mean() < 0.2
+    assert minhash(shingles("")).shape == (dedupe.NUM_PERM,)
+
+
+def test_document_text_falls_back_without_description():
+    row = {"title": "Dev", "company_name": "Acme", "location": "Lima",
+           "description": dedupe.MISSING_DESCRIPTION}
+    assert document_text(row) == "Dev Acme Lima"
+
+
+def test_index_groups_near_duplicates_under_first_indexed():
+    index = MinHashIndex()
+    index.add(["a", "b"], [BASE, OTHER])
+    stats = index.add(["c", "b"], [BASE.replace("lima", "lima peru"), OTHER])
+    assert stats["new"] == 1 and stats["merged"] == 1
+    assert index.cluster_ids(["a", "b", "c", "zz"]) == ["a", "b", "a", None]
+
+
+def test_prune_hands_root_to_next_member():
+    index = MinHashIndex()
+    index.add(["a", "b", "c"], [BASE, OTHER, BASE + " postula hoy"])
+    assert index.prune({"b", "c"}) == 1
+    assert index.cluster_ids(["b", "c"]) == ["b", "c"]
+    assert index.prune({"b", "c"}) == 0
+
+
+def test_index_round_trip_through_storage(tmp_path):
+    client = FakeClient()
+    index = MinHashIndex()
+    index.add(["a", "b", "c"], [BASE, OTHER, BASE + " postula hoy"])
+    index.save(str(tmp_path / "runner.npz"), client=client, bucket="archive")
+
+    loaded = MinHashIndex.load(str(tmp_path / "other.npz"), client=client, bucket="archive")
+    assert loaded.cluster_ids(["a", "b", "c"]) == ["a", "b", "a"]
+    np.testing.assert_array_equal(loaded.signatures, index.signatures)
+
+
+def test_load_discards_index_with_other_hash_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    index = MinHashIndex()
+    index.add(["a"], [BASE])
+    index.save(path)
+    monkeypatch.setattr(dedupe, "HASH_VERSION", dedupe.HASH_VERSION + 1)
+    assert len(MinHashIndex.load(path)) == 0
+
+
+def test_assign_clusters(tmp_path):
+    df = pd.DataFrame({"job_id": ["a", "b", "c"], "title": ["Data Engineer"] * 3,
+                       "description": [BASE, OTHER, BASE + " postula hoy"]})
+    df = assign_clusters(df, path=str(tmp_path / "index.npz"), verbose=False, keep={"a", "b", "c"})
+    assert df["cluster_id"].tolist() == ["a", "b", "a"]
@@ -0,0 +1,55 @@
+# tests/test_delta.py
+import numpy as np
+import pandas as pd
+
+from delta import changed_mask, iter_delta_chunks, new_delta_stats
+
+
+def _frames():
+    raw = pd.DataFrame({
+        "job_id": ["a", "b", "c", "c"],
+        "title": ["Dev", "QA", "PM", "PM"],
+        "country": [None, "Peru", None, None],
+        "seniority_level": ["Senior", None, None, None],
+        "description_keywords": [np.array(["python"]), None, None, None],
+    })
+    clean = pd.DataFrame({
+        "job_id": ["a", "b", "c"],
+        "title": ["Dev", "QA", "PM"],
+        "country": ["Peru", "Peru", "Chile"],
+        "seniority_level": ["Senior", "Mid", None],
+        "description_keywords": [["python"], None, None],
+        "has_salary": [False, False, False],
+    })
+    return raw, clean
+
+
+def test_changed_mask_compares_values_nulls_and_lists():
+    raw, clean = _frames()
+    mask = changed_mask(raw, clean)
+    assert mask.loc["a"].to_dict() == {"title": False, "country": True, "seniority_level": False,
+                                       "description_keywords": False, "has_salary": True}
+    assert mask.loc["b", "country"] == False  # noqa: E712
+    assert mask.loc["b", "seniority_level"] == True  # noqa: E712
+    assert mask.loc["c", "seniority_level"] == False  # noqa: E712
+
+
+def test_delta_chunks_are_homogeneous_and_skip_unchanged():
+    raw, clean = _frames()
+    clean["has_salary"] = None  # columna nueva sin valores: no cuenta como cambio
+    unchanged = pd.DataFrame({"job_id": ["d"], "title": ["Ops"], "country": ["Peru"],
+                              "seniority_level": ["Mid"], "description_keywords": [None], "has_salary": [None]})
+    raw = pd.concat([raw, unchanged.drop(columns="has_salary")], ignore_index=True)
+    clean = pd.concat([clean, unchanged], ignore_index=True)
+    stats = new_delta_stats()
+
+    chunks = list(iter_delta_chunks(raw, clean, stats))
+
+    for chunk in chunks:
+        assert len({tuple(r) for r in chunk}) == 1
+        assert all("title" in r for r in chunk)  # NOT NULL: siempre viaja
+    rows = {r["job_id"]: r for chunk in chunks for r in chunk}
+    assert set(rows) == {"a", "b", "c"}
+    assert rows["a"] == {"job_id": "a", "title": "Dev", "country": "Peru"}
+    assert rows["b"] == {"job_id": "b", "title": "QA", "seniority_level": "Mid"}
+    assert stats["rows_total"] == 4 and stats["rows_changed"] == 3 and stats["rows_skipped"] == 1
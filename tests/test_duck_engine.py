@@ -0,0 +1,31 @@
+# tests/test_duck_engine.py
+import pytest
+
+pytest.importorskip("duckdb")
+
+from benchmarks.synthetic import make_jobs, make_skills
+from cleaning import clean_job_data
+from duck_engine import run_duckdb_etl
+
+
+@pytest.fixture(scope="module")
+def raw():
+    df_jobs = make_jobs(300, description_words=20)
+    return df_jobs, make_skills(df_jobs)
+
+
+def test_duckdb_cleaning_matches_pandas(raw):
+    df_jobs, df_skills = raw
+    duck, results = run_duckdb_etl(df_jobs, df_skills, threads=1, aggregates=False)
+    pandas = clean_job_data(df_jobs.copy())
+
+    assert results == {}
+    cols = ["job_id", "title", "company_name", "seniority_level", "country"]
+    assert duck[cols].reset_index(drop=True).equals(pandas[cols].reset_index(drop=True))
+
+
+def test_duckdb_aggregates_run_the_dashboard_queries(raw):
+    df_jobs, df_skills = raw
+    _, results = run_duckdb_etl(df_jobs, df_skills, threads=1)
+    assert "GET_TOP_SKILLS" in results
+    assert not results["GET_TOP_SKILLS"].empty
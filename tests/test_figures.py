@@ -0,0 +1,29 @@
+# tests/test_figures.py
+from dashboard.figures import LRUCache, filter_key
+
+
+def test_lru_builds_once_and_evicts_least_recent():
+    cache = LRUCache(max_items=2)
+    built = []
+
+    def build(name):
+        return lambda: built.append(name) or name.upper()
+
+    assert cache.get("a", build("a")) == "A"
+    cache.get("b", build("b"))
+    assert cache.get("a", build("a")) == "A"   # hit: "a" pasa a ser el más reciente
+    cache.get("c", build("c"))                 # sale "b"
+    cache.get("b", build("b"))
+
+    assert built == ["a", "b", "c", "b"]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+    assert list(cache.items) == ["c", "b"]
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_filter_key_ignores_selection_order():
+    a = filter_key({"days": 30, "countries": ["Perú", "Chile"], "platforms": {"torre"}})
+    b = filter_key({"platforms": ("torre",), "countries": ["Chile", "Perú"], "days": 30})
+    assert a == b and hash(a) == hash(b)
+    assert a != filter_key({"days": 7, "countries": ["Perú", "Chile"], "platforms": {"torre"}})
@@ -0,0 +1,74 @@
+# tests/test_index.py
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from dashboard.index import FilterIndex, since_day
+
+NOW = datetime(2026, 10, 19, 15, 30)
+
+
+def _frame():
+    df = pd.DataFrame({
+        "job_id": ["a", "b", "c", "d", "e"],
+        "cluster_id": ["a", "a", None, "d", "e"],
+        "scraped_at": pd.to_datetime(["2026-09-01 00:00", "2026-10-12 08:00", "2026-10-15 00:00",
+                                      "2026-10-18 00:00", "2026-10-19 00:00"]),
+        "country": ["Perú", "Perú", "Chile", "Chile", "México"],
+        "seniority_level": ["Senior", "Junior", "Senior", None, "Senior"],
+        "source_platform": ["getonboard", "computrabajo", "getonboard", "getonboard", "bumeran"],
+    })
+    skills = pd.DataFrame({"job_id": ["e", "a", "c", "c", "zz"],
+                           "skill_name": ["SQL", "Python", "Python", "SQL", "Rust"]})
+    return FilterIndex(df, skills)
+
+
+def _filters(**overrides):
+    filters = {"days": 7, "countries": ["Perú", "Chile", "México"],
+               "seniority": ["Senior", "Junior"], "platforms": ["getonboard", "computrabajo", "bumeran"]}
+    filters.update(overrides)
+    return filters
+
+
+def test_since_day_starts_at_midnight():
+    assert since_day(7, NOW) == datetime(2026, 10, 12)
+
+
+def test_date_only_filter_is_a_slice():
+    index = _frame()
+    rows = index.rows(_filters(), NOW)
+    assert rows == slice(1, 5)
+    assert index.take(rows)["job_id"].tolist() == ["b", "c", "d", "e"]
+
+
+def test_categorical_filters_are_anded():
+    index = _frame()
+    rows = index.rows(_filters(countries=["Perú", "Chile"], platforms=["getonboard"]), NOW)
+    assert index.take(rows)["job_id"].tolist() == ["c", "d"]
+    # El seniority nulo no pasa un filtro de seniority
+    assert index.select(_filters(seniority=["Senior"]), NOW)["job_id"].tolist() == ["c", "e"]
+    assert index.select(_filters(countries=[]), NOW).empty
+
+
+def test_unique_jobs_counts_clusters():
+    index = _frame()
+    assert index.unique_jobs(slice(0, 5)) == 4
+    assert index.unique_jobs(slice(1, 5)) == 4
+
+
+def test_skills_for_slices_and_positions():
+    index = _frame()
+    long = index.skills(slice(2, 5))
+    assert sorted(zip(long["skill_name"], long["seniority_level"])) == [
+        ("Python", "Senior"), ("SQL", "Senior"), ("SQL", "Senior")]
+    picked = index.skills(index.rows(_filters(days=60, countries=["Perú"]), NOW))
+    assert picked["skill_name"].tolist() == ["Python"]
+    assert index.values("country") == ["Chile", "México", "Perú"]
+
+
+def test_unsorted_frame_is_rejected():
+    df = pd.DataFrame({"job_id": ["a", "b"], "scraped_at": pd.to_datetime(["2026-10-02", "2026-10-01"]),
+                       "country": None, "seniority_level": None, "source_platform": None})
+    with pytest.raises(ValueError):
+        FilterIndex(df)
@@ -0,0 +1,52 @@
+# tests/test_keyword_hits.py
+import pandas as pd
+
+from keyword_hits import assign_keywords
+from dashboard import rpc
+from fakes import FakeClient
+
+FILTERS = {"days": 30, "countries": ["Perú"], "seniority": [], "platforms": ["computrabajo"]}
+
+
+def test_assign_keywords_skips_missing_descriptions():
+    df = pd.DataFrame({
+        "description": ["Python, Django y Docker", "React con TypeScript", "python"],
+        "has_description": [True, True, False],
+    })
+    out = assign_keywords(df, keywords=["python", "django", "docker", "react", "typescript"])
+    assert out["description_keywords"].tolist() == [["python", "django", "docker"], ["react", "typescript"], []]
+
+
+def test_fetch_aggregates_sends_filters_and_keywords():
+    client = FakeClient()
+    client.rpc_handlers["dashboard_aggregates"] = lambda params: {
+        "metrics": {"jobs": 3},
+        "keywords": [{"keyword": "python", "count": 2}],
+        "timeline": [{"fecha": "2026-10-01", "count": 3}],
+    }
+    aggregates = rpc.fetch_aggregates(client, FILTERS, keywords=["python"])
+
+    name, params = client.rpc_calls[0]
+    assert name == "dashboard_aggregates"
+    assert params == {"p_days": 30, "p_countries": ["Perú"], "p_seniority": [],
+                      "p_platforms": ["computrabajo"], "p_keywords": ["python"]}
+    assert aggregates["metrics"]["jobs"] == 3 and aggregates["metrics"]["companies"] == 0
+    assert aggregates["keywords"].to_dict("records") == [{"keyword": "python", "count": 2}]
+    assert aggregates["sector"].empty and list(aggregates["sector"].columns) == ["sector", "count"]
+
+
+def test_fetch_jobs_pages_filtered_rows():
+    rows = [{"job_id": f"j{i}", "scraped_at": f"2026-10-0{i}", "has_salary": i % 2 == 0} for i in range(1, 8)]
+    client = FakeClient()
+    client.rpc_handlers["dashboard_filtered_jobs"] = lambda params: rows
+    page = rpc.fetch_jobs(client, FILTERS, ["job_id"], limit=2, offset=1, with_salary=True)
+    assert page == [{"job_id": "j4"}, {"job_id": "j2"}]
+
+
+def test_fetch_filter_options_sorts_values():
+    client = FakeClient()
+    client.rpc_handlers["dashboard_filter_options"] = lambda params: {
+        "countries": ["Perú", "Chile"], "platforms": None, "last_scraped": "2026-10-18"}
+    options = rpc.fetch_filter_options(client)
+    assert options == {"countries": ["Chile", "Perú"], "seniority": [], "platforms": [],
+                       "last_scraped": "2026-10-18"}
@@ -0,0 +1,32 @@
+# tests/test_keywords.py
+import numpy as np
+import pandas as pd
+
+from dashboard.keywords import KeywordMatrix, counts_frame, scan_texts
+
+KEYWORDS = ["java", "javascript", "sql", "docker"]
+
+
+def test_scan_counts_overlaps_and_ignores_case():
+    bits = scan_texts(["JavaScript y SQL", None, "", "docker, Docker"], KEYWORDS)
+    assert bits.shape == (4, 1)
+    found = np.unpackbits(bits, axis=1, count=len(KEYWORDS)).astype(bool)
+    assert found.tolist() == [[True, True, True, False], [False] * 4, [False] * 4, [False, False, False, True]]
+
+
+def test_counts_frame_sorts_and_drops_zeros():
+    bits = scan_texts(["sql", "sql docker", "java sql"], KEYWORDS)
+    counts = counts_frame(bits, KEYWORDS, top=2)
+    assert counts.to_dict("records") == [{"keyword": "sql", "count": 3}, {"keyword": "java", "count": 1}]
+
+
+def test_matrix_skips_rows_without_description():
+    now = pd.Timestamp("2026-10-19 09:00")
+    df = pd.DataFrame({"job_id": ["a", "b", "a"], "updated_at": now, "has_description": [True, False, True]})
+    texts = pd.DataFrame({"description": ["Docker", "SQL y Java"]}, index=["a", "b"])
+    matrix = KeywordMatrix(KEYWORDS)
+    matrix.update(df, texts)
+
+    assert len(matrix) == 2
+    assert matrix.counts(["a", "b", "zz"]).to_dict("records") == [{"keyword": "docker", "count": 1}]
+    assert matrix.counts(["zz"]).empty
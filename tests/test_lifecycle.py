@@ -0,0 +1,43 @@
+# tests/test_lifecycle.py
+from lifecycle import recent_finished_runs, sweep_inactive_jobs
+from fakes import FakeClient
+
+
+def _runs():
+    return [
+        {"run_id": 1, "status": "finished", "source_platform": "getonboard", "platforms": None},
+        {"run_id": 2, "status": "finished", "source_platform": None, "platforms": ["getonboard", "computrabajo"]},
+        {"run_id": 3, "status": "incomplete", "source_platform": None, "platforms": []},
+        {"run_id": 4, "status": "finished", "source_platform": "getonboard", "platforms": ["getonboard"]},
+        {"run_id": 5, "status": "finished", "source_platform": None, "platforms": ["getonboard", "computrabajo"]},
+    ]
+
+
+def _job(job_id, platform, run):
+    return {"job_id": job_id, "source_platform": platform, "is_active": True,
+            "last_seen_run": run, "expired_at": None}
+
+
+def test_runs_count_for_every_listed_platform():
+    runs = recent_finished_runs(FakeClient({"crawl_runs": _runs()}), misses=3)
+    assert runs["getonboard"] == [5, 4, 2]
+    assert runs["computrabajo"] == [5, 2]
+
+
+def test_sweep_expires_jobs_missing_from_the_last_runs():
+    jobs = [_job(f"g{i}", "getonboard", 5) for i in range(4)] + [_job("old", "getonboard", 1)]
+    jobs += [_job("c1", "computrabajo", 1)]
+    client = FakeClient({"crawl_runs": _runs(), "jobs": jobs})
+
+    report = sweep_inactive_jobs(client, misses=3, max_fraction=0.5)
+
+    assert report == {"getonboard": 1}  # computrabajo: solo 2/3 crawls completos
+    expired = {j["job_id"] for j in client.db["jobs"] if not j["is_active"]}
+    assert expired == {"old"}
+
+
+def test_sweep_skips_platform_when_too_many_would_expire():
+    jobs = [_job("g1", "getonboard", 5), _job("g2", "getonboard", 1), _job("g3", "getonboard", None)]
+    client = FakeClient({"crawl_runs": _runs(), "jobs": jobs})
+    assert sweep_inactive_jobs(client, misses=3, max_fraction=0.5) == {"getonboard": 0}
+    assert all(j["is_active"] for j in client.db["jobs"])
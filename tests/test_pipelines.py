@@ -0,0 +1,51 @@
+# tests/test_pipelines.py
+import pytest
+
+pytest.importorskip("scrapy")
+pytest.importorskip("bs4")
+
+from scrapers.jobscraper import pipelines
+from scrapers.jobscraper.pipelines import SupabasePipeline
+from fakes import FakeClient
+
+
+class Spider:
+    name = "multi"
+
+    class logger:
+        info = error = staticmethod(lambda *args, **kwargs: None)
+
+
+def _pipeline(saved, failed):
+    pipeline = SupabasePipeline()
+    pipeline.client = FakeClient({"crawl_runs": [{"run_id": 7, "status": "running"}]})
+    pipeline.run_id = 7
+    for platform, n in saved.items():
+        for i in range(n):
+            pipeline.process_item({"job_id": f"{platform}-{i}", "source_platform": platform}, Spider)
+    pipeline.client.fail_tables["jobs"] = RuntimeError("timeout")
+    for platform, n in failed.items():
+        for i in range(n):
+            pipeline.process_item({"job_id": f"{platform}-x{i}", "source_platform": platform}, Spider)
+    del pipeline.client.fail_tables["jobs"]
+    return pipeline
+
+
+def test_partial_run_is_finished_with_its_error_count(monkeypatch):
+    monkeypatch.setattr(pipelines, "MAX_ERROR_RATIO", 0.1)
+    pipeline = _pipeline({"getonboard": 95, "computrabajo": 10}, {"getonboard": 5, "computrabajo": 5})
+    pipeline.spider_closed(Spider, "finished")
+
+    run, = pipeline.client.db["crawl_runs"]
+    assert run["status"] == "finished"
+    assert run["platforms"] == ["getonboard"]
+    assert run["source_platform"] == "getonboard"
+    assert run["errors"] == 10
+
+
+def test_interrupted_run_is_incomplete():
+    pipeline = _pipeline({"getonboard": 10}, {})
+    pipeline.spider_closed(Spider, "shutdown")
+    run, = pipeline.client.db["crawl_runs"]
+    assert run["status"] == "incomplete"
+    assert run["platforms"] == []
@@ -0,0 +1,26 @@
+# tests/test_quality.py
+import pandas as pd
+
+from quality import add_quality_flags, MISSING_DESCRIPTION, NO_SALARY
+
+
+def test_flags_and_score():
+    df = pd.DataFrame({
+        "description": ["Python y SQL", MISSING_DESCRIPTION, "  ", None],
+        "salary_range": ["S/ 5000", NO_SALARY, "USD 2000", None],
+        "requirements": ["3 años", "", None, "Inglés"],
+        "location": ["Lima", None, "Remoto", ""],
+    })
+    out = add_quality_flags(df)
+
+    assert out["has_description"].tolist() == [True, False, False, False]
+    assert out["has_salary"].tolist() == [True, False, True, False]
+    assert out["has_requirements"].tolist() == [True, False, False, True]
+    assert out["has_location"].tolist() == [True, False, True, False]
+    assert out["data_quality_score"].tolist() == [100, 0, 50, 0]
+
+
+def test_missing_columns_count_as_empty():
+    out = add_quality_flags(pd.DataFrame({"description": ["Python"]}))
+    assert not out["has_salary"].any() and not out["has_location"].any()
+    assert out["data_quality_score"].tolist() == [50]
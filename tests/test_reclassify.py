@@ -0,0 +1,56 @@
+# tests/test_reclassify.py
+import pytest
+
+pytest.importorskip("scrapy")
+pytest.importorskip("bs4")
+
+from reclassify import TAXONOMY_VERSION, fetch_skills, iter_outdated, write_changes
+from fakes import FakeClient
+
+
+def _client():
+    return FakeClient({
+        "jobs": [
+            {"job_id": "a", "title": "Dev", "sector": "Tech", "taxonomy_version": None},
+            {"job_id": "b", "title": "Analista", "sector": "Tech", "taxonomy_version": "old"},
+            {"job_id": "c", "title": "QA", "sector": "Tech", "taxonomy_version": TAXONOMY_VERSION},
+        ],
+        "skills": [
+            {"job_id": "a", "skill_name": "Python", "skill_category": "Programming Language"},
+            {"job_id": "a", "skill_name": "Excel", "skill_category": "Other"},
+            {"job_id": "b", "skill_name": "SQL", "skill_category": "Database"},
+        ],
+    })
+
+
+def test_iter_outdated_pages_by_job_id():
+    pages = list(iter_outdated(_client(), batch_size=1))
+    assert [[r["job_id"] for r in page] for page in pages] == [["a"], ["b"]]
+
+
+def test_write_changes_only_touches_differences():
+    client = _client()
+    rows = list(iter_outdated(client))[0]
+    current = fetch_skills(client, [r["job_id"] for r in rows])
+    assert current == {"a": {"Python", "Excel"}, "b": {"SQL"}}
+
+    results = [("a", "Tech", {"Python", "Docker"}), ("b", "Finanzas", {"SQL"})]
+    stats = {"jobs": 0, "sector_changed": 0, "skills_added": 0, "skills_removed": 0}
+    write_changes(client, rows, results, current, stats)
+
+    assert stats == {"jobs": 2, "sector_changed": 1, "skills_added": 1, "skills_removed": 1}
+    jobs = {r["job_id"]: r for r in client.db["jobs"]}
+    assert jobs["b"]["sector"] == "Finanzas" and jobs["a"]["sector"] == "Tech"
+    assert all(j["taxonomy_version"] == TAXONOMY_VERSION for j in jobs.values())
+    skills = {(r["job_id"], r["skill_name"]) for r in client.db["skills"]}
+    assert skills == {("a", "Python"), ("a", "Docker"), ("b", "SQL")}
+    assert list(iter_outdated(client)) == []
+
+
+def test_dry_run_only_counts():
+    client = _client()
+    rows = list(iter_outdated(client))[0]
+    stats = {"jobs": 0, "sector_changed": 0, "skills_added": 0, "skills_removed": 0}
+    write_changes(client, rows, [("a", "Otro", set())], fetch_skills(client, ["a"]), stats, dry_run=True)
+    assert stats["sector_changed"] == 1 and stats["skills_removed"] == 2
+    assert not [op for _, op in client.calls if op != "select"]
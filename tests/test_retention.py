@@ -0,0 +1,56 @@
+# tests/test_retention.py
+from datetime import datetime, timedelta
+
+import pytest
+
+import retention
+from fakes import FakeClient
+
+
+def _client(n=5):
+    old = (datetime.now() - timedelta(days=60)).isoformat()
+    jobs = [{"job_id": f"j{i}", "title": "Dev", "source_platform": ["getonboard", "computrabajo"][i % 2],
+             "scraped_at": old, "expired_at": old, "is_active": False} for i in range(n)]
+    jobs.append({"job_id": "live", "title": "Dev", "source_platform": "getonboard",
+                 "scraped_at": old, "expired_at": None, "is_active": True})
+    skills = [{"job_id": f"j{i}", "skill_name": "Python", "created_at": old} for i in range(n)]
+    return FakeClient({"jobs": jobs, "skills": skills})
+
+
+def test_archive_round_trip_through_the_bucket(tmp_path):
+    client = _client()
+    retention.archive_and_purge(client, archive_root=str(tmp_path / "runner"), batch_size=2, bucket="archive")
+    assert [r["job_id"] for r in client.db["jobs"]] == ["live"]
+
+    # Otra máquina: el directorio local está vacío y se llena desde el bucket
+    root = str(tmp_path / "reader")
+    jobs = retention.read_archive("jobs", archive_root=root, client=client, bucket="archive")
+    skills = retention.read_archive("skills", archive_root=root, client=client, bucket="archive")
+    assert sorted(jobs["job_id"]) == [f"j{i}" for i in range(5)]
+    assert len(skills) == 5
+    assert jobs["archived_at"].notna().all()
+
+
+def test_sync_archive_only_downloads_missing_files(tmp_path, monkeypatch):
+    client = _client()
+    retention.archive_and_purge(client, archive_root=str(tmp_path / "runner"), batch_size=2, bucket="archive")
+    files = client.storage.buckets["archive"]
+
+    monkeypatch.setattr(retention, "LIST_PAGE", 1)  # fuerza la paginación del listado
+    first = retention.sync_archive(client, "archive", str(tmp_path / "reader"))
+    assert len(first) == len(files)
+    assert retention.sync_archive(client, "archive", str(tmp_path / "reader")) == []
+
+
+def test_purge_keeps_rows_when_upload_fails(tmp_path):
+    client = _client()
+    client.storage.fail = True
+    with pytest.raises(RuntimeError):
+        retention.archive_and_purge(client, archive_root=str(tmp_path), bucket="archive")
+    assert len(client.db["jobs"]) == 6
+
+
+def test_no_bucket_no_purge(tmp_path):
+    client = _client()
+    assert retention.archive_and_purge(client, archive_root=str(tmp_path), bucket=None) == []
+    assert len(client.db["jobs"]) == 6
@@ -0,0 +1,38 @@
+# tests/test_salary.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary import parse_salaries, _to_number
+
+
+@pytest.mark.parametrize("text, value", [
+    ("15,000.00", 15000.0), ("1.200.000", 1200000.0), ("4.500,50", 4500.5),
+    ("3000", 3000.0), ("2,5", 2.5), ("", np.nan),
+])
+def test_to_number_handles_both_separators(text, value):
+    result = _to_number(pd.Series([text])).iloc[0]
+    assert result == value or (np.isnan(value) and np.isnan(result))
+
+
+@pytest.mark.parametrize("text, country, expected", [
+    ("$ 15,000.00 (Mensual)", "Mexico", (15000, 15000, "MXN", "month", 825.0)),
+    ("USD 3000 - 5000", "Peru", (3000, 5000, "USD", "month", 3000.0)),
+    ("$2500 - 3500 USD/month", "Chile", (2500, 3500, "USD", "month", 2500.0)),
+    ("S/. 4.500,50 mensual", None, (4500.5, 4500.5, "PEN", "month", 1215.14)),
+    ("3k - 5k USD anual", "Colombia", (3000, 5000, "USD", "year", 250.0)),
+    ("USD 5000 - 3000", None, (3000, 5000, "USD", "month", 3000.0)),
+    ("$ 20 por hora", "Chile", (20, 20, "CLP", "hour", 3.36)),
+])
+def test_parse_salaries(text, country, expected):
+    row = parse_salaries(pd.DataFrame({"salary_range": [text], "country": [country]})).iloc[0]
+    assert (row["salary_currency"], row["salary_period"]) == expected[2:4]
+    assert row["salary_min"] == pytest.approx(expected[0])
+    assert row["salary_max"] == pytest.approx(expected[1])
+    assert row["salary_min_usd_month"] == pytest.approx(expected[4])
+
+
+@pytest.mark.parametrize("text", ["A convenir", "Sueldo negociable", None, "$ 0"])
+def test_parse_salaries_without_amount(text):
+    row = parse_salaries(pd.DataFrame({"salary_range": [text]})).iloc[0]
+    assert pd.isna(row["salary_min"]) and pd.isna(row["salary_currency"])
@@ -0,0 +1,26 @@
+# tests/test_skill_taxonomy.py
+from fakes import FakeClient
+from skill_taxonomy import categorize, categorize_pending_skills, PENDING
+
+
+def test_categorize_uses_the_scraper_taxonomy():
+    assert categorize("Python") == "Programming Language"
+    assert categorize("Cobol 74") == "Other"
+
+
+def test_only_pending_rows_are_updated():
+    client = FakeClient({"skills": [
+        {"job_id": "a", "skill_name": "Python", "skill_category": PENDING},
+        {"job_id": "b", "skill_name": "SQL", "skill_category": PENDING},
+        {"job_id": "c", "skill_name": "Cobol 74", "skill_category": PENDING},
+        {"job_id": "d", "skill_name": "Python", "skill_category": "Legacy"},
+    ]})
+    updated = categorize_pending_skills(client)
+
+    categories = {r["job_id"]: r["skill_category"] for r in client.db["skills"]}
+    assert categories == {"a": "Programming Language", "b": "Database", "c": "Other", "d": "Legacy"}
+    assert updated["Programming Language"] == 1 and updated["Other"] == 1
+    assert sum(updated.values()) == 3
+
+    # Sin pendientes, una segunda pasada no reescribe nada
+    assert sum(categorize_pending_skills(client).values()) == 0
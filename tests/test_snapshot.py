@@ -0,0 +1,78 @@
+# tests/test_snapshot.py
+import pandas as pd
+import pyarrow.dataset as ds
+
+from snapshot import SnapshotStore
+from fakes import FakeClient
+
+
+def _job(job_id, day, platform="getonboard", updated=None, **extra):
+    row = {"job_id": job_id, "title": "Dev", "source_platform": platform, "country": "Peru",
+           "scraped_at": f"2026-10-{day:02d}T10:00:00", "updated_at": updated or f"2026-10-{day:02d}T10:00:00",
+           "is_active": True}
+    row.update(extra)
+    return row
+
+
+def _client(jobs):
+    skills = [{"job_id": j["job_id"], "skill_name": "Python", "created_at": j["scraped_at"]} for j in jobs]
+    return FakeClient({"jobs": jobs, "skills": skills})
+
+
+def test_refresh_only_downloads_rows_after_the_watermark(tmp_path):
+    client = _client([_job("a", 1), _job("b", 2)])
+    store = SnapshotStore(str(tmp_path))
+    store.refresh(client)
+    assert store.watermark("jobs") == "2026-10-02T10:00:00"
+
+    client.db["jobs"].append(_job("c", 3))
+    state = store.refresh(client)
+    assert state["jobs"]["last_delta_rows"] == 1
+    assert sorted(store.read("jobs")["job_id"]) == ["a", "b", "c"]
+
+
+def test_refresh_pages_through_results(tmp_path):
+    client = _client([_job(f"j{i}", 1 + i % 5, updated=f"2026-10-06T00:00:{i:02d}") for i in range(23)])
+    store = SnapshotStore(str(tmp_path))
+    store.refresh(client, page_size=5)
+    assert len(store.read("jobs")) == 23
+    assert store.watermark("jobs") == "2026-10-06T00:00:22"
+
+
+def test_rescraped_job_moves_partition_without_duplicates(tmp_path):
+    client = _client([_job("a", 1), _job("b", 1)])
+    store = SnapshotStore(str(tmp_path))
+    store.refresh(client)
+
+    client.db["jobs"][0].update(scraped_at="2026-10-05T10:00:00", updated_at="2026-10-05T10:00:00", country="Chile")
+    store.refresh(client)
+
+    df = store.read("jobs")
+    assert sorted(df["job_id"]) == ["a", "b"]
+    assert df.set_index("job_id").loc["a", "country"] == "Chile"
+    assert sorted(store.read("jobs", since="2026-10-05")["job_id"]) == ["a"]
+
+
+def test_reconcile_drops_inactive_and_deleted_jobs_with_their_skills(tmp_path):
+    client = _client([_job("a", 1), _job("b", 1), _job("c", 2)])
+    store = SnapshotStore(str(tmp_path))
+    store.refresh(client)
+
+    client.db["jobs"][0].update(is_active=False)
+    del client.db["jobs"][1]
+    store.refresh(client)
+
+    assert store.read("jobs")["job_id"].tolist() == ["c"]
+    assert store.read("skills")["job_id"].tolist() == ["c"]
+
+
+def test_read_prunes_partitions_and_projects_columns(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.write("jobs", pd.DataFrame([_job("a", 1), _job("b", 2, platform="computrabajo"), _job("c", 3)]))
+
+    df = store.read("jobs", columns=["job_id", "country"], since="2026-10-02", platforms=["getonboard"])
+    assert df.to_dict(orient="records") == [{"job_id": "c", "country": "Peru"}]
+
+    df = store.read("jobs", columns=["job_id"], filter=ds.field("scraped_at") < pd.Timestamp("2026-10-02"))
+    assert df["job_id"].tolist() == ["a"]
+    assert list(SnapshotStore(str(tmp_path / "empty")).read("jobs", columns=["job_id"]).columns) == ["job_id"]
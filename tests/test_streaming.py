@@ -0,0 +1,64 @@
+# tests/test_streaming.py
+import pytest
+
+from benchmarks.synthetic import make_jobs, make_skills
+from streaming import SeenSet, iter_pages, prefetch, iter_valid_skill_chunks, run_streaming_etl
+from fakes import FakeClient
+
+
+def test_seen_set_marks_first_occurrence_only():
+    seen = SeenSet()
+    assert seen.add_many(["a", "b", "a"]).tolist() == [True, True, False]
+    assert seen.add_many(["c", "b"]).tolist() == [True, False]
+    assert seen.add("d") and not seen.add("d")
+    assert "c" in seen and "z" not in seen
+    assert len(seen) == 4
+    assert seen._hashes.tolist() == sorted(seen._hashes.tolist())
+
+
+def test_iter_pages_uses_keyset_pagination():
+    client = FakeClient({"jobs": [{"job_id": f"j{i:02d}"} for i in range(25)]})
+    pages = list(iter_pages(client, "jobs", "job_id", page_size=10))
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert [r["job_id"] for p in pages for r in p] == [f"j{i:02d}" for i in range(25)]
+
+
+def test_prefetch_reraises_producer_errors():
+    def pages():
+        yield 1
+        raise RuntimeError("red caída")
+
+    consumed = []
+    with pytest.raises(RuntimeError, match="red caída"):
+        for page in prefetch(pages()):
+            consumed.append(page)
+    assert consumed == [1]
+
+
+def test_iter_valid_skill_chunks_drops_orphans():
+    seen = SeenSet()
+    seen.add_many(["a"])
+    stats = {"skills_in": 0, "skills_out": 0}
+    chunks = list(iter_valid_skill_chunks([[{"job_id": "a"}, {"job_id": "b"}]], seen, stats))
+    assert chunks == [[{"job_id": "a"}]]
+    assert stats == {"skills_in": 2, "skills_out": 1}
+
+
+@pytest.mark.parametrize("delta", [True, False])
+def test_run_streaming_etl_cleans_every_page(delta):
+    df_jobs = make_jobs(120, description_words=20)
+    df_skills = make_skills(df_jobs, per_job=2)
+    df_skills["id"] = range(len(df_skills))
+    jobs = df_jobs.astype(object).where(df_jobs.notna(), None).to_dict(orient="records")
+    client = FakeClient({"jobs": jobs + jobs[:5], "skills": df_skills.to_dict(orient="records"),
+                         "companies": [], "company_aliases": []})
+
+    report = run_streaming_etl(client, page_size=50, delta=delta)
+
+    assert report["stats"]["rows_out"] == 120
+    assert {r["job_id"] for r in client.db["jobs"]} == set(df_jobs["job_id"])
+    named = [r for r in client.db["jobs"] if r["company_name"] != "Empresa no especificada"]
+    assert all(r.get("company_id") for r in named)
+    assert all(r.get("country") for r in client.db["jobs"])
+    if not delta:
+        assert report["stats"]["skills_out"] == len(df_skills)
@@ -0,0 +1,57 @@
+# tests/test_table.py
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dashboard.table import PagedTable, export_file
+
+COLUMNS = ["title", "company_name", "scraped_at"]
+
+
+def _table():
+    df = pd.DataFrame({
+        "title": ["Dev", "QA", "Data", "Ops", "PM"],
+        "company_name": ["Rappi", None, "Acme", "Rappi", "Globant"],
+        "scraped_at": pd.to_datetime(["2026-10-15 08:00", "2026-10-16 08:00", "2026-10-17 08:00",
+                                      "2026-10-18 08:00", "2026-10-19 08:00"]),
+    })
+    return PagedTable(df)
+
+
+def test_order_by_time_follows_frame_order():
+    table = _table()
+    assert table.order(slice(1, 5)).tolist() == [4, 3, 2, 1]
+    assert table.order(np.array([0, 3]), desc=False).tolist() == [0, 3]
+
+
+def test_order_by_column_keeps_nulls_last_and_ties_stable():
+    table = _table()
+    rows = slice(0, 5)
+    assert table.order(rows, "company_name", desc=False).tolist() == [2, 4, 0, 3, 1]
+    assert table.order(rows, "company_name", desc=True).tolist() == [0, 3, 4, 2, 1]
+    assert table.order(np.array([1, 3, 4]), "company_name", desc=False).tolist() == [4, 3, 1]
+
+
+def test_page_and_chunks_only_take_requested_rows():
+    table = _table()
+    order = table.order(slice(0, 5), "title", desc=False)
+    assert table.page(order, 1, 2, columns=["title"])["title"].tolist() == ["Ops", "PM"]
+    chunks = list(table.chunks(order, columns=["title"], chunk_rows=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+def test_export_csv_and_parquet_in_chunks():
+    table = _table()
+    order = table.order(slice(0, 5))
+    csv = pd.read_csv(io.BytesIO(export_file(table.chunks(order, COLUMNS, 2), "csv", COLUMNS)))
+    assert csv["title"].tolist() == ["PM", "Ops", "Data", "QA", "Dev"]
+
+    parquet = pq.read_table(io.BytesIO(export_file(table.chunks(order, COLUMNS, 2), "parquet", COLUMNS)))
+    assert parquet.num_rows == 5
+    assert str(parquet.schema.field("scraped_at").type) == "timestamp[us]"
+    assert parquet.column("company_name").to_pylist()[3] is None
+
+    empty = export_file(iter([]), "csv", COLUMNS).decode()
+    assert empty.strip() == "title,company_name,scraped_at"
@@ -0,0 +1,83 @@
+# tests/test_update_trends.py
+import pandas as pd
+import pytest
+
+import update_trends
+from snapshot import SnapshotStore
+from fakes import FakeClient
+
+
+def _jobs():
+    jobs = []
+    for i in range(6):
+        jobs.append({
+            "job_id": f"j{i}", "title": "Dev", "source_platform": "getonboard",
+            "country": "Peru", "sector": "Fintech", "seniority_level": "Senior",
+            "scraped_at": f"2026-10-0{i + 1}T10:00:00",
+            "first_seen_at": f"2026-10-0{i + 1}T09:00:00",
+            "is_active": i != 5,
+            "expired_at": "2026-10-09T00:00:00" if i == 5 else None,
+        })
+    skills = [{"job_id": f"j{i}", "skill_name": "Python", "created_at": f"2026-10-0{i + 1}T10:00:00"}
+              for i in range(6)]
+    return jobs, skills
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    jobs, skills = _jobs()
+    fake = FakeClient({"jobs": jobs, "skills": skills})
+    monkeypatch.setattr(update_trends, "supabase", fake)
+    monkeypatch.setattr(update_trends, "SnapshotStore", lambda: SnapshotStore(str(tmp_path / "snapshot")))
+    return fake
+
+
+@pytest.mark.parametrize("since", [None, "2026-10-02T09:00:00+00:00", "2026-10-02T09:00:00"])
+def test_snapshot_and_supabase_count_the_same_first_sightings(client, since):
+    from_db = update_trends.fetch_new_jobs(since, source="supabase")
+    from_snapshot = update_trends.fetch_new_jobs(since, source="snapshot")
+
+    assert sorted(from_snapshot["job_id"]) == sorted(from_db["job_id"])
+    # la vacante vencida no está en el snapshot pero se cuenta igual
+    assert "j5" in set(from_snapshot["job_id"])
+
+
+def test_snapshot_path_with_watermark_filters_by_first_seen(client):
+    update_trends.fetch_new_jobs(None, source="snapshot")  # crea el snapshot
+    df = update_trends.fetch_new_jobs("2026-10-04T09:00:00+00:00", source="snapshot")
+
+    assert sorted(df["job_id"]) == ["j4", "j5"]
+    counts = update_trends.rollup(df, "first_seen_at", "jobs_seen")
+    assert counts["jobs_seen"].sum() == 4  # 2 vacantes x ("*" + Python)
+
+
+def test_snapshot_rewrites_files_with_string_timestamps(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "jobs" / "day=2026-10-01" / "platform=x" / "part.parquet"
+    path.parent.mkdir(parents=True)
+    pq.write_table(pa.table({
+        "job_id": ["a"], "source_platform": ["x"],
+        "scraped_at": pa.array([pd.Timestamp("2026-10-01")], pa.timestamp("us")),
+        "first_seen_at": ["2026-10-01T00:00:00"],
+    }), path)
+
+    import pyarrow.dataset as ds
+    df = SnapshotStore(str(tmp_path)).read(
+        "jobs", filter=ds.field("first_seen_at") > pd.Timestamp("2026-09-30"))
+    assert df["job_id"].tolist() == ["a"]
+
+
+def test_run_trends_increments_once_and_advances_watermarks(client):
+    update_trends.run_trends()
+    (name, params), = client.rpc_calls
+    assert name == "trend_daily_increment"
+    assert sum(r["jobs_seen"] for r in params["p_rows"]) == 12
+    assert sum(r["jobs_expired"] for r in params["p_rows"]) == 2
+
+    state = {r["key"]: r["value"] for r in client.db["etl_state"]}
+    assert state[update_trends.STATE_SEEN].startswith("2026-10-06T09:00")
+
+    update_trends.run_trends()
+    assert len(client.rpc_calls) == 1